@@ -0,0 +1,36 @@
+"""add hot path indexes
+
+Revision ID: 3b8f2c1d9a47
+Revises: 763c6cecc37d
+Create Date: 2026-10-16 10:12:41.207315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8f2c1d9a47'
+down_revision: Union[str, Sequence[str], None] = '763c6cecc37d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_project_id_position', 'tasks', ['project_id', 'position'], unique=False)
+    op.create_index('ix_projects_workspace_id_created_at', 'projects', ['workspace_id', 'created_at'], unique=False)
+    op.create_index('ix_workspaces_owner_id_created_at', 'workspaces', ['owner_id', 'created_at'], unique=False)
+    op.create_index('ix_subscriptions_workspace_id_status_period_end', 'subscriptions', ['workspace_id', 'status', 'current_period_end'], unique=False)
+    op.create_index('ix_payments_razorpay_order_id', 'payments', ['razorpay_order_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_payments_razorpay_order_id', table_name='payments')
+    op.drop_index('ix_subscriptions_workspace_id_status_period_end', table_name='subscriptions')
+    op.drop_index('ix_workspaces_owner_id_created_at', table_name='workspaces')
+    op.drop_index('ix_projects_workspace_id_created_at', table_name='projects')
+    op.drop_index('ix_tasks_project_id_position', table_name='tasks')
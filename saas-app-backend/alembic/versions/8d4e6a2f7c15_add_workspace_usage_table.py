@@ -0,0 +1,48 @@
+"""add workspace usage table
+
+Revision ID: 8d4e6a2f7c15
+Revises: 3b8f2c1d9a47
+Create Date: 2026-10-16 11:03:27.581944
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d4e6a2f7c15'
+down_revision: Union[str, Sequence[str], None] = '3b8f2c1d9a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('workspace_usage',
+    sa.Column('workspace_id', sa.Integer(), nullable=False),
+    sa.Column('project_count', sa.Integer(), nullable=False),
+    sa.Column('task_count', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ),
+    sa.PrimaryKeyConstraint('workspace_id')
+    )
+    # Backfill counters from the existing rows
+    op.execute(
+        """
+        INSERT INTO workspace_usage (workspace_id, project_count, task_count)
+        SELECT
+            w.id,
+            (SELECT count(*) FROM projects p WHERE p.workspace_id = w.id),
+            (SELECT count(*) FROM tasks t
+                JOIN projects p ON t.project_id = p.id
+                WHERE p.workspace_id = w.id)
+        FROM workspaces w
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('workspace_usage')
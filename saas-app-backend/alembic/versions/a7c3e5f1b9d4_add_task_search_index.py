@@ -0,0 +1,41 @@
+"""add task search index
+
+Revision ID: a7c3e5f1b9d4
+Revises: e4b7d2a9c6f1
+Create Date: 2026-10-16 15:32:48.106524
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.search import POSTGRES_DDL, SQLITE_DDL
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e5f1b9d4'
+down_revision: Union[str, Sequence[str], None] = 'e4b7d2a9c6f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    statements = {'postgresql': POSTGRES_DDL, 'sqlite': SQLITE_DDL}.get(dialect, [])
+    for statement in statements:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_tasks_search_vector')
+        op.execute('ALTER TABLE tasks DROP COLUMN IF EXISTS search_vector')
+    elif dialect == 'sqlite':
+        op.execute('DROP TRIGGER IF EXISTS tasks_fts_au')
+        op.execute('DROP TRIGGER IF EXISTS tasks_fts_ad')
+        op.execute('DROP TRIGGER IF EXISTS tasks_fts_ai')
+        op.execute('DROP TABLE IF EXISTS tasks_fts')
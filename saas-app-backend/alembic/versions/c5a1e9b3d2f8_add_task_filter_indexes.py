@@ -0,0 +1,34 @@
+"""add task filter indexes
+
+Revision ID: c5a1e9b3d2f8
+Revises: 8d4e6a2f7c15
+Create Date: 2026-10-16 12:41:09.338210
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5a1e9b3d2f8'
+down_revision: Union[str, Sequence[str], None] = '8d4e6a2f7c15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_project_id_status_position', 'tasks', ['project_id', 'status', 'position'], unique=False)
+    op.create_index('ix_tasks_project_id_priority_position', 'tasks', ['project_id', 'priority', 'position'], unique=False)
+    op.create_index('ix_tasks_project_id_assigned_to_position', 'tasks', ['project_id', 'assigned_to', 'position'], unique=False)
+    op.create_index('ix_tasks_project_id_due_date', 'tasks', ['project_id', 'due_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_project_id_due_date', table_name='tasks')
+    op.drop_index('ix_tasks_project_id_assigned_to_position', table_name='tasks')
+    op.drop_index('ix_tasks_project_id_priority_position', table_name='tasks')
+    op.drop_index('ix_tasks_project_id_status_position', table_name='tasks')
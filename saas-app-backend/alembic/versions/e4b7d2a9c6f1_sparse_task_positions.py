@@ -0,0 +1,41 @@
+"""sparse task positions
+
+Revision ID: e4b7d2a9c6f1
+Revises: c5a1e9b3d2f8
+Create Date: 2026-10-16 14:05:22.417963
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b7d2a9c6f1'
+down_revision: Union[str, Sequence[str], None] = 'c5a1e9b3d2f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# must match app.services.task_ordering.POSITION_GAP
+POSITION_GAP = 1 << 20
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column('tasks', 'position', existing_type=sa.Integer(), type_=sa.BigInteger(), existing_nullable=False)
+    op.execute(
+        'UPDATE tasks SET position = ranked.rn * {gap} FROM ('
+        'SELECT id, row_number() OVER (PARTITION BY project_id ORDER BY position, id) AS rn FROM tasks'
+        ') AS ranked WHERE tasks.id = ranked.id'.format(gap=POSITION_GAP)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        'UPDATE tasks SET position = ranked.rn FROM ('
+        'SELECT id, row_number() OVER (PARTITION BY project_id ORDER BY position, id) AS rn FROM tasks'
+        ') AS ranked WHERE tasks.id = ranked.id'
+    )
+    op.alter_column('tasks', 'position', existing_type=sa.BigInteger(), type_=sa.Integer(), existing_nullable=False)
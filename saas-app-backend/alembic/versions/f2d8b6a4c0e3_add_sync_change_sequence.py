@@ -0,0 +1,51 @@
+"""add sync change sequence and tombstones
+
+Revision ID: f2d8b6a4c0e3
+Revises: a7c3e5f1b9d4
+Create Date: 2026-10-16 16:48:03.551207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2d8b6a4c0e3'
+down_revision: Union[str, Sequence[str], None] = 'a7c3e5f1b9d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tasks', sa.Column('change_seq', sa.BigInteger(), server_default='0', nullable=False))
+    op.add_column('projects', sa.Column('change_seq', sa.BigInteger(), server_default='0', nullable=False))
+    op.add_column('workspace_usage', sa.Column('change_seq', sa.BigInteger(), server_default='0', nullable=False))
+    op.create_index('ix_tasks_project_id_change_seq', 'tasks', ['project_id', 'change_seq'], unique=False)
+    op.create_index('ix_projects_workspace_id_change_seq', 'projects', ['workspace_id', 'change_seq'], unique=False)
+    op.create_table('sync_tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('workspace_id', sa.Integer(), nullable=False),
+    sa.Column('entity', sa.String(), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('change_seq', sa.BigInteger(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_sync_tombstones_id'), 'sync_tombstones', ['id'], unique=False)
+    op.create_index('ix_sync_tombstones_workspace_id_change_seq', 'sync_tombstones', ['workspace_id', 'change_seq'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_sync_tombstones_workspace_id_change_seq', table_name='sync_tombstones')
+    op.drop_index(op.f('ix_sync_tombstones_id'), table_name='sync_tombstones')
+    op.drop_table('sync_tombstones')
+    op.drop_index('ix_projects_workspace_id_change_seq', table_name='projects')
+    op.drop_index('ix_tasks_project_id_change_seq', table_name='tasks')
+    op.drop_column('workspace_usage', 'change_seq')
+    op.drop_column('projects', 'change_seq')
+    op.drop_column('tasks', 'change_seq')
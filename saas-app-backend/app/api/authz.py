@@ -0,0 +1,404 @@
+"""
+Shared ownership checks for workspaces, projects and tasks.
+
+Each helper resolves the resource together with its workspace owner in a
+single query, raising 404 when the resource is missing and 403 when it
+belongs to someone else. Resolved chains are recorded in the process-local
+ownership graph, so repeat checks on hot resources can skip the joins (and,
+for the ensure_* helpers, the database entirely). A cached chain is only
+trusted to grant access; anything else falls through to the database.
+
+Cached chains can be stale (other workers keep them for
+OWNERSHIP_CACHE_TTL_SECONDS, and ids are reused), so nothing is written on
+their word alone. The ensure_* helpers return the cached parent, and
+writes by id go through the guarded_*_write helpers. These put that parent
+and its owner in the statement's WHERE clause. A guarded write that
+matches no row counts as a cache miss: the chain is rechecked against the
+database (404/403) and the write retried once.
+"""
+from typing import Any, Callable
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.models.workspace import Workspace
+from app.models.project import Project
+from app.models.task import Task
+from app.services.ownership_cache import ownership_graph
+
+
+def _not_found(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
+
+
+def _forbidden(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+
+
+# ---------- Workspaces ----------
+
+def get_workspace_or_404(
+    db: Session,
+    workspace_id: int,
+    current_user: User,
+) -> Workspace:
+    workspace = db.query(Workspace).filter(Workspace.id == workspace_id).first()
+    if not workspace:
+        ownership_graph.forget_workspace(workspace_id)
+        raise _not_found("Workspace not found")
+
+    ownership_graph.remember_workspace(workspace.id, workspace.owner_id)
+    if workspace.owner_id != current_user.id:
+        raise _forbidden("Not allowed to access this workspace")
+    return workspace
+
+
+def ensure_workspace_access(
+    db: Session,
+    workspace_id: int,
+    current_user: User,
+    cached: bool = True,
+) -> None:
+    """
+    Ownership check without loading the workspace row. `cached=False`
+    skips the ownership graph.
+    """
+    if cached and ownership_graph.owner_of_workspace(workspace_id) == current_user.id:
+        return
+
+    owner_id = (
+        db.query(Workspace.owner_id).filter(Workspace.id == workspace_id).scalar()
+    )
+    if owner_id is None:
+        ownership_graph.forget_workspace(workspace_id)
+        raise _not_found("Workspace not found")
+
+    ownership_graph.remember_workspace(workspace_id, owner_id)
+    if owner_id != current_user.id:
+        raise _forbidden("Not allowed to access this workspace")
+
+
+# ---------- Projects ----------
+
+def get_project_with_workspace_or_404(
+    db: Session,
+    project_id: int,
+    current_user: User,
+) -> tuple[Project, Workspace]:
+    row = (
+        db.query(Project, Workspace)
+        .outerjoin(Workspace, Workspace.id == Project.workspace_id)
+        .filter(Project.id == project_id)
+        .first()
+    )
+    if row is None:
+        ownership_graph.forget_project(project_id)
+        raise _not_found("Project not found")
+
+    project, workspace = row
+    ownership_graph.remember_project(project.id, project.workspace_id)
+    if workspace is None:
+        ownership_graph.forget_workspace(project.workspace_id)
+        raise _forbidden("Not allowed to access this project")
+
+    ownership_graph.remember_workspace(workspace.id, workspace.owner_id)
+    if workspace.owner_id != current_user.id:
+        raise _forbidden("Not allowed to access this project")
+    return project, workspace
+
+
+def get_project_or_404(
+    db: Session,
+    project_id: int,
+    current_user: User,
+) -> Project:
+    workspace_id = ownership_graph.workspace_of_project(project_id)
+    if (
+        workspace_id is not None
+        and ownership_graph.owner_of_workspace(workspace_id) == current_user.id
+    ):
+        # The row must still hang off the cached chain (ids can be reused)
+        project = db.scalars(
+            select(Project).where(
+                Project.id == project_id, project_guard(workspace_id, current_user)
+            )
+        ).first()
+        if project is not None:
+            return project
+        ownership_graph.forget_project(project_id)
+
+    project, _ = get_project_with_workspace_or_404(db, project_id, current_user)
+    return project
+
+
+def ensure_project_access(
+    db: Session,
+    project_id: int,
+    current_user: User,
+    cached: bool = True,
+) -> int:
+    """
+    Ownership check without loading the project row. Returns the project's
+    workspace id, from the ownership graph unless `cached` is False.
+    """
+    workspace_id = ownership_graph.workspace_of_project(project_id) if cached else None
+    if (
+        workspace_id is not None
+        and ownership_graph.owner_of_workspace(workspace_id) == current_user.id
+    ):
+        return workspace_id
+
+    row = (
+        db.query(Project.workspace_id, Workspace.owner_id)
+        .outerjoin(Workspace, Workspace.id == Project.workspace_id)
+        .filter(Project.id == project_id)
+        .first()
+    )
+    if row is None:
+        ownership_graph.forget_project(project_id)
+        raise _not_found("Project not found")
+
+    workspace_id, owner_id = row
+    ownership_graph.remember_project(project_id, workspace_id)
+    if owner_id is None:
+        ownership_graph.forget_workspace(workspace_id)
+        raise _forbidden("Not allowed to access this project")
+
+    ownership_graph.remember_workspace(workspace_id, owner_id)
+    if owner_id != current_user.id:
+        raise _forbidden("Not allowed to access this project")
+    return workspace_id
+
+
+# ---------- Tasks ----------
+
+def _resolve_task_chain(db: Session, task_id: int, current_user: User, columns):
+    """
+    Runs the joined task -> project -> workspace lookup for `columns`
+    (which must end with Task.project_id, Project.workspace_id and
+    Workspace.owner_id), records the chain and applies the 404/403 rules.
+    """
+    row = (
+        db.query(*columns)
+        .select_from(Task)
+        .outerjoin(Project, Project.id == Task.project_id)
+        .outerjoin(Workspace, Workspace.id == Project.workspace_id)
+        .filter(Task.id == task_id)
+        .first()
+    )
+    if row is None:
+        ownership_graph.forget_task(task_id)
+        raise _not_found("Task not found")
+
+    project_id, workspace_id, owner_id = row[-3:]
+    ownership_graph.remember_task(task_id, project_id)
+    if workspace_id is None:
+        ownership_graph.forget_project(project_id)
+        raise _not_found("Project not found for this task")
+
+    ownership_graph.remember_project(project_id, workspace_id)
+    if owner_id is None:
+        ownership_graph.forget_workspace(workspace_id)
+        raise _forbidden("Not allowed to access this task")
+
+    ownership_graph.remember_workspace(workspace_id, owner_id)
+    if owner_id != current_user.id:
+        raise _forbidden("Not allowed to access this task")
+    return row
+
+
+def get_task_or_404(
+    db: Session,
+    task_id: int,
+    current_user: User,
+) -> Task:
+    project_id = ownership_graph.project_of_task(task_id)
+    if (
+        project_id is not None
+        and ownership_graph.owner_of_project(project_id) == current_user.id
+    ):
+        # The row must still hang off the cached chain (ids can be reused)
+        task = db.scalars(
+            select(Task).where(Task.id == task_id, task_guard(project_id, current_user))
+        ).first()
+        if task is not None:
+            return task
+        ownership_graph.forget_task(task_id)
+
+    row = _resolve_task_chain(
+        db,
+        task_id,
+        current_user,
+        (Task, Task.project_id, Project.workspace_id, Workspace.owner_id),
+    )
+    return row[0]
+
+
+def authorize_tasks(
+    db: Session,
+    task_ids: list[int],
+    current_user: User,
+) -> dict[int, HTTPException | None]:
+    """
+    Batch form of ensure_task_access: resolves every chain in one joined
+    query and maps each task id to the error its single-task check would
+    raise, or None when access is granted.
+    """
+    results: dict[int, HTTPException | None] = {}
+    pending = []
+    for task_id in dict.fromkeys(task_ids):
+        if ownership_graph.owner_of_task(task_id) == current_user.id:
+            results[task_id] = None
+        else:
+            pending.append(task_id)
+    if not pending:
+        return results
+
+    rows = (
+        db.query(Task.id, Task.project_id, Project.workspace_id, Workspace.owner_id)
+        .outerjoin(Project, Project.id == Task.project_id)
+        .outerjoin(Workspace, Workspace.id == Project.workspace_id)
+        .filter(Task.id.in_(pending))
+        .all()
+    )
+    for task_id, project_id, workspace_id, owner_id in rows:
+        ownership_graph.remember_task(task_id, project_id)
+        if workspace_id is None:
+            ownership_graph.forget_project(project_id)
+            results[task_id] = _not_found("Project not found for this task")
+            continue
+
+        ownership_graph.remember_project(project_id, workspace_id)
+        if owner_id is None:
+            ownership_graph.forget_workspace(workspace_id)
+            results[task_id] = _forbidden("Not allowed to access this task")
+            continue
+
+        ownership_graph.remember_workspace(workspace_id, owner_id)
+        if owner_id != current_user.id:
+            results[task_id] = _forbidden("Not allowed to access this task")
+        else:
+            results[task_id] = None
+
+    for task_id in pending:
+        if task_id not in results:
+            ownership_graph.forget_task(task_id)
+            results[task_id] = _not_found("Task not found")
+    return results
+
+
+def ensure_task_access(
+    db: Session,
+    task_id: int,
+    current_user: User,
+    cached: bool = True,
+) -> int:
+    """
+    Ownership check without loading the task row. Returns the task's
+    project id, from the ownership graph unless `cached` is False.
+    """
+    project_id = ownership_graph.project_of_task(task_id) if cached else None
+    if (
+        project_id is not None
+        and ownership_graph.owner_of_project(project_id) == current_user.id
+    ):
+        return project_id
+
+    row = _resolve_task_chain(
+        db,
+        task_id,
+        current_user,
+        (Task.project_id, Project.workspace_id, Workspace.owner_id),
+    )
+    return row[0]
+
+
+# ---------- Guarded writes ----------
+
+def task_guard(project_id: int, current_user: User):
+    """WHERE clause: the task is in `project_id` and the user owns that project."""
+    return Task.project_id.in_(
+        select(Project.id)
+        .join(Workspace, Workspace.id == Project.workspace_id)
+        .where(Project.id == project_id, Workspace.owner_id == current_user.id)
+    )
+
+
+def project_guard(workspace_id: int, current_user: User):
+    """WHERE clause: the project is in `workspace_id` and the user owns it."""
+    return Project.workspace_id.in_(
+        select(Workspace.id).where(
+            Workspace.id == workspace_id, Workspace.owner_id == current_user.id
+        )
+    )
+
+
+def _guarded_write(db: Session, check, forget, guard, write, detail: str) -> Any:
+    result = write(guard(check(True)))
+    if result is None:
+        # Stale cache entry or a concurrent delete: recheck, then retry
+        db.rollback()
+        forget()
+        result = write(guard(check(False)))
+    if result is None:
+        db.rollback()
+        forget()
+        raise _not_found(detail)
+    return result
+
+
+def guarded_task_write(
+    db: Session,
+    task_id: int,
+    current_user: User,
+    write: Callable[[Any], Any],
+) -> Any:
+    """
+    Runs `write(guard)` for a task the user may access and returns its
+    result. `write` must add `guard` to its statement's WHERE clause and
+    return None when no row matched.
+    """
+    return _guarded_write(
+        db,
+        lambda cached: ensure_task_access(db, task_id, current_user, cached),
+        lambda: ownership_graph.forget_task(task_id),
+        lambda project_id: task_guard(project_id, current_user),
+        write,
+        "Task not found",
+    )
+
+
+def guarded_project_write(
+    db: Session,
+    project_id: int,
+    current_user: User,
+    write: Callable[[Any], Any],
+) -> Any:
+    """guarded_task_write for a project."""
+    return _guarded_write(
+        db,
+        lambda cached: ensure_project_access(db, project_id, current_user, cached),
+        lambda: ownership_graph.forget_project(project_id),
+        lambda workspace_id: project_guard(workspace_id, current_user),
+        write,
+        "Project not found",
+    )
+
+
+def guarded_workspace_write(
+    db: Session,
+    workspace_id: int,
+    current_user: User,
+    write: Callable[[Any], Any],
+) -> Any:
+    """guarded_task_write for a workspace; the guard is its owner."""
+    return _guarded_write(
+        db,
+        lambda cached: ensure_workspace_access(db, workspace_id, current_user, cached),
+        lambda: ownership_graph.forget_workspace(workspace_id),
+        lambda _: Workspace.owner_id == current_user.id,
+        write,
+        "Workspace not found",
+    )
@@ -0,0 +1,55 @@
+"""
+Helpers for conditional GETs (ETag / If-None-Match).
+"""
+import hashlib
+import json
+
+from fastapi import Request, Response, status
+
+# Cacheable by the client only, and only after revalidating with the ETag
+REVALIDATE = "private, no-cache"
+
+
+def weak_etag(*parts) -> str:
+    """
+    Weak validator built from version numbers and aggregates (never from
+    the body), so it can be checked before any row is loaded.
+    """
+    return 'W/"' + "-".join(str(part) for part in parts) + '"'
+
+
+def query_digest(*params) -> str:
+    """
+    Short digest of the query parameters that shape a response (filters,
+    cursor, limit, fields), so one view's ETag never validates another's.
+    """
+    raw = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison: W/"x" and "x" are equivalent for If-None-Match
+    wanted = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == wanted
+        for candidate in header.split(",")
+    )
+
+
+def not_modified(etag: str, cache_control: str | None = None) -> Response:
+    headers = {"ETag": etag}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+def add_validators(
+    response: Response, etag: str, cache_control: str = REVALIDATE
+) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
@@ -1,15 +1,32 @@
+from typing import Any, Callable
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from app.db.session import SessionLocal
+from app.db.session import (
+    SessionLocal,
+    ReadSessionLocal,
+    AsyncSessionLocal,
+    AsyncReadSessionLocal,
+)
+from app.db.routing import wrote_recently
+from app.core.config import get_settings
 from app.core.security import decode_token
 from app.models.user import User
+from app.services.user_service import load_principal, principal_cache
+
+settings = get_settings()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# What get_db yields: a sync Session, or an AsyncSession when DB_ASYNC is on
+DbSession = Session | AsyncSession
 
-def get_db():
+
+def get_sync_db():
     db = SessionLocal()
     try:
         yield db
@@ -17,9 +34,63 @@ def get_db():
         db.close()
 
 
-def get_current_user(
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+get_db = get_async_db if settings.DB_ASYNC else get_sync_db
+
+
+def _reads_from_primary(token: str) -> bool:
+    # The token is validated by get_current_user; here we only peek at sub
+    payload = decode_token(token)
+    user_id = payload.get("sub") if payload else None
+    return user_id is not None and wrote_recently(int(user_id))
+
+
+def get_sync_read_db(token: str = Depends(oauth2_scheme)):
+    factory = SessionLocal if _reads_from_primary(token) else ReadSessionLocal
+    db = factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(token: str = Depends(oauth2_scheme)):
+    if _reads_from_primary(token):
+        factory = AsyncSessionLocal
+    else:
+        factory = AsyncReadSessionLocal
+    async with factory() as db:
+        yield db
+
+
+# Read-only handlers depend on get_read_db. Without a replica it is get_db
+# itself, so the handler and get_current_user share one session.
+if settings.READ_DATABASE_URL is None:
+    get_read_db = get_db
+elif settings.DB_ASYNC:
+    get_read_db = get_async_read_db
+else:
+    get_read_db = get_sync_read_db
+
+
+async def run_db(db: DbSession, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Runs sync ORM code `fn(session, *args, **kwargs)` against either kind of
+    session. With an AsyncSession the DB wait happens on the event loop via
+    run_sync; with a sync Session the call is moved to the threadpool.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
 ) -> User:
     payload = decode_token(token)
     if payload is None:
@@ -37,7 +108,10 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    # Cache hits skip both the users table and the threadpool hop
+    user = principal_cache.get(int(user_id))
+    if user is None:
+        user = await run_db(db, load_principal, int(user_id))
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -45,4 +119,6 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # Commits on this session mark the user for read-your-writes routing
+    db.info["user_id"] = user.id
     return user
@@ -0,0 +1,110 @@
+"""
+Column-level read path for list endpoints.
+
+Lists select plain Core rows holding just the response schema's columns
+(no ORM instances or identity map) and encode them straight to JSON with
+a cached serializer, skipping the per-row validation response_model
+would run.
+
+Sparse fieldsets (`?fields=id,title,status`) narrow both: the requested
+names are checked against the schema and passed down to the SELECT, so
+columns the client didn't ask for are never read or encoded. `id` is
+always included. `list_response_model` documents both shapes in OpenAPI.
+"""
+from functools import lru_cache
+from typing import List, Union
+
+from fastapi import HTTPException, Response, status
+from pydantic import BaseModel, Field, TypeAdapter, create_model
+from sqlalchemy import Select, select
+from typing_extensions import TypedDict
+
+FIELDS_DESCRIPTION = (
+    "Comma-separated response fields to return (id is always included); "
+    "omit for the full representation."
+)
+
+
+@lru_cache
+def sparse_schema(schema: type[BaseModel]) -> type[BaseModel]:
+    """`schema` with every field but `id` optional: a `?fields=` item."""
+    return create_model(
+        f"{schema.__name__}Fields",
+        __doc__=f"{schema.__name__} narrowed to `id` plus the requested fields.",
+        **{
+            name: (
+                field.annotation,
+                ... if name == "id" else Field(default=None),
+            )
+            for name, field in schema.model_fields.items()
+        },
+    )
+
+
+def list_response_model(schema: type[BaseModel]):
+    """
+    response_model for a list endpoint that takes `fields`: full items,
+    or sparse ones when the client narrowed them. Only used for OpenAPI;
+    the endpoints return rows_response directly.
+    """
+    return Union[List[schema], List[sparse_schema(schema)]]
+
+
+def parse_fields(
+    fields: str | None, schema: type[BaseModel]
+) -> tuple[str, ...] | None:
+    """
+    The requested field names in schema order, or None when the client
+    wants the full representation.
+    """
+    if fields is None:
+        return None
+
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - schema.model_fields.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+        )
+    requested.add("id")
+    return tuple(name for name in schema.model_fields if name in requested)
+
+
+def select_fields(
+    model, schema: type[BaseModel], names: tuple[str, ...] | None, *extra: str
+) -> Select:
+    """
+    SELECT of `model`'s columns for the requested fields (all of the
+    schema's when `names` is None) plus any `extra` ones the query needs.
+    """
+    columns = dict.fromkeys((*(names or schema.model_fields), *extra))
+    return select(*(getattr(model, name) for name in columns))
+
+
+@lru_cache
+def _rows_serializer(
+    schema: type[BaseModel], names: tuple[str, ...] | None
+) -> TypeAdapter:
+    # A TypedDict mirror of the schema: rows come straight from the database,
+    # so they are only serialised, never validated
+    row_type = TypedDict(
+        f"{schema.__name__}Row",
+        {
+            name: schema.model_fields[name].annotation
+            for name in names or schema.model_fields
+        },
+    )
+    return TypeAdapter(list[row_type])
+
+
+def rows_response(
+    schema: type[BaseModel],
+    names: tuple[str, ...] | None,
+    rows,
+) -> Response:
+    """JSON array of `rows` (Row tuples from select_fields) as `schema`."""
+    content = _rows_serializer(schema, names).dump_json(
+        [row._asdict() for row in rows]
+    )
+    return Response(content=content, media_type="application/json")
@@ -0,0 +1,46 @@
+"""
+Opaque keyset cursors.
+
+A cursor is the sort key of the last row on a page, JSON-encoded and
+base64url'd so clients treat it as an opaque token.
+"""
+import base64
+import json
+
+from fastapi import HTTPException, status
+
+# Response header carrying the cursor of the next page, if any
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*key) -> str:
+    raw = json.dumps(list(key), separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type) -> list:
+    """
+    Decodes a cursor whose key must hold one value of each of `types`, in
+    order; anything else (including bools for int) is a 400.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        key = None
+
+    if (
+        not isinstance(key, list)
+        or len(key) != len(types)
+        or not all(_is_a(value, kind) for value, kind in zip(key, types))
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+    return key
+
+
+def _is_a(value, kind: type) -> bool:
+    # bool is an int subclass, but True is never a valid position or id
+    return isinstance(value, kind) and not isinstance(value, bool)
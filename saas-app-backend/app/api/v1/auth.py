@@ -2,13 +2,17 @@ from datetime import timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
 
-from app.db.session import SessionLocal
+from app.api.deps import DbSession, get_db, run_db
 from app.schemas.user import UserCreate, UserOut
 from app.schemas.auth import Token
 from app.services.user_service import get_user_by_email, create_user
-from app.core.security import verify_password, create_access_token
+from app.services.hashing_service import (
+    HashingBusyError,
+    hash_password_async,
+    verify_password_async,
+)
+from app.core.security import create_access_token
 from app.core.config import get_settings
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -18,34 +22,46 @@ settings = get_settings()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def _hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication service busy, please retry",
+        headers={"Retry-After": "1"},
+    )
 
 
 @router.post("/register", response_model=UserOut)
-def register(user_in: UserCreate, db: Session = Depends(get_db)):
-    existing = get_user_by_email(db, user_in.email)
+async def register(user_in: UserCreate, db: DbSession = Depends(get_db)):
+    existing = await run_db(db, get_user_by_email, user_in.email)
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
 
-    user = create_user(db, user_in)
+    try:
+        hashed_password = await hash_password_async(user_in.password)
+    except HashingBusyError:
+        raise _hashing_busy()
+
+    user = await run_db(db, create_user, user_in, hashed_password)
     return user
 
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
 ):
-    user = get_user_by_email(db, form_data.username)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = await run_db(db, get_user_by_email, form_data.username)
+    try:
+        valid = user is not None and await verify_password_async(
+            form_data.password, user.hashed_password
+        )
+    except HashingBusyError:
+        raise _hashing_busy()
+
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -1,10 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import DbSession, get_db, get_current_user, run_db
+from app.api.authz import get_workspace_or_404
+from app.api.conditional import etag_matches, not_modified
 from app.models.user import User
-from app.models.workspace import Workspace
-from app.models.plan import Plan
 from app.models.subscription import Subscription
 from app.schemas.billing import (
     PlanOut,
@@ -14,11 +14,17 @@ from app.schemas.billing import (
     VerifyPaymentRequest,
 )
 from app.services.billing_service import (
-    ensure_default_plans,
     get_or_create_subscription,
     create_razorpay_order_for_plan,
+    invalidate_entitlement,
     verify_payment_and_activate_subscription,
 )
+from app.services.plan_catalog import (
+    get_active_plan,
+    get_plan_catalog,
+    plan_catalog_is_stale,
+    refresh_plan_catalog,
+)
 from app.core.config import get_settings
 
 settings = get_settings()
@@ -26,43 +32,33 @@ settings = get_settings()
 router = APIRouter(prefix="/billing", tags=["billing"])
 
 
-def _get_workspace_or_403(
-    db: Session,
-    workspace_id: int,
-    current_user: User,
-) -> Workspace:
-    workspace = db.query(Workspace).filter(Workspace.id == workspace_id).first()
-    if not workspace:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Workspace not found",
-        )
-    if workspace.owner_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not allowed to access this workspace",
-        )
-    return workspace
-
-
 @router.get("/plans", response_model=list[PlanOut])
-def list_plans(
-    db: Session = Depends(get_db),
+async def list_plans(
+    request: Request,
+    db: DbSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    plans = ensure_default_plans(db)
-    # Only return active plans
-    active_plans = db.query(Plan).filter(Plan.is_active == True).all()  # noqa: E712
-    return active_plans
+    # Served from the in-process catalog snapshot, reloaded when stale
+    catalog = get_plan_catalog()
+    if plan_catalog_is_stale():
+        catalog = await run_db(db, refresh_plan_catalog)
+    cache_control = f"private, max-age={settings.PLAN_CATALOG_MAX_AGE_SECONDS}"
+    if etag_matches(request, catalog.etag):
+        return not_modified(catalog.etag, cache_control)
+
+    return Response(
+        content=catalog.body,
+        media_type="application/json",
+        headers={"ETag": catalog.etag, "Cache-Control": cache_control},
+    )
 
 
-@router.get("/current/{workspace_id}", response_model=SubscriptionOut | None)
-def get_current_subscription(
+def _get_current_subscription(
+    db: Session,
     workspace_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User,
 ):
-    workspace = _get_workspace_or_403(db, workspace_id, current_user)
+    workspace = get_workspace_or_404(db, workspace_id, current_user)
 
     sub = (
         db.query(Subscription)
@@ -79,15 +75,23 @@ def get_current_subscription(
     return sub
 
 
-@router.post("/create-order", response_model=CreateOrderResponse)
-def create_order(
-    payload: CreateOrderRequest,
-    db: Session = Depends(get_db),
+@router.get("/current/{workspace_id}", response_model=SubscriptionOut | None)
+async def get_current_subscription(
+    workspace_id: int,
+    db: DbSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    workspace = _get_workspace_or_403(db, payload.workspace_id, current_user)
-    plan = db.query(Plan).filter(Plan.id == payload.plan_id).first()
-    if not plan or not plan.is_active:
+    return await run_db(db, _get_current_subscription, workspace_id, current_user)
+
+
+def _create_order(
+    db: Session,
+    payload: CreateOrderRequest,
+    current_user: User,
+):
+    workspace = get_workspace_or_404(db, payload.workspace_id, current_user)
+    plan = get_active_plan(db, payload.plan_id)
+    if not plan:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Plan not found or inactive",
@@ -101,8 +105,9 @@ def create_order(
         db.add(sub)
         db.commit()
         db.refresh(sub)
+        invalidate_entitlement(workspace.id)
         return CreateOrderResponse(
-            razorpay_key_id=settings.RAZORPAY_KEY_ID,
+            razorpay_key_id=settings.RAZORPAY_KEY_ID or "",
             order_id="",
             amount=0,
             currency=plan.currency,
@@ -125,15 +130,23 @@ def create_order(
     )
 
 
-@router.post("/verify-payment", response_model=SubscriptionOut)
-def verify_payment(
-    payload: VerifyPaymentRequest,
-    db: Session = Depends(get_db),
+@router.post("/create-order", response_model=CreateOrderResponse)
+async def create_order(
+    payload: CreateOrderRequest,
+    db: DbSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    workspace = _get_workspace_or_403(db, payload.workspace_id, current_user)
-    plan = db.query(Plan).filter(Plan.id == payload.plan_id).first()
-    if not plan or not plan.is_active:
+    return await run_db(db, _create_order, payload, current_user)
+
+
+def _verify_payment(
+    db: Session,
+    payload: VerifyPaymentRequest,
+    current_user: User,
+):
+    workspace = get_workspace_or_404(db, payload.workspace_id, current_user)
+    plan = get_active_plan(db, payload.plan_id)
+    if not plan:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Plan not found or inactive",
@@ -157,3 +170,12 @@ def verify_payment(
     # Ensure plan is loaded
     _ = subscription.plan
     return subscription
+
+
+@router.post("/verify-payment", response_model=SubscriptionOut)
+async def verify_payment(
+    payload: VerifyPaymentRequest,
+    db: DbSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return await run_db(db, _verify_payment, payload, current_user)
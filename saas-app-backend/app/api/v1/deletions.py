@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.api.deps import get_current_user
+from app.models.user import User
+from app.schemas.deletion import DeletionJobOut
+from app.services.deletion_service import deletion_jobs
+
+router = APIRouter(prefix="/deletions", tags=["deletions"])
+
+
+@router.get("/{job_id}", response_model=DeletionJobOut)
+def get_deletion_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+):
+    """Progress of a background workspace/project deletion."""
+    job = deletion_jobs.get(job_id)
+    if job is None or job.owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Deletion job not found",
+        )
+    return job
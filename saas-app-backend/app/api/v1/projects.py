@@ -1,149 +1,431 @@
-from typing import List
-from app.services.billing_service import check_project_limit_for_workspace
+import asyncio
+import json
+from app.services.billing_service import reserve_project_quota
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session, aliased
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import (
+    DbSession,
+    get_db,
+    get_read_db,
+    get_current_user,
+    run_db,
+)
+from app.api.conditional import (
+    REVALIDATE,
+    add_validators,
+    etag_matches,
+    not_modified,
+    weak_etag,
+)
+from app.api.fieldsets import (
+    FIELDS_DESCRIPTION,
+    list_response_model,
+    parse_fields,
+    rows_response,
+    select_fields,
+)
+from app.api.pagination import encode_cursor
+from app.api.authz import (
+    get_workspace_or_404,
+    get_project_or_404,
+    ensure_workspace_access,
+    ensure_project_access,
+    guarded_project_write,
+)
 from app.models.user import User
-from app.models.workspace import Workspace
 from app.models.project import Project
+from app.models.task import Task
+from app.core.config import get_settings
+from app.services.ownership_cache import ownership_graph
+from app.services.events import (
+    event_broker,
+    project_channel,
+    publish_project,
+    publish_project_deleted,
+)
+from app.services.change_log import next_change_seq, workspace_of_project
+from app.services.deletion_service import (
+    DeletionJob,
+    count_tree_tasks,
+    delete_project_tree,
+    run_deletion_job,
+    start_deletion_job,
+)
 from app.schemas.project import (
     ProjectCreate,
     ProjectUpdate,
     ProjectOut,
+    BoardColumn,
+    ProjectBoard,
 )
+from app.schemas.task import TaskOut
+from app.schemas.deletion import DeletionJobOut
+
+settings = get_settings()
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
+# Columns every board shows, in order; other statuses are appended after
+BOARD_STATUSES = ("todo", "in_progress", "done")
 
-def _check_workspace_ownership(
+
+def _create_project(
     db: Session,
-    workspace_id: int,
+    project_in: ProjectCreate,
     current_user: User,
-) -> Workspace:
-    workspace = db.query(Workspace).filter(Workspace.id == workspace_id).first()
-    if not workspace:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Workspace not found",
-        )
-    if workspace.owner_id != current_user.id:
+):
+    workspace = get_workspace_or_404(db, project_in.workspace_id, current_user)
+
+    # 🔒 Enforce plan project limit
+    try:
+        reserve_project_quota(db, workspace)
+    except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not allowed to access this workspace",
+            detail=str(e),
         )
-    return workspace
+
+    _, change_seq = next_change_seq(db, workspace.id)
+    project = db.scalars(
+        insert(Project)
+        .values(
+            name=project_in.name,
+            description=project_in.description,
+            workspace_id=project_in.workspace_id,
+            created_by=current_user.id,
+            change_seq=change_seq,
+        )
+        .returning(Project)
+    ).one()
+    db.expunge(project)
+    db.commit()
+    ownership_graph.remember_project(project.id, project.workspace_id)
+    return project
+
+
+@router.post("/", response_model=ProjectOut)
+async def create_project(
+    project_in: ProjectCreate,
+    db: DbSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    project = await run_db(db, _create_project, project_in, current_user)
+    publish_project(ProjectOut.model_validate(project))
+    return project
 
 
-def _get_project_or_404(
+def _list_projects_for_workspace(
+    db: Session,
+    workspace_id: int,
+    names: tuple[str, ...] | None,
+    request: Request,
+    current_user: User,
+):
+    ensure_workspace_access(db, workspace_id, current_user)
+
+    max_seq, count = db.execute(
+        select(func.max(Project.change_seq), func.count(Project.id)).where(
+            Project.workspace_id == workspace_id
+        )
+    ).one()
+    etag = weak_etag("projects", workspace_id, max_seq or 0, count, *(names or ()))
+    if etag_matches(request, etag):
+        return etag, None
+
+    projects = db.execute(
+        select_fields(Project, ProjectOut, names)
+            .where(Project.workspace_id == workspace_id)
+            .order_by(Project.created_at.desc())
+    ).all()
+    return etag, projects
+
+
+@router.get(
+    "/by-workspace/{workspace_id}", response_model=list_response_model(ProjectOut)
+)
+async def list_projects_for_workspace(
+    workspace_id: int,
+    request: Request,
+    fields: str | None = Query(default=None, description=FIELDS_DESCRIPTION),
+    db: DbSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    names = parse_fields(fields, ProjectOut)
+    etag, projects = await run_db(
+        db, _list_projects_for_workspace, workspace_id, names, request, current_user
+    )
+    if projects is None:
+        return not_modified(etag, REVALIDATE)
+
+    # Encoded here rather than through response_model
+    response = rows_response(ProjectOut, names, projects)
+    add_validators(response, etag)
+    return response
+
+
+def _get_project(
     db: Session,
     project_id: int,
+    request: Request,
     current_user: User,
-) -> Project:
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
+):
+    ensure_project_access(db, project_id, current_user)
+
+    change_seq = db.scalar(
+        select(Project.change_seq).where(Project.id == project_id)
+    )
+    if change_seq is None:
+        ownership_graph.forget_project(project_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found",
         )
+    etag = weak_etag("project", project_id, change_seq)
+    if etag_matches(request, etag):
+        return etag, None
 
-    # Check ownership via workspace
-    workspace = db.query(Workspace).filter(Workspace.id == project.workspace_id).first()
-    if not workspace or workspace.owner_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not allowed to access this project",
-        )
-    return project
+    project = get_project_or_404(db, project_id, current_user)
+    return etag, project
 
 
-@router.post("/", response_model=ProjectOut)
-def create_project(
-    project_in: ProjectCreate,
-    db: Session = Depends(get_db),
+@router.get("/{project_id}", response_model=ProjectOut)
+async def get_project(
+    project_id: int,
+    request: Request,
+    response: Response,
+    db: DbSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    workspace = _check_workspace_ownership(db, project_in.workspace_id, current_user)
+    etag, project = await run_db(db, _get_project, project_id, request, current_user)
+    if project is None:
+        return not_modified(etag, REVALIDATE)
 
-    # 🔒 Enforce plan project limit
-    try:
-        check_project_limit_for_workspace(db, workspace)
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=str(e),
+    add_validators(response, etag)
+    return project
+
+
+def _get_project_board(
+    db: Session,
+    project_id: int,
+    limit: int,
+    current_user: User,
+):
+    project = get_project_or_404(db, project_id, current_user)
+
+    # One pass: rank tasks within their status and count each status
+    ranked = (
+        select(
+            Task,
+            func.row_number()
+            .over(partition_by=Task.status, order_by=(Task.position, Task.id))
+            .label("rn"),
+            func.count().over(partition_by=Task.status).label("total"),
+        )
+        .where(Task.project_id == project_id)
+        .subquery()
+    )
+    task = aliased(Task, ranked)
+    rows = db.execute(
+        select(task, ranked.c.total)
+        .where(ranked.c.rn <= limit)
+        .order_by(ranked.c.status, ranked.c.rn)
+    ).all()
+
+    columns = {
+        name: BoardColumn(status=name, total=0, tasks=[])
+        for name in BOARD_STATUSES
+    }
+    for row_task, total in rows:
+        column = columns.setdefault(
+            row_task.status, BoardColumn(status=row_task.status, total=0, tasks=[])
         )
+        column.total = total
+        column.tasks.append(TaskOut.model_validate(row_task))
 
-    project = Project(
-        name=project_in.name,
-        description=project_in.description,
-        workspace_id=project_in.workspace_id,
-        created_by=current_user.id,
+    for column in columns.values():
+        if column.total > len(column.tasks):
+            last = column.tasks[-1]
+            column.next_cursor = encode_cursor(last.position, last.id)
+    return ProjectBoard(
+        project=ProjectOut.model_validate(project), columns=list(columns.values())
     )
-    db.add(project)
-    db.commit()
-    db.refresh(project)
-    return project
 
 
+@router.get("/{project_id}/board", response_model=ProjectBoard)
+async def get_project_board(
+    project_id: int,
+    limit: int = Query(
+        default=settings.BOARD_COLUMN_PAGE_SIZE,
+        ge=1,
+        le=settings.TASK_PAGE_SIZE_MAX,
+    ),
+    db: DbSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    The project with its tasks grouped by status: the first `limit` tasks
+    of each column (board order) plus the column's total.
+    """
+    return await run_db(db, _get_project_board, project_id, limit, current_user)
+
 
-@router.get("/by-workspace/{workspace_id}", response_model=List[ProjectOut])
-def list_projects_for_workspace(
-    workspace_id: int,
-    db: Session = Depends(get_db),
+def _authorize_subscription(
+    db: Session,
+    project_id: int,
+    current_user: User,
+) -> None:
+    ensure_project_access(db, project_id, current_user)
+    # Hand the pooled connection back before the long-lived stream starts
+    db.rollback()
+
+
+def _format_event(event: dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+@router.get("/{project_id}/events")
+async def stream_project_events(
+    project_id: int,
+    request: Request,
+    db: DbSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    _ = _check_workspace_ownership(db, workspace_id, current_user)
+    """
+    Server-Sent Events stream of task/project changes in the project.
+    Events carry the full new state (`*.upsert`) or a deletion
+    (`*.delete`); rapid updates to the same task are coalesced. A
+    `resync` event means the client fell behind or the task order was
+    renumbered, and should refetch.
+    """
+    await run_db(db, _authorize_subscription, project_id, current_user)
+    subscription = event_broker.subscribe(project_channel(project_id))
 
-    projects = (
-        db.query(Project)
-            .filter(Project.workspace_id == workspace_id)
-            .order_by(Project.created_at.desc())
-            .all()
+    async def stream():
+        try:
+            yield ": connected\n\n"
+            while not await request.is_disconnected():
+                try:
+                    events = await asyncio.wait_for(
+                        subscription.next_batch(),
+                        timeout=settings.EVENT_KEEPALIVE_SECONDS,
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+
+                if events is None:
+                    yield "event: resync\ndata: {}\n\n"
+                    return
+                for event in events:
+                    yield _format_event(event)
+        finally:
+            event_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-    return projects
 
 
-@router.get("/{project_id}", response_model=ProjectOut)
-def get_project(
+def _update_project(
+    db: Session,
     project_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    project_in: ProjectUpdate,
+    current_user: User,
 ):
-    project = _get_project_or_404(db, project_id, current_user)
+    changes = project_in.model_dump(exclude_none=True)
+    if not changes:
+        return get_project_or_404(db, project_id, current_user)
+
+    def write(guard):
+        try:
+            _, change_seq = next_change_seq(db, workspace_of_project(project_id))
+        except LookupError:
+            return None
+        return db.scalars(
+            update(Project)
+            .where(Project.id == project_id, guard)
+            .values(**changes, change_seq=change_seq)
+            .returning(Project)
+        ).one_or_none()
+
+    project = guarded_project_write(db, project_id, current_user, write)
+    db.expunge(project)
+    db.commit()
     return project
 
 
 @router.patch("/{project_id}", response_model=ProjectOut)
-def update_project(
+async def update_project(
     project_id: int,
     project_in: ProjectUpdate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    project = _get_project_or_404(db, project_id, current_user)
+    project = await run_db(db, _update_project, project_id, project_in, current_user)
+    publish_project(ProjectOut.model_validate(project))
+    return project
 
-    if project_in.name is not None:
-        project.name = project_in.name
-    if project_in.description is not None:
-        project.description = project_in.description
-    if project_in.archived is not None:
-        project.archived = project_in.archived
 
-    db.add(project)
-    db.commit()
-    db.refresh(project)
-    return project
+def _delete_project(
+    db: Session,
+    project_id: int,
+    current_user: User,
+) -> DeletionJob | None:
+    # The tree is deleted by id over several transactions, so a cached
+    # chain is not enough here
+    ensure_project_access(db, project_id, current_user, cached=False)
 
+    task_count = count_tree_tasks(db, "project", project_id)
+    if task_count >= settings.DELETE_ASYNC_MIN_TASKS:
+        db.rollback()
+        return start_deletion_job("project", project_id, current_user.id)
 
-@router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_project(
+    if not delete_project_tree(db, project_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found",
+        )
+    return None
+
+
+@router.delete(
+    "/{project_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={status.HTTP_202_ACCEPTED: {"model": DeletionJobOut}},
+)
+async def delete_project(
     project_id: int,
-    db: Session = Depends(get_db),
+    background_tasks: BackgroundTasks,
+    db: DbSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    project = _get_project_or_404(db, project_id, current_user)
-    db.delete(project)
-    db.commit()
-    return None
+    """
+    Deletes the project and its tasks; large projects go to a background
+    job (202, see /deletions/{job_id}).
+    """
+    job = await run_db(db, _delete_project, project_id, current_user)
+    # Subscribers drop the project now, even if a job is still deleting it
+    publish_project_deleted(project_id)
+    if job is None:
+        return None
+
+    background_tasks.add_task(run_deletion_job, job)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=DeletionJobOut.model_validate(job).model_dump(),
+    )
@@ -0,0 +1,126 @@
+import time
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.deps import DbSession, get_read_db, get_current_user, run_db
+from app.api.authz import ensure_workspace_access
+from app.api.pagination import decode_cursor, encode_cursor
+from app.core.config import get_settings
+from app.models.user import User
+from app.models.project import Project
+from app.models.task import Task
+from app.models.sync_tombstone import SyncTombstone
+from app.schemas.project import ProjectOut
+from app.schemas.task import TaskOut
+from app.schemas.sync import SyncChanges
+from app.services.change_log import current_change_seq
+
+settings = get_settings()
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+
+def _since_from_token(token: str, workspace_id: int) -> int | None:
+    """
+    The sequence value a token was issued at, or None if it is older than
+    the tombstone retention and needs a full snapshot instead.
+    """
+    invalid = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid sync token",
+    )
+    try:
+        token_workspace_id, since, issued_at = decode_cursor(token, int, int, int)
+    except HTTPException:
+        raise invalid from None
+    if token_workspace_id != workspace_id:
+        raise invalid
+    if time.time() - issued_at > settings.SYNC_TOKEN_MAX_AGE_SECONDS:
+        return None
+    return since
+
+
+def _sync_workspace(
+    db: Session,
+    workspace_id: int,
+    token: str | None,
+    limit: int,
+    current_user: User,
+) -> SyncChanges:
+    ensure_workspace_access(db, workspace_id, current_user)
+
+    # Without a (still accepted) token every live row is sent and
+    # tombstones are irrelevant
+    since = None if token is None else _since_from_token(token, workspace_id)
+    reset = since is None
+    if reset:
+        since = -1
+    current = current_change_seq(db, workspace_id)
+
+    project_ids = select(Project.id).where(Project.workspace_id == workspace_id)
+    sources = [
+        (Project, select(Project).where(Project.workspace_id == workspace_id)),
+        (Task, select(Task).where(Task.project_id.in_(project_ids))),
+    ]
+    if not reset:
+        sources.append(
+            (
+                SyncTombstone,
+                select(SyncTombstone).where(
+                    SyncTombstone.workspace_id == workspace_id
+                ),
+            )
+        )
+
+    def fetch(upper: int, limit: int | None = None) -> list[list]:
+        results = []
+        for model, query in sources:
+            query = query.where(
+                model.change_seq > since, model.change_seq <= upper
+            ).order_by(model.change_seq, model.id)
+            if limit is not None:
+                query = query.limit(limit)
+            results.append(db.scalars(query).all())
+        return results
+
+    upper = current
+    results = fetch(upper, limit + 1)
+    overflow = [rows[limit].change_seq for rows in results if len(rows) > limit]
+    if overflow:
+        # Stop before the first sequence value that didn't fit, but always
+        # make progress: a single value's changes are never split
+        upper = max(min(overflow) - 1, since + 1)
+        results = fetch(upper)
+
+    projects, tasks = results[0], results[1]
+    tombstones = [] if reset else results[2]
+    return SyncChanges(
+        token=encode_cursor(workspace_id, upper, int(time.time())),
+        has_more=upper < current,
+        reset=reset,
+        projects=[ProjectOut.model_validate(project) for project in projects],
+        tasks=[TaskOut.model_validate(task) for task in tasks],
+        deleted_project_ids=[t.entity_id for t in tombstones if t.entity == "project"],
+        deleted_task_ids=[t.entity_id for t in tombstones if t.entity == "task"],
+    )
+
+
+@router.get("", response_model=SyncChanges)
+async def sync_workspace(
+    workspace_id: int,
+    token: str | None = None,
+    limit: int = Query(
+        default=settings.SYNC_PAGE_SIZE, ge=1, le=settings.SYNC_PAGE_SIZE_MAX
+    ),
+    db: DbSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Delta sync for one workspace. Call without `token` for a full
+    snapshot, then pass the returned token to receive only projects and
+    tasks created, updated or deleted since. Tokens older than
+    SYNC_TOKEN_MAX_AGE_SECONDS get a full snapshot with `reset` set.
+    """
+    return await run_db(db, _sync_workspace, workspace_id, token, limit, current_user)
@@ -1,183 +1,708 @@
 from typing import List
-from app.services.billing_service import check_task_limit_for_workspace
+from app.services.billing_service import reserve_task_quota
+from app.services.usage_service import release_tasks_for_project
+from app.services.task_ordering import (
+    POSITION_GAP,
+    gap_is_narrow,
+    next_position,
+    next_position_clause,
+    position_between,
+    rebalance_project,
+    rebalance_project_in_background,
+)
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from sqlalchemy import case, delete, func, insert, select, tuple_, update
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import (
+    DbSession,
+    get_db,
+    get_read_db,
+    get_current_user,
+    run_db,
+)
+from app.api.authz import (
+    authorize_tasks,
+    get_project_with_workspace_or_404,
+    get_task_or_404,
+    guarded_task_write,
+    ensure_project_access,
+    ensure_task_access,
+    ensure_workspace_access,
+)
+from app.api.conditional import (
+    REVALIDATE,
+    add_validators,
+    etag_matches,
+    not_modified,
+    query_digest,
+    weak_etag,
+)
+from app.api.fieldsets import (
+    FIELDS_DESCRIPTION,
+    list_response_model,
+    parse_fields,
+    rows_response,
+    select_fields,
+)
+from app.api.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.core.config import get_settings
 from app.models.user import User
-from app.models.workspace import Workspace
 from app.models.project import Project
 from app.models.task import Task
-from app.schemas.task import TaskCreate, TaskUpdate, TaskOut
+from app.models.workspace import Workspace
+from app.schemas.task import (
+    TaskCreate,
+    TaskBulkCreate,
+    TaskBatchUpdate,
+    TaskBatchResult,
+    TaskUpdate,
+    TaskMove,
+    TaskOut,
+    TaskFilters,
+)
+from app.services import task_search
+from app.services.events import (
+    publish_resync,
+    publish_task,
+    publish_task_deleted,
+)
+from app.services.change_log import (
+    next_change_seq,
+    record_tombstones,
+    workspace_of_project,
+    workspace_of_task,
+)
+from app.services.ownership_cache import ownership_graph
+
+settings = get_settings()
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 
-def _check_project_ownership(
+def _create_task(
     db: Session,
-    project_id: int,
+    task_in: TaskCreate,
     current_user: User,
-) -> Project:
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found",
-        )
+):
+    project, workspace = get_project_with_workspace_or_404(
+        db, task_in.project_id, current_user
+    )
 
-    workspace = db.query(Workspace).filter(Workspace.id == project.workspace_id).first()
-    if not workspace or workspace.owner_id != current_user.id:
+    # 🔒 Enforce plan task limit for the workspace of this project
+    try:
+        reserve_task_quota(db, workspace)
+    except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not allowed to access this project",
-        )
-
-    return project
-
-
-def _get_task_or_404(
-    db: Session,
-    task_id: int,
-    current_user: User,
-) -> Task:
-    task = db.query(Task).filter(Task.id == task_id).first()
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found",
-        )
-
-    # Verify ownership via project -> workspace -> owner
-    project = db.query(Project).filter(Project.id == task.project_id).first()
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found for this task",
+            detail=str(e),
         )
 
-    workspace = db.query(Workspace).filter(Workspace.id == project.workspace_id).first()
-    if not workspace or workspace.owner_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not allowed to access this task",
+    _, change_seq = next_change_seq(db, workspace.id)
+    task = db.scalars(
+        insert(Task)
+        .values(
+            title=task_in.title,
+            description=task_in.description,
+            status=task_in.status,
+            priority=task_in.priority,
+            due_date=task_in.due_date,
+            position=next_position_clause(project.id),
+            project_id=project.id,
+            created_by=current_user.id,
+            change_seq=change_seq,
         )
-
+        .returning(Task)
+    ).one()
+    # Detached, the RETURNING values survive the commit without a refresh
+    db.expunge(task)
+    db.commit()
+    ownership_graph.remember_task(task.id, task.project_id)
     return task
 
 
 @router.post("/", response_model=TaskOut)
-def create_task(
+async def create_task(
     task_in: TaskCreate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    project = _check_project_ownership(db, task_in.project_id, current_user)
+    task = await run_db(db, _create_task, task_in, current_user)
+    publish_task(TaskOut.model_validate(task))
+    return task
 
-    # 🔒 Enforce plan task limit for the workspace of this project
-    workspace = (
-        db.query(Workspace)
-        .filter(Workspace.id == project.workspace_id)
-        .first()
+
+def _create_tasks_bulk(
+    db: Session,
+    bulk_in: TaskBulkCreate,
+    current_user: User,
+):
+    project, workspace = get_project_with_workspace_or_404(
+        db, bulk_in.project_id, current_user
     )
+
+    # 🔒 One quota reservation for the whole batch
     try:
-        check_task_limit_for_workspace(db, workspace)
+        reserve_task_quota(db, workspace, count=len(bulk_in.items))
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=str(e),
         )
 
-    # You could compute position based on current max in that project:
-    max_position = (
-        db.query(Task)
-        .filter(Task.project_id == project.id)
-        .order_by(Task.position.desc())
-        .first()
-    )
-    next_position = (max_position.position + 1) if max_position else 1
-
-    task = Task(
-        title=task_in.title,
-        description=task_in.description,
-        status=task_in.status,
-        priority=task_in.priority,
-        due_date=task_in.due_date,
-        position=next_position,
-        project_id=project.id,
-        created_by=current_user.id,
-    )
-    db.add(task)
+    first_position = next_position(db, project.id)
+    _, change_seq = next_change_seq(db, workspace.id)
+
+    # Single multi-row INSERT ... RETURNING; positions keep the usual spacing
+    tasks = db.scalars(
+        insert(Task).returning(Task),
+        [
+            {
+                "title": item.title,
+                "description": item.description,
+                "status": item.status,
+                "priority": item.priority,
+                "due_date": item.due_date,
+                "position": first_position + offset * POSITION_GAP,
+                "project_id": project.id,
+                "created_by": current_user.id,
+                "change_seq": change_seq,
+            }
+            for offset, item in enumerate(bulk_in.items)
+        ],
+    ).all()
+    # RETURNING rows have no guaranteed order (Postgres may reorder them).
+    # Positions grow with the item's index, so they restore input order.
+    # sort_by_parameter_order=True would do the same on Postgres, but SQLite
+    # has no implicit sentinel and would fall back to one INSERT per row
+    tasks = sorted(tasks, key=lambda task: task.position)
+
+    # Serialize before commit so expiring the rows doesn't trigger reloads
+    created = [TaskOut.model_validate(task) for task in tasks]
     db.commit()
-    db.refresh(task)
-    return task
+    for task in created:
+        ownership_graph.remember_task(task.id, task.project_id)
+    return created
+
+
+@router.post("/bulk", response_model=List[TaskOut])
+async def create_tasks_bulk(
+    bulk_in: TaskBulkCreate,
+    db: DbSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    created = await run_db(db, _create_tasks_bulk, bulk_in, current_user)
+    for task in created:
+        publish_task(task)
+    return created
+
+
+def _change_seqs_for_tasks(
+    db: Session, task_ids: list[int], current_user: User
+) -> dict[int, int]:
+    """
+    Takes one change sequence value per workspace the tasks belong to.
+    Tasks that don't exist or that the user doesn't own are left out.
+    """
+    rows = db.execute(
+        select(Task.id, Project.workspace_id)
+        .join(Project, Project.id == Task.project_id)
+        .join(Workspace, Workspace.id == Project.workspace_id)
+        .where(Task.id.in_(task_ids), Workspace.owner_id == current_user.id)
+    ).all()
+    seqs = {}
+    for workspace_id in sorted({workspace_id for _, workspace_id in rows}):
+        seqs[workspace_id] = next_change_seq(db, workspace_id)[1]
+    return {task_id: seqs[workspace_id] for task_id, workspace_id in rows}
+
+
+def _update_tasks_batch(
+    db: Session,
+    batch_in: TaskBatchUpdate,
+    current_user: User,
+):
+    task_ids = [item.task_id for item in batch_in.items]
+    errors = authorize_tasks(db, task_ids, current_user)
+
+    # Later items for the same task win, field by field (None = unchanged)
+    changes: dict[int, dict] = {}
+    for item in batch_in.items:
+        if errors[item.task_id] is None:
+            changes.setdefault(item.task_id, {}).update(
+                item.changes.model_dump(exclude_none=True)
+            )
+
+    # Sequence values first: the counters row is locked before the tasks,
+    # in the same order as every other write path. The lookup joins up to
+    # the owner, so only tasks the database confirms are written; the rest
+    # were granted from a stale cache entry (or deleted) and are rechecked
+    seqs = _change_seqs_for_tasks(db, list(changes), current_user) if changes else {}
+    stale = [task_id for task_id in changes if task_id not in seqs]
+
+    # One UPDATE per field; per-task values are picked with CASE on the id
+    by_field: dict[str, dict[int, object]] = {}
+    for task_id in seqs:
+        for field, value in changes[task_id].items():
+            by_field.setdefault(field, {})[task_id] = value
+    for field, values in by_field.items():
+        db.execute(
+            update(Task)
+            .where(Task.id.in_(values))
+            .values({field: case(values, value=Task.id)})
+            .execution_options(synchronize_session=False)
+        )
+
+    # Every changed task gets a new change_seq, so this last UPDATE's
+    # RETURNING doubles as the read-back
+    tasks = {}
+    if seqs:
+        rows = db.scalars(
+            update(Task)
+            .where(Task.id.in_(seqs))
+            .values(change_seq=case(seqs, value=Task.id))
+            .returning(Task)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        ).all()
+        tasks = {task.id: TaskOut.model_validate(task) for task in rows}
+    db.commit()
+
+    if stale:
+        for task_id in stale:
+            ownership_graph.forget_task(task_id)
+        errors.update(authorize_tasks(db, stale, current_user))
+
+    results = []
+    for task_id in dict.fromkeys(task_ids):
+        error = errors[task_id]
+        if error is not None:
+            results.append(
+                TaskBatchResult(
+                    task_id=task_id,
+                    status_code=error.status_code,
+                    detail=error.detail,
+                )
+            )
+        elif task_id not in tasks:
+            # Deleted (or moved away) between the authorization and the updates
+            results.append(
+                TaskBatchResult(
+                    task_id=task_id,
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Task not found",
+                )
+            )
+        else:
+            results.append(
+                TaskBatchResult(
+                    task_id=task_id,
+                    status_code=status.HTTP_200_OK,
+                    task=tasks[task_id],
+                )
+            )
+    return results
 
 
+@router.patch("/batch", response_model=List[TaskBatchResult])
+async def update_tasks_batch(
+    batch_in: TaskBatchUpdate,
+    db: DbSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Applies several partial updates in one transaction. Items the caller
+    may not touch are reported per item instead of failing the batch.
+    """
+    results = await run_db(db, _update_tasks_batch, batch_in, current_user)
+    for result in results:
+        if result.task is not None:
+            publish_task(result.task)
+    return results
+
 
-@router.get("/by-project/{project_id}", response_model=List[TaskOut])
-def list_tasks_for_project(
+def _apply_filters(query, filters: TaskFilters):
+    if filters.status is not None:
+        query = query.filter(Task.status == filters.status)
+    if filters.priority is not None:
+        query = query.filter(Task.priority == filters.priority)
+    if filters.assigned_to is not None:
+        query = query.filter(Task.assigned_to == filters.assigned_to)
+    if filters.due_after is not None:
+        query = query.filter(Task.due_date >= filters.due_after)
+    if filters.due_before is not None:
+        query = query.filter(Task.due_date < filters.due_before)
+    return query
+
+
+def _list_tasks_for_project(
+    db: Session,
     project_id: int,
-    db: Session = Depends(get_db),
+    filters: TaskFilters,
+    cursor: str | None,
+    limit: int,
+    names: tuple[str, ...] | None,
+    request: Request,
+    current_user: User,
+):
+    ensure_project_access(db, project_id, current_user)
+
+    # Any task write bumps the max change_seq; deletes lower the count
+    max_seq, count = db.execute(
+        select(func.max(Task.change_seq), func.count(Task.id)).where(
+            Task.project_id == project_id
+        )
+    ).one()
+    # Every parameter that shapes the page is part of the key
+    shape = query_digest(filters.model_dump(mode="json"), cursor, limit, names)
+    etag = weak_etag("tasks", project_id, max_seq or 0, count, shape)
+    if etag_matches(request, etag):
+        return etag, None, None
+
+    # Plain rows of the response columns, plus the keyset the cursor needs
+    query = select_fields(Task, TaskOut, names, "position")
+    query = _apply_filters(query.filter(Task.project_id == project_id), filters)
+    if cursor is not None:
+        position, last_id = decode_cursor(cursor, int, int)
+        query = query.filter(tuple_(Task.position, Task.id) > tuple_(position, last_id))
+
+    # Fetch one extra row to know whether another page follows
+    tasks = db.execute(
+        query.order_by(Task.position.asc(), Task.id.asc()).limit(limit + 1)
+    ).all()
+
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        next_cursor = encode_cursor(tasks[-1].position, tasks[-1].id)
+    return etag, tasks, next_cursor
+
+
+@router.get("/by-project/{project_id}", response_model=list_response_model(TaskOut))
+async def list_tasks_for_project(
+    project_id: int,
+    request: Request,
+    filters: TaskFilters = Depends(),
+    cursor: str | None = None,
+    limit: int = Query(
+        default=settings.TASK_PAGE_SIZE, ge=1, le=settings.TASK_PAGE_SIZE_MAX
+    ),
+    fields: str | None = Query(default=None, description=FIELDS_DESCRIPTION),
+    db: DbSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
-    project = _check_project_ownership(db, project_id, current_user)
+    """
+    Keyset-paginated on (position, id). When more tasks follow, the
+    X-Next-Cursor response header holds the cursor for the next page.
+    """
+    names = parse_fields(fields, TaskOut)
+    etag, tasks, next_cursor = await run_db(
+        db,
+        _list_tasks_for_project,
+        project_id,
+        filters,
+        cursor,
+        limit,
+        names,
+        request,
+        current_user,
+    )
+    if tasks is None:
+        return not_modified(etag, REVALIDATE)
 
-    tasks = (
-        db.query(Task)
-        .filter(Task.project_id == project.id)
-        .order_by(Task.position.asc())
-        .all()
+    # Encoded here rather than through response_model
+    response = rows_response(TaskOut, names, tasks)
+    add_validators(response, etag)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return response
+
+
+def _search_tasks(
+    db: Session,
+    q: str,
+    workspace_id: int | None,
+    project_id: int | None,
+    limit: int,
+    current_user: User,
+):
+    if (workspace_id is None) == (project_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Pass exactly one of workspace_id or project_id",
+        )
+
+    if project_id is not None:
+        ensure_project_access(db, project_id, current_user)
+        scope = Task.project_id == project_id
+    else:
+        ensure_workspace_access(db, workspace_id, current_user)
+        scope = Task.project_id.in_(
+            select(Project.id).where(Project.workspace_id == workspace_id)
+        )
+    return task_search.search_tasks(db, q, scope, limit)
+
+
+@router.get("/search", response_model=List[TaskOut])
+async def search_tasks(
+    q: str = Query(min_length=1, max_length=200),
+    workspace_id: int | None = None,
+    project_id: int | None = None,
+    limit: int = Query(
+        default=settings.TASK_SEARCH_LIMIT, ge=1, le=settings.TASK_SEARCH_LIMIT_MAX
+    ),
+    db: DbSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Full-text search over task titles and descriptions within one
+    workspace or project, best matches first. Words match as prefixes.
+    """
+    return await run_db(
+        db, _search_tasks, q, workspace_id, project_id, limit, current_user
     )
-    return tasks
+
+
+def _get_task(
+    db: Session,
+    task_id: int,
+    request: Request,
+    current_user: User,
+):
+    ensure_task_access(db, task_id, current_user)
+
+    change_seq = db.scalar(select(Task.change_seq).where(Task.id == task_id))
+    if change_seq is None:
+        ownership_graph.forget_task(task_id)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found",
+        )
+    etag = weak_etag("task", task_id, change_seq)
+    if etag_matches(request, etag):
+        return etag, None
+
+    task = get_task_or_404(db, task_id, current_user)
+    return etag, task
 
 
 @router.get("/{task_id}", response_model=TaskOut)
-def get_task(
+async def get_task(
     task_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: DbSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    task = _get_task_or_404(db, task_id, current_user)
+    etag, task = await run_db(db, _get_task, task_id, request, current_user)
+    if task is None:
+        return not_modified(etag, REVALIDATE)
+
+    add_validators(response, etag)
+    return task
+
+
+def _update_task(
+    db: Session,
+    task_id: int,
+    task_in: TaskUpdate,
+    current_user: User,
+):
+    changes = task_in.model_dump(exclude_none=True)
+    if not changes:
+        return get_task_or_404(db, task_id, current_user)
+
+    def write(guard):
+        try:
+            _, change_seq = next_change_seq(db, workspace_of_task(task_id))
+        except LookupError:
+            return None
+        return db.scalars(
+            update(Task)
+            .where(Task.id == task_id, guard)
+            .values(**changes, change_seq=change_seq)
+            .returning(Task)
+        ).one_or_none()
+
+    task = guarded_task_write(db, task_id, current_user, write)
+    db.expunge(task)
+    db.commit()
     return task
 
 
 @router.patch("/{task_id}", response_model=TaskOut)
-def update_task(
+async def update_task(
     task_id: int,
     task_in: TaskUpdate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    task = _get_task_or_404(db, task_id, current_user)
-
-    if task_in.title is not None:
-        task.title = task_in.title
-    if task_in.description is not None:
-        task.description = task_in.description
-    if task_in.status is not None:
-        task.status = task_in.status
-    if task_in.priority is not None:
-        task.priority = task_in.priority
-    if task_in.due_date is not None:
-        task.due_date = task_in.due_date
-    if task_in.position is not None:
-        task.position = task_in.position
-    if task_in.assigned_to is not None:
-        task.assigned_to = task_in.assigned_to
-
-    db.add(task)
+    task = await run_db(db, _update_task, task_id, task_in, current_user)
+    publish_task(TaskOut.model_validate(task))
+    return task
+
+
+def _neighbour_bounds(
+    db: Session, task: Task, move_in: TaskMove
+) -> tuple[int | None, int | None]:
+    """Positions of the tasks the moved task should land between."""
+    if move_in.after_id is not None and move_in.after_id == move_in.before_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="after_id and before_id must be different tasks",
+        )
+
+    ids = [i for i in (move_in.after_id, move_in.before_id) if i is not None]
+    positions = dict(
+        db.query(Task.id, Task.position)
+        .filter(Task.id.in_(ids), Task.project_id == task.project_id)
+        .all()
+    )
+    if len(positions) != len(set(ids)) or task.id in positions:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Neighbour task not found in this project",
+        )
+
+    others = db.query(Task.position).filter(
+        Task.project_id == task.project_id, Task.id != task.id
+    )
+    lower = positions.get(move_in.after_id)
+    upper = positions.get(move_in.before_id)
+
+    if move_in.after_id is None and move_in.before_id is None:
+        lower = others.with_entities(func.max(Task.position)).scalar()
+    elif move_in.before_id is None:
+        upper = (
+            others.filter(Task.position > lower)
+            .with_entities(func.min(Task.position))
+            .scalar()
+        )
+    elif move_in.after_id is None:
+        lower = (
+            others.filter(Task.position < upper)
+            .with_entities(func.max(Task.position))
+            .scalar()
+        )
+
+    if lower is not None and upper is not None and lower > upper:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="after_id must be positioned before before_id",
+        )
+    return lower, upper
+
+
+def _move_task(
+    db: Session,
+    task_id: int,
+    move_in: TaskMove,
+    current_user: User,
+):
+    task = get_task_or_404(db, task_id, current_user)
+
+    lower, upper = _neighbour_bounds(db, task, move_in)
+    position = position_between(lower, upper)
+    rebalanced = position is None
+    if rebalanced:
+        # No integer left between the neighbours: renumber, then retry
+        rebalance_project(db, task.project_id)
+        lower, upper = _neighbour_bounds(db, task, move_in)
+        position = position_between(lower, upper)
+    if position is None:
+        # Only a concurrent write can close the gap again this quickly
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="No room between the neighbour tasks, please retry",
+        )
+
+    changes = {"position": position}
+    if move_in.status is not None:
+        changes["status"] = move_in.status
+    _, changes["change_seq"] = next_change_seq(
+        db, workspace_of_project(task.project_id)
+    )
+    moved = db.scalars(
+        update(Task).where(Task.id == task.id).values(**changes).returning(Task)
+    ).one_or_none()
+    if moved is None:
+        db.rollback()
+        ownership_graph.forget_task(task_id)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found",
+        )
+
+    db.expunge(moved)
     db.commit()
-    db.refresh(task)
+    return moved, rebalanced, gap_is_narrow(lower, upper, position)
+
+
+@router.post("/{task_id}/move", response_model=TaskOut)
+async def move_task(
+    task_id: int,
+    move_in: TaskMove,
+    background_tasks: BackgroundTasks,
+    db: DbSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Reorders a task by rewriting only its own position. Narrow gaps are
+    renumbered in the background after the response is sent.
+    """
+    task, rebalanced, needs_rebalance = await run_db(
+        db, _move_task, task_id, move_in, current_user
+    )
+    if rebalanced:
+        # Every position in the project changed, not just this task's
+        publish_resync(task.project_id)
+    else:
+        publish_task(TaskOut.model_validate(task))
+    if needs_rebalance:
+        background_tasks.add_task(rebalance_project_in_background, task.project_id)
     return task
 
 
+def _delete_task(
+    db: Session,
+    task_id: int,
+    current_user: User,
+):
+    project_id = guarded_task_write(
+        db,
+        task_id,
+        current_user,
+        lambda guard: db.execute(
+            delete(Task)
+            .where(Task.id == task_id, guard)
+            .returning(Task.project_id)
+            .execution_options(synchronize_session=False)
+        ).scalar(),
+    )
+
+    release_tasks_for_project(db, project_id)
+    workspace_id, change_seq = next_change_seq(db, workspace_of_project(project_id))
+    record_tombstones(db, workspace_id, change_seq, "task", [task_id])
+    db.commit()
+    ownership_graph.forget_task(task_id)
+    return project_id
+
+
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_task(
+async def delete_task(
     task_id: int,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    task = _get_task_or_404(db, task_id, current_user)
-    db.delete(task)
-    db.commit()
+    project_id = await run_db(db, _delete_task, task_id, current_user)
+    publish_task_deleted(project_id, task_id)
     return None
@@ -1,104 +1,250 @@
-from typing import List
-
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    status,
+)
+from fastapi.responses import JSONResponse
+from sqlalchemy import func, insert, select, update
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import (
+    DbSession,
+    get_db,
+    get_read_db,
+    get_current_user,
+    run_db,
+)
+from app.api.authz import (
+    ensure_workspace_access,
+    get_workspace_or_404,
+    guarded_workspace_write,
+)
+from app.api.fieldsets import (
+    FIELDS_DESCRIPTION,
+    list_response_model,
+    parse_fields,
+    rows_response,
+    select_fields,
+)
+from app.api.conditional import (
+    REVALIDATE,
+    add_validators,
+    etag_matches,
+    not_modified,
+    weak_etag,
+)
 from app.models.user import User
 from app.models.workspace import Workspace
+from app.models.workspace_usage import WorkspaceUsage
+from app.core.config import get_settings
+from app.services.ownership_cache import ownership_graph
+from app.services.change_log import next_change_seq
+from app.services.deletion_service import (
+    DeletionJob,
+    count_tree_tasks,
+    delete_workspace_tree,
+    run_deletion_job,
+    start_deletion_job,
+)
 from app.schemas.workspace import (
     WorkspaceCreate,
     WorkspaceUpdate,
     WorkspaceOut,
 )
+from app.schemas.deletion import DeletionJobOut
+
+settings = get_settings()
 
 router = APIRouter(prefix="/workspaces", tags=["workspaces"])
 
 
-def _get_workspace_or_404(
+def _create_workspace(
     db: Session,
-    workspace_id: int,
+    workspace_in: WorkspaceCreate,
     current_user: User,
-) -> Workspace:
-    workspace = db.query(Workspace).filter(Workspace.id == workspace_id).first()
-    if not workspace:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Workspace not found",
-        )
-    if workspace.owner_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not allowed to access this workspace",
+):
+    workspace = db.scalars(
+        insert(Workspace)
+        .values(name=workspace_in.name, owner_id=current_user.id)
+        .returning(Workspace)
+    ).one()
+    db.execute(
+        insert(WorkspaceUsage).values(
+            workspace_id=workspace.id, project_count=0, task_count=0
         )
+    )
+    db.expunge(workspace)
+    db.commit()
+    ownership_graph.remember_workspace(workspace.id, workspace.owner_id)
     return workspace
 
 
 @router.post("/", response_model=WorkspaceOut)
-def create_workspace(
+async def create_workspace(
     workspace_in: WorkspaceCreate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    workspace = Workspace(
-        name=workspace_in.name,
-        owner_id=current_user.id,
+    return await run_db(db, _create_workspace, workspace_in, current_user)
+
+
+def _list_workspaces(
+    db: Session,
+    names: tuple[str, ...] | None,
+    request: Request,
+    current_user: User,
+):
+    # Creates raise the max id, deletes lower the count, renames bump the
+    # workspace's change sequence
+    count, max_id, seq_total = db.execute(
+        select(
+            func.count(Workspace.id),
+            func.max(Workspace.id),
+            func.coalesce(func.sum(WorkspaceUsage.change_seq), 0),
+        )
+        .select_from(Workspace)
+        .outerjoin(WorkspaceUsage, WorkspaceUsage.workspace_id == Workspace.id)
+        .where(Workspace.owner_id == current_user.id)
+    ).one()
+    etag = weak_etag(
+        "workspaces", current_user.id, count, max_id or 0, seq_total, *(names or ())
     )
-    db.add(workspace)
-    db.commit()
-    db.refresh(workspace)
-    return workspace
+    if etag_matches(request, etag):
+        return etag, None
+
+    workspaces = db.execute(
+        select_fields(Workspace, WorkspaceOut, names)
+        .where(Workspace.owner_id == current_user.id)
+        .order_by(Workspace.created_at.desc())
+    ).all()
+    return etag, workspaces
 
 
-@router.get("/", response_model=List[WorkspaceOut])
-def list_workspaces(
-    db: Session = Depends(get_db),
+@router.get("/", response_model=list_response_model(WorkspaceOut))
+async def list_workspaces(
+    request: Request,
+    fields: str | None = Query(default=None, description=FIELDS_DESCRIPTION),
+    db: DbSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
-    workspaces = (
-        db.query(Workspace)
-        .filter(Workspace.owner_id == current_user.id)
-        .order_by(Workspace.created_at.desc())
-        .all()
+    names = parse_fields(fields, WorkspaceOut)
+    etag, workspaces = await run_db(
+        db, _list_workspaces, names, request, current_user
     )
-    return workspaces
+    if workspaces is None:
+        return not_modified(etag, REVALIDATE)
+
+    # Encoded here rather than through response_model
+    response = rows_response(WorkspaceOut, names, workspaces)
+    add_validators(response, etag)
+    return response
+
+
+def _get_workspace(
+    db: Session,
+    workspace_id: int,
+    current_user: User,
+):
+    workspace = get_workspace_or_404(db, workspace_id, current_user)
+    return workspace
 
 
 @router.get("/{workspace_id}", response_model=WorkspaceOut)
-def get_workspace(
+async def get_workspace(
     workspace_id: int,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    workspace = _get_workspace_or_404(db, workspace_id, current_user)
+    return await run_db(db, _get_workspace, workspace_id, current_user)
+
+
+def _update_workspace(
+    db: Session,
+    workspace_id: int,
+    workspace_in: WorkspaceUpdate,
+    current_user: User,
+):
+    changes = workspace_in.model_dump(exclude_none=True)
+    if not changes:
+        return get_workspace_or_404(db, workspace_id, current_user)
+
+    workspace = guarded_workspace_write(
+        db,
+        workspace_id,
+        current_user,
+        lambda guard: db.scalars(
+            update(Workspace)
+            .where(Workspace.id == workspace_id, guard)
+            .values(**changes)
+            .returning(Workspace)
+        ).one_or_none(),
+    )
+
+    # Renames invalidate the workspace list ETag
+    next_change_seq(db, workspace_id)
+    db.expunge(workspace)
+    db.commit()
     return workspace
 
 
 @router.patch("/{workspace_id}", response_model=WorkspaceOut)
-def update_workspace(
+async def update_workspace(
     workspace_id: int,
     workspace_in: WorkspaceUpdate,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    workspace = _get_workspace_or_404(db, workspace_id, current_user)
+    return await run_db(db, _update_workspace, workspace_id, workspace_in, current_user)
 
-    if workspace_in.name is not None:
-        workspace.name = workspace_in.name
 
-    db.add(workspace)
-    db.commit()
-    db.refresh(workspace)
-    return workspace
+def _delete_workspace(
+    db: Session,
+    workspace_id: int,
+    current_user: User,
+) -> DeletionJob | None:
+    # The tree is deleted by id over several transactions, so a cached
+    # owner is not enough here
+    ensure_workspace_access(db, workspace_id, current_user, cached=False)
 
+    task_count = count_tree_tasks(db, "workspace", workspace_id)
+    if task_count >= settings.DELETE_ASYNC_MIN_TASKS:
+        db.rollback()
+        return start_deletion_job("workspace", workspace_id, current_user.id)
 
-@router.delete("/{workspace_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_workspace(
+    if not delete_workspace_tree(db, workspace_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Workspace not found",
+        )
+    return None
+
+
+@router.delete(
+    "/{workspace_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={status.HTTP_202_ACCEPTED: {"model": DeletionJobOut}},
+)
+async def delete_workspace(
     workspace_id: int,
-    db: Session = Depends(get_db),
+    background_tasks: BackgroundTasks,
+    db: DbSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    workspace = _get_workspace_or_404(db, workspace_id, current_user)
-    db.delete(workspace)
-    db.commit()
-    return None
+    """
+    Deletes the workspace and everything in it. Large workspaces are
+    deleted in the background: the response is 202 with a job whose
+    progress can be polled at /deletions/{job_id}.
+    """
+    job = await run_db(db, _delete_workspace, workspace_id, current_user)
+    if job is None:
+        return None
+
+    background_tasks.add_task(run_deletion_job, job)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=DeletionJobOut.model_validate(job).model_dump(),
+    )
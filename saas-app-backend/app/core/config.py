@@ -7,10 +7,88 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     ALGORITHM: str = "HS256"
+
+    # Serve requests through AsyncSession (asyncpg / aiosqlite) instead of
+    # the sync Session. ASYNC_DATABASE_URL defaults to DATABASE_URL with the
+    # driver swapped.
+    DB_ASYNC: bool = False
+    ASYNC_DATABASE_URL: str | None = None
+
+    # Connection pool (applies to every engine)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800  # seconds, -1 disables
+    DB_POOL_PRE_PING: bool = True
+
+    # Optional read replica for GET list endpoints. Users who wrote within
+    # READ_YOUR_WRITES_SECONDS keep reading from the primary.
+    READ_DATABASE_URL: str | None = None
+    READ_YOUR_WRITES_SECONDS: int = 5
+    READ_YOUR_WRITES_MAX_USERS: int = 10000
     # Make these optional for now
     RAZORPAY_KEY_ID: str | None = None
     RAZORPAY_KEY_SECRET: str | None = None
 
+    # Authenticated principal cache (used by get_current_user)
+    PRINCIPAL_CACHE_MAX_SIZE: int = 1024
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+
+    # Verified JWT cache (used by decode_token)
+    TOKEN_CACHE_MAX_SIZE: int = 4096
+
+    # Password hashing pool (0 workers = run in the default threadpool)
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    # task -> project -> workspace -> owner index (entries per level). The
+    # TTL bounds how long other workers can trust an edge after a delete.
+    OWNERSHIP_CACHE_MAX_SIZE: int = 10000
+    OWNERSHIP_CACHE_TTL_SECONDS: int = 300
+
+    # Per-workspace plan entitlements; entries also expire at period end.
+    # The TTL bounds how long other workers can serve a superseded plan.
+    ENTITLEMENT_CACHE_MAX_SIZE: int = 10000
+    ENTITLEMENT_CACHE_TTL_SECONDS: int = 300
+
+    # Cache-Control max-age for the /billing/plans catalog, and how often
+    # each process reloads its snapshot to pick up plan edits
+    PLAN_CATALOG_MAX_AGE_SECONDS: int = 300
+    PLAN_CATALOG_REFRESH_SECONDS: int = 30
+
+    # Keyset pagination for task listings
+    TASK_PAGE_SIZE: int = 200
+    TASK_PAGE_SIZE_MAX: int = 1000
+    # Tasks per status column on the project board
+    BOARD_COLUMN_PAGE_SIZE: int = 50
+
+    # Delta sync: rows per entity type before a response is cut short
+    SYNC_PAGE_SIZE: int = 500
+    SYNC_PAGE_SIZE_MAX: int = 5000
+    # Tokens older than this get a full snapshot instead of a delta, so
+    # tombstones only have to be kept that long; pruned every interval
+    SYNC_TOKEN_MAX_AGE_SECONDS: int = 30 * 24 * 3600
+    SYNC_TOMBSTONE_PRUNE_INTERVAL_SECONDS: int = 3600
+
+    # Live project events: broker backend ("module:Class"), distinct
+    # entities a subscriber may lag behind before it must resync, how long
+    # to let bursts coalesce, and the SSE keepalive interval
+    EVENT_BACKEND: str = "app.services.events:LocalBackend"
+    EVENT_QUEUE_MAX_SIZE: int = 256
+    EVENT_COALESCE_SECONDS: float = 0.05
+    EVENT_KEEPALIVE_SECONDS: int = 15
+
+    # Ranked task search results per request
+    TASK_SEARCH_LIMIT: int = 20
+    TASK_SEARCH_LIMIT_MAX: int = 100
+
+    # Cascading deletes: rows per DELETE, and trees with at least this many
+    # tasks are deleted by a background job
+    DELETE_CHUNK_SIZE: int = 1000
+    DELETE_ASYNC_MIN_TASKS: int = 5000
+    DELETION_JOB_MAX_SIZE: int = 1000
+    DELETION_JOB_TTL_SECONDS: int = 3600
+
     class Config:
         env_file = ".env"
 
@@ -1,16 +1,20 @@
+import hashlib
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 
+from app.core.cache import TTLCache
 from app.core.config import get_settings
 
 settings = get_settings()
 
 pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 
-
+# sha256(token) -> verified payload, each entry living until the token's exp
+token_cache = TTLCache(max_size=settings.TOKEN_CACHE_MAX_SIZE)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -36,10 +40,23 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 
 def decode_token(token: str):
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        if payload["exp"] > time.time():
+            return dict(payload)
+        token_cache.invalidate(key)
+        return None
+
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        return payload
     except JWTError:
         return None
+
+    # Only tokens with an expiry are cached, and never beyond it
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        token_cache.set(key, dict(payload), ttl=exp - time.time())
+    return payload
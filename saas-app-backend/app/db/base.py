@@ -8,3 +8,8 @@ from app.models.task import Task  # noqa: F401
 from app.models.plan import Plan  # noqa: F401
 from app.models.subscription import Subscription  # noqa: F401
 from app.models.payment import Payment  # noqa: F401
+from app.models.workspace_usage import WorkspaceUsage  # noqa: F401
+from app.models.sync_tombstone import SyncTombstone  # noqa: F401
+
+# Full-text index DDL, emitted when create_all creates the tasks table
+import app.db.search  # noqa: F401, E402
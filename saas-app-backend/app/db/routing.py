@@ -0,0 +1,40 @@
+"""
+Read-your-writes bookkeeping for replica routing.
+
+A commit on a session tagged with `info["user_id"]` marks that user as a
+recent writer; get_read_db keeps sending them to the primary until
+READ_YOUR_WRITES_SECONDS have passed, so they never read a lagging replica
+right after their own write.
+
+The window is tracked per process: a worker only pins users whose writes
+it committed itself. With several workers (or hosts) behind a balancer, a
+read that lands on another worker can still hit a lagging replica, so
+such deployments need sticky routing per user, or a shared store here.
+"""
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+
+settings = get_settings()
+
+recent_writers = TTLCache(
+    max_size=settings.READ_YOUR_WRITES_MAX_USERS,
+    ttl=settings.READ_YOUR_WRITES_SECONDS,
+)
+
+
+def mark_recent_write(user_id: int) -> None:
+    recent_writers.set(user_id, True)
+
+
+def wrote_recently(user_id: int) -> bool:
+    return recent_writers.get(user_id, False)
+
+
+@event.listens_for(Session, "after_commit")
+def _remember_writer(session: Session) -> None:
+    user_id = session.info.get("user_id")
+    if user_id is not None:
+        mark_recent_write(user_id)
@@ -0,0 +1,64 @@
+"""
+Full-text index over task titles and descriptions.
+
+The index lives outside the ORM model because its shape is dialect
+specific, and it is maintained by the database itself so that every task
+write path (ORM, INSERT/UPDATE ... RETURNING, bulk and chunked deletes)
+keeps it current:
+
+* PostgreSQL: a generated `tasks.search_vector` tsvector column (title
+  weighted above description) with a GIN index.
+* SQLite: an external-content FTS5 table `tasks_fts` kept in sync by
+  triggers on `tasks`.
+
+The DDL runs when `tasks` is created by `create_all`; existing databases
+get it from the matching Alembic migration.
+"""
+from sqlalchemy import DDL, event
+
+from app.models.task import Task
+
+TEXT_SEARCH_CONFIG = "english"
+
+POSTGRES_DDL = [
+    "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS ("
+    f"setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(description, '')), 'B')"
+    ") STORED",
+    "CREATE INDEX IF NOT EXISTS ix_tasks_search_vector ON tasks "
+    "USING gin (search_vector)",
+]
+
+SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5("
+    "title, description, content='tasks', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, description "
+    "ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO tasks_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+    # Index any rows that predate the table (no-op on an empty tasks table)
+    "INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')",
+]
+
+for statement in POSTGRES_DDL:
+    event.listen(
+        Task.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="postgresql"),
+    )
+
+for statement in SQLITE_DDL:
+    event.listen(
+        Task.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="sqlite"),
+    )
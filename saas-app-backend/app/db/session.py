@@ -1,14 +1,107 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.db.base import Base  # 👈 import Base that holds all models
+from app.db.pool import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    instrument_engine,
+)
 from app.core.config import get_settings
 
 
 settings = get_settings()
 
-engine = create_engine(settings.DATABASE_URL, future=True)
+
+def _pool_options() -> dict:
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def _make_engine(name: str, url: str):
+    engine = create_engine(
+        url,
+        future=True,
+        poolclass=InstrumentedQueuePool,
+        **_pool_options(),
+    )
+    instrument_engine(name, engine)
+    return engine
+
+
+def _make_async_engine(name: str, url: str):
+    engine = create_async_engine(
+        url,
+        poolclass=InstrumentedAsyncQueuePool,
+        **_pool_options(),
+    )
+    instrument_engine(name, engine.sync_engine)
+    return engine
+
+
+engine = _make_engine("primary", settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Optional read replica; without READ_DATABASE_URL reads use the primary
+read_engine = None
+ReadSessionLocal = None
+
+if settings.READ_DATABASE_URL:
+    read_engine = _make_engine("replica", settings.READ_DATABASE_URL)
+    ReadSessionLocal = sessionmaker(
+        autocommit=False, autoflush=False, bind=read_engine
+    )
+
+# Async drivers used when DB_ASYNC is on and no ASYNC_DATABASE_URL is given
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(database_url: str) -> str:
+    url = make_url(database_url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise ValueError(
+            f"No async driver known for '{url.get_backend_name()}', "
+            "set ASYNC_DATABASE_URL explicitly"
+        )
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def get_async_database_url() -> str:
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    return to_async_url(settings.DATABASE_URL)
+
+
+async_engine = None
+AsyncSessionLocal = None
+async_read_engine = None
+AsyncReadSessionLocal = None
+
+if settings.DB_ASYNC:
+    async_engine = _make_async_engine("async", get_async_database_url())
+    # Objects are serialized after the handler returns, so don't expire them
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine, autoflush=False, expire_on_commit=False
+    )
+
+    if settings.READ_DATABASE_URL:
+        async_read_engine = _make_async_engine(
+            "async_replica", to_async_url(settings.READ_DATABASE_URL)
+        )
+        AsyncReadSessionLocal = async_sessionmaker(
+            bind=async_read_engine, autoflush=False, expire_on_commit=False
+        )
+
 
 def init_db():
     """
@@ -1,12 +1,26 @@
+import asyncio
+
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from app.db.session import init_db  # 👈 import this
+from app.db.session import SessionLocal, init_db  # 👈 import this
+from app.db.pool import pool_metrics
 from app.api.v1.auth import router as auth_router
 from app.api.v1.workspaces import router as workspace_router
 from app.api.v1.projects import router as project_router
 from app.api.v1.tasks import router as task_router
 from app.api.v1.billing import router as billing_router
+from app.api.v1.deletions import router as deletion_router
+from app.api.v1.sync import router as sync_router
 from app.api.deps import get_current_user
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.services.hashing_service import (
+    shutdown_hashing_pool,
+    start_hashing_pool,
+)
+from app.services.events import event_broker
+from app.services.billing_service import ensure_default_plans
+from app.services.change_log import run_tombstone_pruner
+from app.services.plan_catalog import refresh_plan_catalog
 from app.models.user import User
 # later you'll add your Vercel URL here
 origins = [
@@ -23,6 +37,7 @@ app.add_middleware(
     allow_credentials=False,    # we use Authorization header, not cookies
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
 @app.on_event("startup")
@@ -30,11 +45,54 @@ def on_startup():
     # Auto-create tables in the current DATABASE_URL
     init_db()
 
+    # Seed Free/Pro plans once and load the in-process plan catalog
+    db = SessionLocal()
+    try:
+        ensure_default_plans(db)
+        refresh_plan_catalog(db)
+    finally:
+        db.close()
+
+
+@app.on_event("startup")
+def start_hashing_workers():
+    start_hashing_pool()
+
+
+@app.on_event("startup")
+async def start_event_broker():
+    await event_broker.start()
+
+
+@app.on_event("startup")
+async def start_tombstone_pruner():
+    app.state.tombstone_pruner = asyncio.create_task(run_tombstone_pruner())
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    shutdown_hashing_pool()
+
+
+@app.on_event("shutdown")
+async def stop_event_broker():
+    await event_broker.stop()
+
+
+@app.on_event("shutdown")
+async def stop_tombstone_pruner():
+    app.state.tombstone_pruner.cancel()
+
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
 
 
+@app.get("/health/db-pool")
+def db_pool_metrics():
+    return {name: metrics.snapshot() for name, metrics in pool_metrics.items()}
+
+
 @app.get("/me")
 def read_me(current_user: User = Depends(get_current_user)):
     return {
@@ -50,3 +108,5 @@ app.include_router(workspace_router)
 app.include_router(project_router)
 app.include_router(task_router)
 app.include_router(billing_router)
+app.include_router(deletion_router)
+app.include_router(sync_router)
@@ -1,4 +1,5 @@
 from sqlalchemy import (
+    BigInteger,
     Column,
     Integer,
     String,
@@ -6,6 +7,7 @@ from sqlalchemy import (
     DateTime,
     Boolean,
     ForeignKey,
+    Index,
     func,
 )
 
@@ -15,6 +17,12 @@ from app.db.base_class import Base
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        # listing by workspace (newest first) and project quota counts
+        Index("ix_projects_workspace_id_created_at", "workspace_id", "created_at"),
+        # delta sync range scans
+        Index("ix_projects_workspace_id_change_seq", "workspace_id", "change_seq"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -25,3 +33,5 @@ class Project(Base):
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     archived = Column(Boolean, default=False)
+    # workspace change sequence of the last write, see app.services.change_log
+    change_seq = Column(BigInteger, nullable=False, default=0)
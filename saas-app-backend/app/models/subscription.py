@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
@@ -7,6 +7,15 @@ from app.db.base_class import Base
 
 class Subscription(Base):
     __tablename__ = "subscriptions"
+    __table_args__ = (
+        # effective-plan lookup: active subscription with the latest period end
+        Index(
+            "ix_subscriptions_workspace_id_status_period_end",
+            "workspace_id",
+            "status",
+            "current_period_end",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     workspace_id = Column(Integer, ForeignKey("workspaces.id"), nullable=False)
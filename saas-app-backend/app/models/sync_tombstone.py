@@ -0,0 +1,35 @@
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Integer,
+    String,
+    DateTime,
+    ForeignKey,
+    Index,
+    func,
+)
+
+from app.db.base_class import Base
+
+
+
+class SyncTombstone(Base):
+    """
+    Marker left behind by a hard delete of a task or project, so delta
+    sync can report the deletion to clients holding an older token.
+    """
+
+    __tablename__ = "sync_tombstones"
+    __table_args__ = (
+        Index(
+            "ix_sync_tombstones_workspace_id_change_seq", "workspace_id", "change_seq"
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    workspace_id = Column(Integer, ForeignKey("workspaces.id"), nullable=False)
+    entity = Column(String, nullable=False)  # task / project
+    entity_id = Column(Integer, nullable=False)
+    change_seq = Column(BigInteger, nullable=False)
+
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,10 +1,12 @@
 from sqlalchemy import (
+    BigInteger,
     Column,
     Integer,
     String,
     Text,
     DateTime,
     ForeignKey,
+    Index,
     func,
 )
 
@@ -14,6 +16,29 @@ from app.db.base_class import Base
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # board listing and next-position lookup
+        Index("ix_tasks_project_id_position", "project_id", "position"),
+        # filtered, keyset-paginated listings
+        Index(
+            "ix_tasks_project_id_status_position", "project_id", "status", "position"
+        ),
+        Index(
+            "ix_tasks_project_id_priority_position",
+            "project_id",
+            "priority",
+            "position",
+        ),
+        Index(
+            "ix_tasks_project_id_assigned_to_position",
+            "project_id",
+            "assigned_to",
+            "position",
+        ),
+        Index("ix_tasks_project_id_due_date", "project_id", "due_date"),
+        # delta sync range scans
+        Index("ix_tasks_project_id_change_seq", "project_id", "change_seq"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -22,13 +47,17 @@ class Task(Base):
     status = Column(String, nullable=False, default="todo")      # todo / in_progress / done
     priority = Column(String, nullable=False, default="medium")  # low / medium / high
 
-    position = Column(Integer, nullable=False, default=0)
+    # sparse ordering key, see app.services.task_ordering
+    position = Column(BigInteger, nullable=False, default=0)
     due_date = Column(DateTime(timezone=True), nullable=True)
 
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
     created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
     assigned_to = Column(Integer, ForeignKey("users.id"), nullable=True)
 
+    # workspace change sequence of the last write, see app.services.change_log
+    change_seq = Column(BigInteger, nullable=False, default=0)
+
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(
         DateTime(timezone=True),
@@ -0,0 +1,23 @@
+from sqlalchemy import BigInteger, Column, Integer, DateTime, ForeignKey, func
+
+from app.db.base_class import Base
+
+
+
+class WorkspaceUsage(Base):
+    """
+    Per-workspace usage counters, maintained by the create/delete paths so
+    quota checks are a single row read instead of a COUNT(*). Also holds
+    the workspace's change sequence for delta sync.
+    """
+
+    __tablename__ = "workspace_usage"
+
+    workspace_id = Column(Integer, ForeignKey("workspaces.id"), primary_key=True)
+    project_count = Column(Integer, nullable=False, default=0)
+    task_count = Column(Integer, nullable=False, default=0)
+    change_seq = Column(BigInteger, nullable=False, default=0)
+
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
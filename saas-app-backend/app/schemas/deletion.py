@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+
+
+class DeletionJobOut(BaseModel):
+    id: str
+    kind: str
+    target_id: int
+    status: str
+    deleted: dict[str, int]
+    error: str | None = None
+
+    class Config:
+        from_attributes = True
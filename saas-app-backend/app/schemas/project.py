@@ -3,6 +3,8 @@ from typing import Optional
 
 from pydantic import BaseModel
 
+from app.schemas.task import TaskOut
+
 
 class ProjectBase(BaseModel):
     name: str
@@ -28,3 +30,18 @@ class ProjectOut(ProjectBase):
 
     class Config:
         from_attributes = True
+
+
+class BoardColumn(BaseModel):
+    """First page of one status column; `next_cursor` continues it on
+    /tasks/by-project/{id}?status=<status>."""
+
+    status: str
+    total: int
+    tasks: list[TaskOut]
+    next_cursor: Optional[str] = None
+
+
+class ProjectBoard(BaseModel):
+    project: ProjectOut
+    columns: list[BoardColumn]
@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+
+from app.schemas.project import ProjectOut
+from app.schemas.task import TaskOut
+
+
+class SyncChanges(BaseModel):
+    """
+    Projects and tasks changed in a workspace since the request's token.
+    Apply the deletions before the upserts, then send `token` next time;
+    while `has_more` is true, call again right away for the rest.
+    `reset` means this is a full snapshot (no token, or one too old for
+    its deletions to still be known): drop local state before applying it.
+    """
+
+    token: str
+    has_more: bool
+    reset: bool = False
+    projects: list[ProjectOut]
+    tasks: list[TaskOut]
+    deleted_project_ids: list[int]
+    deleted_task_ids: list[int]
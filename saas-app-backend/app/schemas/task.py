@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class TaskBase(BaseModel):
@@ -17,6 +17,11 @@ class TaskCreate(TaskBase):
     project_id: int
 
 
+class TaskBulkCreate(BaseModel):
+    project_id: int
+    items: list[TaskBase] = Field(min_length=1, max_length=1000)
+
+
 class TaskUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
@@ -37,3 +42,40 @@ class TaskOut(TaskBase):
 
     class Config:
         from_attributes = True
+
+
+class TaskBatchItem(BaseModel):
+    task_id: int
+    changes: TaskUpdate
+
+
+class TaskBatchUpdate(BaseModel):
+    items: list[TaskBatchItem] = Field(min_length=1, max_length=1000)
+
+
+class TaskBatchResult(BaseModel):
+    """Outcome for one batch item; status_code mirrors PATCH /tasks/{id}."""
+
+    task_id: int
+    status_code: int
+    detail: Optional[str] = None
+    task: Optional[TaskOut] = None
+
+
+class TaskMove(BaseModel):
+    """Places a task right after `after_id` and/or right before `before_id`.
+    With neither given the task moves to the end of its project."""
+
+    after_id: Optional[int] = None
+    before_id: Optional[int] = None
+    status: Optional[str] = None
+
+
+class TaskFilters(BaseModel):
+    """Server-side filters for task listings (query parameters)."""
+
+    status: Optional[str] = None
+    priority: Optional[str] = None
+    assigned_to: Optional[int] = None
+    due_after: Optional[datetime] = None
+    due_before: Optional[datetime] = None
@@ -1,20 +1,44 @@
-from datetime import datetime, timedelta
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from uuid import uuid4
 
 from sqlalchemy.orm import Session
 
+from app.core.cache import TTLCache
 from app.core.config import get_settings
 from app.models.plan import Plan
 from app.models.subscription import Subscription
 from app.models.payment import Payment
 from app.models.workspace import Workspace
-from app.models.project import Project          # add this
-from app.models.task import Task   
+from app.schemas.billing import PlanOut
+from app.services.usage_service import reserve_project_slot, reserve_task_slots
 
 settings = get_settings()
 
 
+@dataclass(frozen=True)
+class Entitlement:
+    """Plan limits in effect for a workspace, safe to share across sessions."""
+
+    plan_id: int
+    plan_name: str
+    max_projects: int | None
+    max_tasks: int | None
+    max_members: int | None
+
+
+# workspace_id -> Entitlement, expiring at the subscription's period end
+entitlement_cache = TTLCache(
+    max_size=settings.ENTITLEMENT_CACHE_MAX_SIZE,
+    ttl=settings.ENTITLEMENT_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_entitlement(workspace_id: int) -> None:
+    entitlement_cache.invalidate(workspace_id)
+
+
 # ---------- Plans helpers ----------
 
 def create_or_get_free_plan(db: Session) -> Plan:
@@ -62,7 +86,7 @@ def ensure_default_plans(db: Session) -> list[Plan]:
 # ---------- Subscriptions / Payments (mock) ----------
 
 def get_or_create_subscription(
-    db: Session, workspace: Workspace, plan: Plan
+    db: Session, workspace: Workspace, plan: Plan | PlanOut
 ) -> Subscription:
     sub = (
         db.query(Subscription)
@@ -83,7 +107,7 @@ def get_or_create_subscription(
 
 
 def create_razorpay_order_for_plan(
-    db: Session, workspace: Workspace, plan: Plan
+    db: Session, workspace: Workspace, plan: Plan | PlanOut
 ) -> Payment:
     """
     MOCK VERSION:
@@ -109,7 +133,7 @@ def create_razorpay_order_for_plan(
 def verify_payment_and_activate_subscription(
     db: Session,
     workspace: Workspace,
-    plan: Plan,
+    plan: Plan | PlanOut,
     razorpay_order_id: str,
     razorpay_payment_id: str,
     razorpay_signature: str,
@@ -143,76 +167,103 @@ def verify_payment_and_activate_subscription(
 
     db.commit()
     db.refresh(subscription)
+    invalidate_entitlement(workspace.id)
     return subscription
 
-def get_effective_plan_for_workspace(db: Session, workspace: Workspace) -> Plan:
-    """
-    Returns the currently active plan for a workspace.
-    If no active subscription or expired, fallback to Free plan.
-    """
+def _seconds_until(moment: datetime) -> float:
+    now = datetime.now(timezone.utc) if moment.tzinfo else datetime.utcnow()
+    return (moment - now).total_seconds()
+
+
+def _resolve_effective_plan(
+    db: Session, workspace_id: int
+) -> tuple[Plan, datetime | None]:
+    """Returns the effective plan and, for a paid plan, its period end."""
     # latest active subscription with valid period
     sub = (
         db.query(Subscription)
         .filter(
-            Subscription.workspace_id == workspace.id,
+            Subscription.workspace_id == workspace_id,
             Subscription.status == "active",
         )
         .order_by(Subscription.current_period_end.desc())
         .first()
     )
 
-    now = datetime.utcnow()
-
-    if sub and (sub.current_period_end is None or sub.current_period_end >= now):
+    if sub and (
+        sub.current_period_end is None or _seconds_until(sub.current_period_end) >= 0
+    ):
         # Ensure plan relationship is loaded
         _ = sub.plan
-        return sub.plan
+        return sub.plan, sub.current_period_end
 
     # Fallback to Free plan
-    return create_or_get_free_plan(db)
+    return create_or_get_free_plan(db), None
 
 
-def check_project_limit_for_workspace(db: Session, workspace: Workspace) -> None:
+def get_effective_plan_for_workspace(db: Session, workspace: Workspace) -> Plan:
     """
-    Raises ValueError if workspace has reached the max_projects for its plan.
+    Returns the currently active plan for a workspace.
+    If no active subscription or expired, fallback to Free plan.
     """
-    plan = get_effective_plan_for_workspace(db, workspace)
+    plan, _ = _resolve_effective_plan(db, workspace.id)
+    return plan
 
-    if plan.max_projects is None:
-        return  # unlimited
 
-    current_count = (
-        db.query(Project)
-        .filter(Project.workspace_id == workspace.id)
-        .count()
+def get_workspace_entitlement(db: Session, workspace: Workspace) -> Entitlement:
+    """
+    Cached version of get_effective_plan_for_workspace. Entries never
+    outlive the subscription's current_period_end, so an expiring plan
+    falls back to Free on the next lookup; activations invalidate them.
+    """
+    entitlement = entitlement_cache.get(workspace.id)
+    if entitlement is not None:
+        return entitlement
+
+    plan, period_end = _resolve_effective_plan(db, workspace.id)
+    entitlement = Entitlement(
+        plan_id=plan.id,
+        plan_name=plan.name,
+        max_projects=plan.max_projects,
+        max_tasks=plan.max_tasks,
+        max_members=plan.max_members,
     )
 
-    if current_count >= plan.max_projects:
+    ttl = None
+    if period_end is not None:
+        ttl = min(_seconds_until(period_end), settings.ENTITLEMENT_CACHE_TTL_SECONDS)
+        if ttl <= 0:
+            return entitlement
+
+    entitlement_cache.set(workspace.id, entitlement, ttl=ttl)
+    return entitlement
+
+
+def reserve_project_quota(db: Session, workspace: Workspace) -> None:
+    """
+    Raises ValueError if workspace has reached the max_projects for its plan.
+    Otherwise takes one project slot in the workspace usage counters; the
+    slot is committed (or rolled back) together with the caller's insert.
+    """
+    plan = get_workspace_entitlement(db, workspace)
+
+    if not reserve_project_slot(db, workspace.id, plan.max_projects):
         raise ValueError(
-            f"Project limit reached for plan '{plan.name}' "
+            f"Project limit reached for plan '{plan.plan_name}' "
             f"(max {plan.max_projects} projects)."
         )
 
 
-def check_task_limit_for_workspace(db: Session, workspace: Workspace) -> None:
+def reserve_task_quota(db: Session, workspace: Workspace, count: int = 1) -> None:
     """
-    Raises ValueError if workspace has reached the max_tasks for its plan.
-    Counts tasks across all projects in this workspace.
+    Raises ValueError if adding `count` tasks would exceed the max_tasks for
+    the workspace's plan. Otherwise takes the slots in the usage counters,
+    in the caller's transaction.
     """
-    plan = get_effective_plan_for_workspace(db, workspace)
-
-    if plan.max_tasks is None:
-        return  # unlimited
-
-    current_count = (
-        db.query(Task)
-        .join(Project, Task.project_id == Project.id)
-        .filter(Project.workspace_id == workspace.id)
-        .count()
-    )
+    plan = get_workspace_entitlement(db, workspace)
 
-    if current_count >= plan.max_tasks:
+    if not reserve_task_slots(db, workspace.id, plan.max_tasks, count):
         raise ValueError(
-            f"Task limit reached for plan '{plan.name}' "
+            f"Task limit reached for plan '{plan.plan_name}' "
             f"(max {plan.max_tasks} tasks)."
         )
@@ -0,0 +1,150 @@
+"""
+Per-workspace change sequence and tombstones for delta sync.
+
+Every transaction that writes a workspace's projects or tasks takes the
+next value of `workspace_usage.change_seq` with one UPDATE ... RETURNING
+and stamps it on the rows it touches; hard deletes leave SyncTombstone
+rows carrying it instead. The UPDATE holds the counters row lock until
+commit, so within a workspace sequence order is commit order: a reader
+that has seen every change up to N can never miss a later commit with a
+value at or below N.
+
+Tombstones are only kept for SYNC_TOKEN_MAX_AGE_SECONDS: sync tokens carry
+the time they were issued, older ones are answered with a full snapshot,
+and `prune_tombstones` deletes the tombstones no accepted token can need.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+
+from app.models.project import Project
+from app.models.sync_tombstone import SyncTombstone
+from app.models.task import Task
+from app.models.workspace import Workspace
+from app.models.workspace_usage import WorkspaceUsage
+from app.services.usage_service import create_usage_row
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# deleted_at is stamped when the deleting transaction starts, which can be
+# a little before the commit a token was issued after
+_PRUNE_MARGIN = timedelta(hours=1)
+
+
+def workspace_of_project(project_id: int):
+    return (
+        select(Project.workspace_id)
+        .where(Project.id == project_id)
+        .scalar_subquery()
+    )
+
+
+def workspace_of_task(task_id: int):
+    return (
+        select(Project.workspace_id)
+        .join(Task, Task.project_id == Project.id)
+        .where(Task.id == task_id)
+        .scalar_subquery()
+    )
+
+
+def next_change_seq(db: Session, workspace_id) -> tuple[int, int]:
+    """
+    Advances the sequence of `workspace_id` (an id or one of the scalar
+    subqueries above) and returns (workspace_id, new value).
+    """
+    stmt = (
+        update(WorkspaceUsage)
+        .where(WorkspaceUsage.workspace_id == workspace_id)
+        .values(change_seq=WorkspaceUsage.change_seq + 1)
+        .returning(WorkspaceUsage.workspace_id, WorkspaceUsage.change_seq)
+        .execution_options(synchronize_session=False)
+    )
+    row = db.execute(stmt).first()
+    if row is None:
+        # Workspaces that predate the counters get their row lazily
+        resolved = db.scalar(select(Workspace.id).where(Workspace.id == workspace_id))
+        if resolved is None:
+            raise LookupError("Workspace not found")
+        create_usage_row(db, resolved)
+        row = db.execute(stmt).first()
+    return row[0], row[1]
+
+
+def current_change_seq(db: Session, workspace_id: int) -> int:
+    seq = db.scalar(
+        select(WorkspaceUsage.change_seq).where(
+            WorkspaceUsage.workspace_id == workspace_id
+        )
+    )
+    return seq or 0
+
+
+def record_tombstones(
+    db: Session, workspace_id: int, change_seq: int, entity: str, ids
+) -> None:
+    """Leaves tombstones for deleted `entity` ("task"/"project") ids."""
+    rows = [
+        {
+            "workspace_id": workspace_id,
+            "entity": entity,
+            "entity_id": entity_id,
+            "change_seq": change_seq,
+        }
+        for entity_id in ids
+    ]
+    if rows:
+        db.execute(insert(SyncTombstone), rows)
+
+
+def prune_tombstones(db: Session, before: datetime) -> int:
+    """
+    Deletes tombstones left before `before`, one chunk per transaction.
+    Returns how many were removed.
+    """
+    total = 0
+    while True:
+        chunk_ids = db.scalars(
+            select(SyncTombstone.id)
+            .where(SyncTombstone.deleted_at < before)
+            .limit(settings.DELETE_CHUNK_SIZE)
+        ).all()
+        if not chunk_ids:
+            return total
+        total += db.execute(
+            delete(SyncTombstone)
+            .where(SyncTombstone.id.in_(chunk_ids))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+
+
+def prune_expired_tombstones() -> int:
+    """Prunes the tombstones older than the oldest token sync accepts."""
+    before = (
+        datetime.now(timezone.utc)
+        - timedelta(seconds=settings.SYNC_TOKEN_MAX_AGE_SECONDS)
+        - _PRUNE_MARGIN
+    )
+    db = SessionLocal()
+    try:
+        return prune_tombstones(db, before)
+    finally:
+        db.close()
+
+
+async def run_tombstone_pruner() -> None:
+    """Prunes expired tombstones every SYNC_TOMBSTONE_PRUNE_INTERVAL_SECONDS."""
+    while True:
+        try:
+            await asyncio.to_thread(prune_expired_tombstones)
+        except Exception:
+            logger.exception("Pruning sync tombstones failed")
+        await asyncio.sleep(settings.SYNC_TOMBSTONE_PRUNE_INTERVAL_SECONDS)
@@ -0,0 +1,239 @@
+"""
+Cascading deletes for workspaces and projects.
+
+Children are removed leaf-first (tasks, projects, payments, subscriptions,
+sync tombstones, usage counters, then the parent row) with set-based
+DELETEs of at most DELETE_CHUNK_SIZE rows, each committed on its own so
+no statement holds locks on a large slice of the tree. Project deletions release usage
+counters and leave sync tombstones chunk by chunk, so quotas and delta
+sync stay accurate while one is in flight.
+
+Large trees are deleted by a background job; its progress is kept in the
+process-local `deletion_jobs` registry and exposed by the API.
+"""
+import logging
+from dataclasses import dataclass, field
+from uuid import uuid4
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.models.payment import Payment
+from app.models.project import Project
+from app.models.subscription import Subscription
+from app.models.sync_tombstone import SyncTombstone
+from app.models.task import Task
+from app.models.workspace import Workspace
+from app.models.workspace_usage import WorkspaceUsage
+from app.services.billing_service import invalidate_entitlement
+from app.services.change_log import (
+    next_change_seq,
+    record_tombstones,
+    workspace_of_project,
+)
+from app.services.ownership_cache import ownership_graph
+from app.services.usage_service import release_project, release_tasks_for_project
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DeletionJob:
+    kind: str  # "workspace" / "project"
+    target_id: int
+    owner_id: int
+    id: str = field(default_factory=lambda: uuid4().hex)
+    status: str = "pending"  # pending / running / done / failed
+    deleted: dict[str, int] = field(default_factory=dict)
+    error: str | None = None
+
+    def record(self, label: str, count: int) -> None:
+        self.deleted[label] = self.deleted.get(label, 0) + count
+
+
+# job id -> DeletionJob, kept for a while after the job finishes
+deletion_jobs = TTLCache(
+    max_size=settings.DELETION_JOB_MAX_SIZE,
+    ttl=settings.DELETION_JOB_TTL_SECONDS,
+)
+
+
+def _delete_chunked(
+    db: Session,
+    model,
+    ids,
+    label: str,
+    job: DeletionJob | None = None,
+    on_chunk=None,
+    forget=None,
+) -> int:
+    """
+    Deletes the rows whose ids `ids` (a select of model.id) yields, one
+    LIMITed chunk per transaction. `on_chunk(db, chunk_ids, count)` runs
+    inside each chunk's transaction before it commits, with `count` the rows
+    the DELETE actually removed (a concurrent delete may have taken some of
+    the selected ids first); `forget(chunk_ids)` runs after the commit, to
+    drop cached state for the deleted rows.
+    """
+    total = 0
+    while True:
+        chunk_ids = db.scalars(ids.limit(settings.DELETE_CHUNK_SIZE)).all()
+        if not chunk_ids:
+            return total
+
+        count = db.execute(
+            delete(model)
+            .where(model.id.in_(chunk_ids))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if on_chunk is not None:
+            on_chunk(db, chunk_ids, count)
+        db.commit()
+        if forget is not None:
+            forget(chunk_ids)
+        total += count
+        if job is not None:
+            job.record(label, count)
+
+
+def delete_project_tree(
+    db: Session, project_id: int, job: DeletionJob | None = None
+) -> bool:
+    """Deletes a project and its tasks. Returns False if it was already gone."""
+
+    def release_and_record(db: Session, task_ids: list[int], count: int) -> None:
+        release_tasks_for_project(db, project_id, count)
+        workspace_id, change_seq = next_change_seq(
+            db, workspace_of_project(project_id)
+        )
+        record_tombstones(db, workspace_id, change_seq, "task", task_ids)
+
+    _delete_chunked(
+        db,
+        Task,
+        select(Task.id).where(Task.project_id == project_id),
+        "tasks",
+        job,
+        release_and_record,
+        ownership_graph.forget_tasks,
+    )
+
+    workspace_id = db.execute(
+        delete(Project)
+        .where(Project.id == project_id)
+        .returning(Project.workspace_id)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    if workspace_id is not None:
+        release_project(db, workspace_id)
+        _, change_seq = next_change_seq(db, workspace_id)
+        record_tombstones(db, workspace_id, change_seq, "project", [project_id])
+    db.commit()
+    ownership_graph.forget_project(project_id)
+    if job is not None and workspace_id is not None:
+        job.record("projects", 1)
+    return workspace_id is not None
+
+
+def delete_workspace_tree(
+    db: Session, workspace_id: int, job: DeletionJob | None = None
+) -> bool:
+    """
+    Deletes a workspace with its projects, tasks, billing rows and usage
+    counters. Returns False if the workspace was already gone.
+    """
+    project_ids = select(Project.id).where(Project.workspace_id == workspace_id)
+
+    _delete_chunked(
+        db,
+        Task,
+        select(Task.id).where(Task.project_id.in_(project_ids)),
+        "tasks",
+        job,
+        forget=ownership_graph.forget_tasks,
+    )
+    _delete_chunked(
+        db,
+        Project,
+        project_ids,
+        "projects",
+        job,
+        forget=ownership_graph.forget_projects,
+    )
+    _delete_chunked(
+        db,
+        Payment,
+        select(Payment.id).where(Payment.workspace_id == workspace_id),
+        "payments",
+        job,
+    )
+    _delete_chunked(
+        db,
+        Subscription,
+        select(Subscription.id).where(Subscription.workspace_id == workspace_id),
+        "subscriptions",
+        job,
+    )
+    _delete_chunked(
+        db,
+        SyncTombstone,
+        select(SyncTombstone.id).where(SyncTombstone.workspace_id == workspace_id),
+        "tombstones",
+    )
+
+    db.execute(
+        delete(WorkspaceUsage).where(WorkspaceUsage.workspace_id == workspace_id)
+    )
+    deleted = db.execute(
+        delete(Workspace)
+        .where(Workspace.id == workspace_id)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    ownership_graph.forget_workspace(workspace_id)
+    invalidate_entitlement(workspace_id)
+    if job is not None and deleted:
+        job.record("workspaces", 1)
+    return bool(deleted)
+
+
+def count_tree_tasks(db: Session, kind: str, target_id: int) -> int:
+    """Size estimate used to decide whether a deletion runs in the background."""
+    if kind == "workspace":
+        usage = db.get(WorkspaceUsage, target_id)
+        if usage is not None:
+            return usage.task_count
+        project_ids = select(Project.id).where(Project.workspace_id == target_id)
+        condition = Task.project_id.in_(project_ids)
+    else:
+        condition = Task.project_id == target_id
+    return db.scalar(select(func.count(Task.id)).where(condition))
+
+
+def start_deletion_job(kind: str, target_id: int, owner_id: int) -> DeletionJob:
+    job = DeletionJob(kind=kind, target_id=target_id, owner_id=owner_id)
+    deletion_jobs.set(job.id, job)
+    return job
+
+
+def run_deletion_job(job: DeletionJob) -> None:
+    """Background entry point; uses its own session like other jobs."""
+    job.status = "running"
+    db = SessionLocal()
+    try:
+        if job.kind == "workspace":
+            delete_workspace_tree(db, job.target_id, job)
+        else:
+            delete_project_tree(db, job.target_id, job)
+        job.status = "done"
+    except Exception as e:
+        logger.exception("Deleting %s %s failed", job.kind, job.target_id)
+        db.rollback()
+        job.status = "failed"
+        job.error = str(e)
+    finally:
+        db.close()
@@ -0,0 +1,175 @@
+"""
+Publish/subscribe broker for live project updates.
+
+Write handlers publish task/project events to a per-project channel and
+streaming endpoints subscribe to it. Every subscription has a bounded
+queue keyed by entity, so a burst of updates to the same task collapses
+into its latest state; a subscriber that falls further behind than
+EVENT_QUEUE_MAX_SIZE distinct entities is told to resync and dropped
+instead of buffering without limit.
+
+Delivery across processes goes through the configured backend
+(EVENT_BACKEND, "module:Class"). The default LocalBackend only reaches
+subscribers in this worker; a shared backend (e.g. Redis pub/sub)
+implements the same start/stop/publish methods and calls `deliver` for
+every event it receives from the bus.
+"""
+import asyncio
+import importlib
+from collections import OrderedDict
+from typing import Callable
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+def project_channel(project_id: int) -> str:
+    return f"project:{project_id}"
+
+
+class Subscription:
+    def __init__(self, channel: str, max_size: int):
+        self.channel = channel
+        self.max_size = max_size
+        self.overflowed = False
+        self._pending: "OrderedDict[tuple, dict]" = OrderedDict()
+        self._ready = asyncio.Event()
+
+    def push(self, event: dict) -> None:
+        key = (event["entity"], event["id"])
+        if key in self._pending:
+            # Coalesce: keep the queue slot, replace it with the newest state
+            self._pending[key] = event
+        elif len(self._pending) >= self.max_size:
+            self.overflowed = True
+        else:
+            self._pending[key] = event
+        self._ready.set()
+
+    async def next_batch(self) -> list[dict] | None:
+        """
+        Waits for events and returns everything pending, or None once the
+        subscriber has overflowed and must resync.
+        """
+        await self._ready.wait()
+        if settings.EVENT_COALESCE_SECONDS:
+            # Let a burst of writes settle into one batch
+            await asyncio.sleep(settings.EVENT_COALESCE_SECONDS)
+        self._ready.clear()
+        if self.overflowed:
+            return None
+        events = list(self._pending.values())
+        self._pending.clear()
+        return events
+
+
+class LocalBackend:
+    """Delivers events to subscribers of this process only."""
+
+    def __init__(self, deliver: Callable[[str, dict], None]):
+        self.deliver = deliver
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    def publish(self, channel: str, event: dict) -> None:
+        self.deliver(channel, event)
+
+
+class EventBroker:
+    def __init__(self, backend_path: str, queue_size: int):
+        module_name, _, class_name = backend_path.partition(":")
+        backend_class = getattr(importlib.import_module(module_name), class_name)
+        self.backend = backend_class(self.deliver)
+        self.queue_size = queue_size
+        self._subscribers: dict[str, set[Subscription]] = {}
+
+    async def start(self) -> None:
+        await self.backend.start()
+
+    async def stop(self) -> None:
+        await self.backend.stop()
+
+    def subscribe(self, channel: str) -> Subscription:
+        subscription = Subscription(channel, self.queue_size)
+        self._subscribers.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.channel)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[subscription.channel]
+
+    def subscriber_count(self) -> int:
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def publish(self, channel: str, event: dict) -> None:
+        self.backend.publish(channel, event)
+
+    def deliver(self, channel: str, event: dict) -> None:
+        """Fan-out to this process's subscribers (called by the backend)."""
+        for subscription in tuple(self._subscribers.get(channel, ())):
+            subscription.push(event)
+
+
+event_broker = EventBroker(settings.EVENT_BACKEND, settings.EVENT_QUEUE_MAX_SIZE)
+
+
+# ---------- Publishing helpers for the write handlers ----------
+
+def publish_task(task) -> None:
+    """`task` is a TaskOut; its full state is sent as an upsert."""
+    event_broker.publish(
+        project_channel(task.project_id),
+        {
+            "type": "task.upsert",
+            "entity": "task",
+            "id": task.id,
+            "data": task.model_dump(mode="json"),
+        },
+    )
+
+
+def publish_task_deleted(project_id: int, task_id: int) -> None:
+    event_broker.publish(
+        project_channel(project_id),
+        {"type": "task.delete", "entity": "task", "id": task_id, "data": None},
+    )
+
+
+def publish_project(project) -> None:
+    """`project` is a ProjectOut."""
+    event_broker.publish(
+        project_channel(project.id),
+        {
+            "type": "project.upsert",
+            "entity": "project",
+            "id": project.id,
+            "data": project.model_dump(mode="json"),
+        },
+    )
+
+
+def publish_project_deleted(project_id: int) -> None:
+    event_broker.publish(
+        project_channel(project_id),
+        {"type": "project.delete", "entity": "project", "id": project_id, "data": None},
+    )
+
+
+def publish_resync(project_id: int) -> None:
+    """
+    Tells the project's subscribers to refetch its tasks, for changes too
+    wide to send row by row (a renumbering of every position).
+    """
+    event_broker.publish(
+        project_channel(project_id),
+        {"type": "resync", "entity": "resync", "id": project_id, "data": None},
+    )
@@ -0,0 +1,62 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Callable
+
+from app.core.config import get_settings
+from app.core.security import get_password_hash, verify_password
+
+settings = get_settings()
+
+
+class HashingBusyError(Exception):
+    """Raised when the password hashing queue is full."""
+
+
+_executor: Executor | None = None
+_pending = 0
+
+
+def start_hashing_pool() -> None:
+    """
+    Creates the dedicated process pool; called from the startup hook.
+    Workers are spawned rather than forked: by then the server already
+    runs other threads, and a forked child could inherit their held locks.
+    Without a started pool (or with PASSWORD_HASH_WORKERS = 0) hashing
+    runs in the loop's default threadpool.
+    """
+    global _executor
+    if _executor is None and settings.PASSWORD_HASH_WORKERS > 0:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            mp_context=get_context("spawn"),
+        )
+
+
+async def _run(fn: Callable, *args):
+    global _pending
+    # _pending is only touched from the event loop, so no lock is needed
+    if _pending >= settings.PASSWORD_HASH_MAX_PENDING:
+        raise HashingBusyError("Too many password hashing requests in flight")
+
+    _pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, fn, *args)
+    finally:
+        _pending -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run(get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run(verify_password, plain_password, hashed_password)
+
+
+def shutdown_hashing_pool() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
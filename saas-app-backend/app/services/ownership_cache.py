@@ -0,0 +1,135 @@
+"""
+Process-local index of the task -> project -> workspace -> owner graph.
+
+Edges are filled lazily by the authorization helpers and kept LRU-bounded.
+Routers update or drop edges explicitly on create/delete, the chunked tree
+deletions drop the edges of every child they remove, and ORM update events
+drop any edge whose parent column changes, so a cached chain never
+outlives the rows it was built from within this process. Other workers
+don't see those invalidations; OWNERSHIP_CACHE_TTL_SECONDS bounds how long
+they can keep trusting an edge.
+"""
+from typing import Optional
+
+from sqlalchemy import event, inspect
+
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.models.workspace import Workspace
+from app.models.project import Project
+from app.models.task import Task
+
+settings = get_settings()
+
+
+class OwnershipGraph:
+    def __init__(self, max_size: int, ttl: float | None = None):
+        self.task_project = TTLCache(max_size=max_size, ttl=ttl)
+        self.project_workspace = TTLCache(max_size=max_size, ttl=ttl)
+        self.workspace_owner = TTLCache(max_size=max_size, ttl=ttl)
+
+    # ----- lookups -----
+
+    def owner_of_workspace(self, workspace_id: int) -> Optional[int]:
+        return self.workspace_owner.get(workspace_id)
+
+    def workspace_of_project(self, project_id: int) -> Optional[int]:
+        return self.project_workspace.get(project_id)
+
+    def project_of_task(self, task_id: int) -> Optional[int]:
+        return self.task_project.get(task_id)
+
+    def owner_of_project(self, project_id: int) -> Optional[int]:
+        workspace_id = self.workspace_of_project(project_id)
+        if workspace_id is None:
+            return None
+        return self.owner_of_workspace(workspace_id)
+
+    def owner_of_task(self, task_id: int) -> Optional[int]:
+        project_id = self.project_of_task(task_id)
+        if project_id is None:
+            return None
+        return self.owner_of_project(project_id)
+
+    # ----- updates -----
+
+    def remember_workspace(self, workspace_id: int, owner_id: int) -> None:
+        self.workspace_owner.set(workspace_id, owner_id)
+
+    def remember_project(self, project_id: int, workspace_id: int) -> None:
+        self.project_workspace.set(project_id, workspace_id)
+
+    def remember_task(self, task_id: int, project_id: int) -> None:
+        self.task_project.set(task_id, project_id)
+
+    def forget_workspace(self, workspace_id: int) -> None:
+        self.workspace_owner.invalidate(workspace_id)
+
+    def forget_project(self, project_id: int) -> None:
+        self.project_workspace.invalidate(project_id)
+
+    def forget_task(self, task_id: int) -> None:
+        self.task_project.invalidate(task_id)
+
+    def forget_projects(self, project_ids) -> None:
+        for project_id in project_ids:
+            self.project_workspace.invalidate(project_id)
+
+    def forget_tasks(self, task_ids) -> None:
+        for task_id in task_ids:
+            self.task_project.invalidate(task_id)
+
+    def clear(self) -> None:
+        self.task_project.clear()
+        self.project_workspace.clear()
+        self.workspace_owner.clear()
+
+    def stats(self) -> dict:
+        return {
+            "tasks": self.task_project.stats(),
+            "projects": self.project_workspace.stats(),
+            "workspaces": self.workspace_owner.stats(),
+        }
+
+
+ownership_graph = OwnershipGraph(
+    max_size=settings.OWNERSHIP_CACHE_MAX_SIZE,
+    ttl=settings.OWNERSHIP_CACHE_TTL_SECONDS,
+)
+
+
+def _parent_changed(target, attr: str) -> bool:
+    return inspect(target).attrs[attr].history.has_changes()
+
+
+@event.listens_for(Workspace, "after_update")
+def _workspace_updated(mapper, connection, target: Workspace) -> None:
+    if _parent_changed(target, "owner_id"):
+        ownership_graph.forget_workspace(target.id)
+
+
+@event.listens_for(Project, "after_update")
+def _project_updated(mapper, connection, target: Project) -> None:
+    if _parent_changed(target, "workspace_id"):
+        ownership_graph.forget_project(target.id)
+
+
+@event.listens_for(Task, "after_update")
+def _task_updated(mapper, connection, target: Task) -> None:
+    if _parent_changed(target, "project_id"):
+        ownership_graph.forget_task(target.id)
+
+
+@event.listens_for(Workspace, "after_delete")
+def _workspace_deleted(mapper, connection, target: Workspace) -> None:
+    ownership_graph.forget_workspace(target.id)
+
+
+@event.listens_for(Project, "after_delete")
+def _project_deleted(mapper, connection, target: Project) -> None:
+    ownership_graph.forget_project(target.id)
+
+
+@event.listens_for(Task, "after_delete")
+def _task_deleted(mapper, connection, target: Task) -> None:
+    ownership_graph.forget_task(target.id)
@@ -0,0 +1,105 @@
+"""
+In-process snapshot of the plan catalog.
+
+Requests read plans from an immutable snapshot instead of the plans table.
+The snapshot carries a pre-encoded JSON body and an ETag, so /billing/plans
+can answer with 304 or the cached bytes directly. It is reloaded once it
+is older than PLAN_CATALOG_REFRESH_SECONDS. The table is a handful of rows,
+so a reload reads all of them and compares the encoded body's digest. The
+version and ETag only change when that digest does, which also catches
+price and is_active edits made outside the app.
+"""
+import dataclasses
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.plan import Plan
+from app.schemas.billing import PlanOut
+
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class PlanCatalog:
+    version: int
+    plans: tuple[PlanOut, ...]
+    by_id: Mapping[int, PlanOut]
+    body: bytes
+    etag: str
+    # time.monotonic() of the load that last confirmed this content
+    loaded_at: float = float("-inf")
+
+
+_catalog = PlanCatalog(
+    version=0,
+    plans=(),
+    by_id=MappingProxyType({}),
+    body=b"[]",
+    etag='W/"plans-0"',
+)
+_lock = threading.Lock()
+
+
+def get_plan_catalog() -> PlanCatalog:
+    return _catalog
+
+
+def plan_catalog_is_stale() -> bool:
+    age = time.monotonic() - _catalog.loaded_at
+    return age >= settings.PLAN_CATALOG_REFRESH_SECONDS
+
+
+def refresh_plan_catalog(db: Session) -> PlanCatalog:
+    """
+    Reloads active plans from the database. A new snapshot (and version)
+    is only built when their content changed.
+    """
+    global _catalog
+    rows = (
+        db.query(Plan)
+        .filter(Plan.is_active == True)  # noqa: E712
+        .order_by(Plan.id)
+        .all()
+    )
+    plans = tuple(PlanOut.model_validate(row) for row in rows)
+    body = json.dumps(
+        [plan.model_dump(mode="json") for plan in plans], separators=(",", ":")
+    ).encode()
+    digest = hashlib.sha256(body).hexdigest()[:16]
+    etag = f'W/"plans-{digest}"'
+    loaded_at = time.monotonic()
+
+    with _lock:
+        if etag == _catalog.etag:
+            _catalog = dataclasses.replace(_catalog, loaded_at=loaded_at)
+        else:
+            _catalog = PlanCatalog(
+                version=_catalog.version + 1,
+                plans=plans,
+                by_id=MappingProxyType({plan.id: plan for plan in plans}),
+                body=body,
+                etag=etag,
+                loaded_at=loaded_at,
+            )
+        return _catalog
+
+
+def get_active_plan(db: Session, plan_id: int) -> PlanOut | None:
+    """
+    Looks a plan up in the snapshot, reloading it first if it is stale. A
+    miss also reloads it once, in case the plan was added since.
+    """
+    if plan_catalog_is_stale():
+        return refresh_plan_catalog(db).by_id.get(plan_id)
+    plan = _catalog.by_id.get(plan_id)
+    if plan is None:
+        plan = refresh_plan_catalog(db).by_id.get(plan_id)
+    return plan
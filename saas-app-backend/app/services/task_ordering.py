@@ -0,0 +1,105 @@
+"""
+Sparse integer ordering for tasks.
+
+Positions are spaced POSITION_GAP apart, so moving a task between two
+neighbours only rewrites that task's position (the integer midpoint).
+When repeated moves into the same spot exhaust a gap, the project's
+positions are renumbered with one set-based UPDATE: in the background
+once a gap gets narrow, or inline when there is no room left at all.
+Live subscribers are sent one resync event per renumbering rather than an
+upsert for every task in the project.
+"""
+import logging
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.db.session import SessionLocal
+from app.models.task import Task
+from app.services.change_log import next_change_seq, workspace_of_project
+from app.services.events import publish_resync
+
+logger = logging.getLogger(__name__)
+
+POSITION_GAP = 1 << 20
+# Gaps narrower than this schedule a background rebalance
+REBALANCE_MIN_GAP = 1 << 4
+
+
+def next_position_clause(project_id: int):
+    """Scalar subquery for the end-of-list position, usable inside an INSERT."""
+    return (
+        select(func.coalesce(func.max(Task.position), 0) + POSITION_GAP)
+        .where(Task.project_id == project_id)
+        .scalar_subquery()
+    )
+
+
+def next_position(db: Session, project_id: int) -> int:
+    return db.scalar(select(next_position_clause(project_id)))
+
+
+def position_between(lower: int | None, upper: int | None) -> int | None:
+    """
+    Returns an integer strictly between `lower` and `upper` (either may be
+    None for the start/end of the list), or None if there is no room.
+    """
+    if lower is None and upper is None:
+        return POSITION_GAP
+    if lower is None:
+        return upper - POSITION_GAP
+    if upper is None:
+        return lower + POSITION_GAP
+    if upper - lower < 2:
+        return None
+    return lower + (upper - lower) // 2
+
+
+def gap_is_narrow(lower: int | None, upper: int | None, position: int) -> bool:
+    if lower is not None and position - lower < REBALANCE_MIN_GAP:
+        return True
+    return upper is not None and upper - position < REBALANCE_MIN_GAP
+
+
+def rebalance_project(db: Session, project_id: int) -> None:
+    """Renumbers a project's tasks to POSITION_GAP spacing, keeping order."""
+    ranked = (
+        select(
+            Task.id.label("id"),
+            func.row_number()
+            .over(order_by=(Task.position.asc(), Task.id.asc()))
+            .label("rn"),
+        )
+        .where(Task.project_id == project_id)
+        .subquery()
+    )
+    # Every renumbered task counts as changed for delta sync
+    _, change_seq = next_change_seq(db, workspace_of_project(project_id))
+    db.execute(
+        update(Task)
+        .where(Task.id == ranked.c.id)
+        .values(position=ranked.c.rn * POSITION_GAP, change_seq=change_seq)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _rebalance_in_own_session(project_id: int) -> bool:
+    db = SessionLocal()
+    try:
+        rebalance_project(db, project_id)
+        db.commit()
+        return True
+    except Exception:
+        logger.exception(
+            "Rebalancing task positions failed for project %s", project_id
+        )
+        db.rollback()
+        return False
+    finally:
+        db.close()
+
+
+async def rebalance_project_in_background(project_id: int) -> None:
+    if await run_in_threadpool(_rebalance_in_own_session, project_id):
+        publish_resync(project_id)
@@ -0,0 +1,69 @@
+"""
+Ranked task search on top of the dialect-specific index in app.db.search.
+
+User input is reduced to word tokens and every token is matched as a
+prefix, so queries behave the same on both backends and can't inject
+tsquery/FTS5 operators. Dialects without an index fall back to LIKE.
+"""
+import re
+
+from sqlalchemy import column, func, literal_column, or_, select, table
+from sqlalchemy.orm import Session
+
+from app.db.search import TEXT_SEARCH_CONFIG
+from app.models.task import Task
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+tasks_fts = table("tasks_fts", column("rowid"))
+
+# bm25 column weights for tasks_fts(title, description)
+FTS_TITLE_WEIGHT = 10.0
+FTS_DESCRIPTION_WEIGHT = 1.0
+
+
+def search_tokens(text: str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def search_tasks(db: Session, text: str, scope, limit: int) -> list[Task]:
+    """
+    Best matches for `text` among tasks satisfying `scope` (a filter on
+    Task), most relevant first.
+    """
+    tokens = search_tokens(text)
+    if not tokens:
+        return []
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        query = func.to_tsquery(
+            TEXT_SEARCH_CONFIG, " & ".join(f"{token}:*" for token in tokens)
+        )
+        vector = literal_column("tasks.search_vector")
+        rank = func.ts_rank_cd(vector, query)
+        stmt = (
+            select(Task)
+            .where(vector.op("@@")(query), scope)
+            .order_by(rank.desc(), Task.id.desc())
+        )
+    elif dialect == "sqlite":
+        fts = literal_column("tasks_fts")
+        match = " ".join(f'"{token}"*' for token in tokens)
+        rank = func.bm25(fts, FTS_TITLE_WEIGHT, FTS_DESCRIPTION_WEIGHT)
+        stmt = (
+            select(Task)
+            .select_from(Task)
+            .join(tasks_fts, tasks_fts.c.rowid == Task.id)
+            .where(fts.op("MATCH")(match), scope)
+            # bm25 scores are negative; lower is better
+            .order_by(rank.asc(), Task.id.desc())
+        )
+    else:
+        conditions = [
+            or_(Task.title.ilike(f"%{token}%"), Task.description.ilike(f"%{token}%"))
+            for token in tokens
+        ]
+        stmt = select(Task).where(scope, *conditions).order_by(Task.id.desc())
+
+    return list(db.scalars(stmt.limit(limit)))
@@ -0,0 +1,155 @@
+"""
+Maintained usage counters for plan quota enforcement.
+
+Quota checks reserve a slot with a single conditional UPDATE
+(`count = count + 1 WHERE count < limit`), which both checks and
+increments atomically, so two concurrent creates can never both take the
+last slot. The reservation rides in the caller's transaction and is
+rolled back with it if the insert fails. `reconcile_usage` recomputes the
+counters from the real rows to repair any drift.
+"""
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.project import Project
+from app.models.task import Task
+from app.models.workspace import Workspace
+from app.models.workspace_usage import WorkspaceUsage
+
+
+def _count_projects(db: Session, workspace_id: int) -> int:
+    return (
+        db.query(func.count(Project.id))
+        .filter(Project.workspace_id == workspace_id)
+        .scalar()
+    )
+
+
+def _count_tasks(db: Session, workspace_id: int) -> int:
+    return (
+        db.query(func.count(Task.id))
+        .join(Project, Task.project_id == Project.id)
+        .filter(Project.workspace_id == workspace_id)
+        .scalar()
+    )
+
+
+def create_usage_row(db: Session, workspace_id: int) -> None:
+    """
+    Creates the counters row for a workspace, seeded from the real counts.
+    A concurrent creator winning the race is fine; its row is kept.
+    """
+    try:
+        with db.begin_nested():
+            db.add(
+                WorkspaceUsage(
+                    workspace_id=workspace_id,
+                    project_count=_count_projects(db, workspace_id),
+                    task_count=_count_tasks(db, workspace_id),
+                )
+            )
+    except IntegrityError:
+        pass
+
+
+def _reserve(
+    db: Session, workspace_id: int, column, limit: int | None, count: int
+) -> bool:
+    stmt = (
+        update(WorkspaceUsage)
+        .where(WorkspaceUsage.workspace_id == workspace_id)
+        .values({column: column + count})
+        .execution_options(synchronize_session=False)
+    )
+    if limit is not None:
+        stmt = stmt.where(column + count <= limit)
+
+    if db.execute(stmt).rowcount:
+        return True
+
+    # Either the limit is reached or the row doesn't exist yet
+    if db.get(WorkspaceUsage, workspace_id) is not None:
+        return False
+
+    create_usage_row(db, workspace_id)
+    return db.execute(stmt).rowcount > 0
+
+
+def reserve_project_slot(db: Session, workspace_id: int, limit: int | None) -> bool:
+    return _reserve(db, workspace_id, WorkspaceUsage.project_count, limit, 1)
+
+
+def reserve_task_slots(
+    db: Session, workspace_id: int, limit: int | None, count: int = 1
+) -> bool:
+    """Takes `count` task slots at once, or none if that would exceed `limit`."""
+    return _reserve(db, workspace_id, WorkspaceUsage.task_count, limit, count)
+
+
+def release_tasks_for_project(db: Session, project_id: int, count: int = 1) -> None:
+    """Gives back `count` task slots to the workspace owning `project_id`."""
+    workspace_id = (
+        select(Project.workspace_id)
+        .where(Project.id == project_id)
+        .scalar_subquery()
+    )
+    db.execute(
+        update(WorkspaceUsage)
+        .where(WorkspaceUsage.workspace_id == workspace_id)
+        .values(task_count=WorkspaceUsage.task_count - count)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def release_project(db: Session, workspace_id: int, task_count: int = 0) -> None:
+    db.execute(
+        update(WorkspaceUsage)
+        .where(WorkspaceUsage.workspace_id == workspace_id)
+        .values(
+            project_count=WorkspaceUsage.project_count - 1,
+            task_count=WorkspaceUsage.task_count - task_count,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def reconcile_usage(db: Session, workspace_id: int | None = None) -> int:
+    """
+    Recomputes counters from the real rows for one workspace (or all of
+    them) and fixes any drift. Returns the number of rows corrected.
+    """
+    query = db.query(Workspace.id)
+    if workspace_id is not None:
+        query = query.filter(Workspace.id == workspace_id)
+
+    fixed = 0
+    for (ws_id,) in query.all():
+        # Lock the counters row first so concurrent creates wait for us
+        usage = db.get(WorkspaceUsage, ws_id, with_for_update=True)
+        projects = _count_projects(db, ws_id)
+        tasks = _count_tasks(db, ws_id)
+        if usage is None:
+            db.add(
+                WorkspaceUsage(
+                    workspace_id=ws_id, project_count=projects, task_count=tasks
+                )
+            )
+            fixed += 1
+        elif usage.project_count != projects or usage.task_count != tasks:
+            usage.project_count = projects
+            usage.task_count = tasks
+            fixed += 1
+        db.commit()
+    return fixed
+
+
+if __name__ == "__main__":
+    # Reconciliation job, e.g. from cron: python -m app.services.usage_service
+    from app.db.session import SessionLocal
+
+    session = SessionLocal()
+    try:
+        print(f"Reconciled {reconcile_usage(session)} workspace usage rows")
+    finally:
+        session.close()
@@ -1,22 +1,61 @@
+from sqlalchemy import event, insert
 from sqlalchemy.orm import Session
 
 from app.models.user import User
 from app.schemas.user import UserCreate
+from app.core.cache import TTLCache
+from app.core.config import get_settings
 from app.core.security import get_password_hash
 
+settings = get_settings()
+
+# user_id -> detached User, so get_current_user can skip the users table
+principal_cache = TTLCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_principal(mapper, connection, target: User) -> None:
+    # Any change to a user row (e.g. is_active flipping) drops the cached copy
+    principal_cache.invalidate(target.id)
+
 
 def get_user_by_email(db: Session, email: str) -> User | None:
     return db.query(User).filter(User.email == email).first()
 
 
-def create_user(db: Session, user_in: UserCreate) -> User:
-    hashed_pw = get_password_hash(user_in.password)
-    db_user = User(
-        email=user_in.email,
-        hashed_password=hashed_pw,
-        full_name=user_in.full_name,
-    )
-    db.add(db_user)
+def load_principal(db: Session, user_id: int) -> User | None:
+    """
+    Loads the user for an authenticated request and stores it in the
+    principal cache. Cached instances are detached from any session and
+    must be treated as read-only.
+    """
+    user = db.query(User).filter(User.id == user_id).first()
+    if user is None:
+        return None
+
+    db.expunge(user)
+    principal_cache.set(user_id, user)
+    return user
+
+
+def create_user(
+    db: Session, user_in: UserCreate, hashed_password: str | None = None
+) -> User:
+    hashed_pw = hashed_password or get_password_hash(user_in.password)
+    db_user = db.scalars(
+        insert(User)
+        .values(
+            email=user_in.email,
+            hashed_password=hashed_pw,
+            full_name=user_in.full_name,
+        )
+        .returning(User)
+    ).one()
+    # Expunged so commit doesn't expire the returned columns
+    db.expunge(db_user)
     db.commit()
-    db.refresh(db_user)
     return db_user
@@ -0,0 +1,156 @@
+"""
+Shared setup for the benchmark scripts.
+
+Run them from saas-app-backend, e.g. `python -m benchmarks.token_cache`.
+Unless DATABASE_URL is already set, each run gets a throwaway SQLite
+database. Import this module before anything from `app` so the settings
+pick the environment up.
+"""
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+import httpx
+
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='bench-')}/bench.db"
+)
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+
+def timed(fn, iterations: int) -> float:
+    """Seconds taken by `iterations` calls of `fn()`."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return time.perf_counter() - start
+
+
+def report(label: str, count: int, seconds: float) -> None:
+    rate = count / seconds if seconds else float("inf")
+    print(f"{label:<28} {count:>8} ops  {seconds:8.3f}s  {rate:>12,.0f} ops/s")
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for no samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def api_server(**env: str):
+    """
+    Runs the API under uvicorn in a subprocess with `env` added to the
+    environment and yields its base URL.
+    """
+    port = _free_port()
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--port", str(port), "--log-level", "warning",
+        ],
+        env={**os.environ, **env},
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                httpx.get(f"{base_url}/health", timeout=1)
+                break
+            except httpx.TransportError:
+                if time.monotonic() > deadline or server.poll() is not None:
+                    raise RuntimeError("API server did not start")
+                time.sleep(0.2)
+        yield base_url
+    finally:
+        server.terminate()
+        server.wait()
+
+
+@contextmanager
+def app_client():
+    """In-process TestClient with the startup/shutdown hooks run."""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+def signup(client, email: str = "bench@example.com") -> dict:
+    """Registers (if needed) and logs in; returns Authorization headers."""
+    password = "benchmark-password"
+    client.post(
+        "/auth/register",
+        json={"email": email, "password": password, "full_name": "Bench"},
+    )
+    response = client.post(
+        "/auth/login", data={"username": email, "password": password}
+    )
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def seed_project(client, headers: dict, task_count: int) -> int:
+    """
+    Creates a workspace and project and fills it with `task_count` tasks,
+    inserted directly (in board order) so plan quotas don't cap the size.
+    Returns the project id.
+    """
+    from sqlalchemy import insert
+
+    from app.db.session import SessionLocal
+    from app.models.task import Task
+    from app.services.task_ordering import POSITION_GAP
+    from app.services.usage_service import reconcile_usage
+
+    workspace = client.post("/workspaces/", json={"name": "Bench"}, headers=headers)
+    workspace.raise_for_status()
+    workspace_id = workspace.json()["id"]
+    project = client.post(
+        "/projects/",
+        json={"name": "Bench", "workspace_id": workspace_id},
+        headers=headers,
+    )
+    project.raise_for_status()
+    project_id = project.json()["id"]
+    user_id = client.get("/me", headers=headers).json()["id"]
+
+    db = SessionLocal()
+    try:
+        statuses = ("todo", "in_progress", "done")
+        for start in range(0, task_count, 1000):
+            db.execute(
+                insert(Task),
+                [
+                    {
+                        "title": f"Task {i}",
+                        "description": f"Benchmark task number {i}",
+                        "status": statuses[i % 3],
+                        "position": (i + 1) * POSITION_GAP,
+                        "project_id": project_id,
+                        "created_by": user_id,
+                    }
+                    for i in range(start, min(start + 1000, task_count))
+                ],
+            )
+        db.commit()
+        reconcile_usage(db, workspace_id)
+    finally:
+        db.close()
+    return project_id
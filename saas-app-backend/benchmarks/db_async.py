@@ -0,0 +1,114 @@
+"""
+Requests/sec at high concurrency with the sync Session vs DB_ASYNC.
+
+Seeds one user with a project of tasks, then runs the API under uvicorn
+once per mode against the same database and lets `concurrency` clients
+hammer two DB-bound endpoints (a task detail and the project task list)
+for `seconds`. Point DATABASE_URL at Postgres for numbers that mean
+something for production; the default is a throwaway SQLite file.
+
+    python -m benchmarks.db_async [concurrency] [seconds]
+"""
+import asyncio
+import sys
+import time
+
+import httpx
+
+from benchmarks.common import api_server, percentile
+
+EMAIL = "async@example.com"
+PASSWORD = "async-bench-password"
+TASKS = 50
+
+
+def _seed(base_url: str) -> tuple[dict, list[str]]:
+    with httpx.Client(base_url=base_url, timeout=60) as client:
+        client.post(
+            "/auth/register",
+            json={"email": EMAIL, "password": PASSWORD, "full_name": "Bench"},
+        )
+        token = client.post(
+            "/auth/login", data={"username": EMAIL, "password": PASSWORD}
+        ).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        workspace = client.post(
+            "/workspaces/", json={"name": "Bench"}, headers=headers
+        ).json()
+        project = client.post(
+            "/projects/",
+            json={"name": "Bench", "workspace_id": workspace["id"]},
+            headers=headers,
+        ).json()
+        tasks = client.post(
+            "/tasks/bulk",
+            json={
+                "project_id": project["id"],
+                "items": [{"title": f"Task {i}"} for i in range(TASKS)],
+            },
+            headers=headers,
+        ).json()
+
+    paths = [f"/tasks/{task['id']}" for task in tasks]
+    paths.append(f"/tasks/by-project/{project['id']}")
+    return headers, paths
+
+
+async def _client_loop(client, headers, paths, stop, latencies, errors, offset):
+    i = offset
+    while not stop.is_set():
+        i += 1
+        start = time.perf_counter()
+        try:
+            response = await client.get(paths[i % len(paths)], headers=headers)
+        except httpx.TimeoutException:
+            errors["timeout"] = errors.get("timeout", 0) + 1
+            continue
+        latencies.append(time.perf_counter() - start)
+        if response.status_code != 200:
+            errors[response.status_code] = errors.get(response.status_code, 0) + 1
+
+
+async def _load(base_url, headers, paths, concurrency, seconds):
+    stop = asyncio.Event()
+    latencies: list[float] = []
+    errors: dict = {}
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        tasks = [
+            asyncio.create_task(
+                _client_loop(client, headers, paths, stop, latencies, errors, i)
+            )
+            for i in range(concurrency)
+        ]
+        await asyncio.sleep(seconds)
+        stop.set()
+        await asyncio.gather(*tasks)
+    return latencies, errors
+
+
+def main(concurrency: int, seconds: float) -> None:
+    with api_server(DB_ASYNC="false") as base_url:
+        headers, paths = _seed(base_url)
+
+    for mode in ("false", "true"):
+        with api_server(DB_ASYNC=mode) as base_url:
+            latencies, errors = asyncio.run(
+                _load(base_url, headers, paths, concurrency, seconds)
+            )
+        label = "async" if mode == "true" else "sync"
+        print(
+            f"{label:<6} concurrency={concurrency}  "
+            f"{len(latencies) / seconds:8.1f} req/s  "
+            f"p50={percentile(latencies, 50) * 1000:7.2f}ms  "
+            f"p99={percentile(latencies, 99) * 1000:7.2f}ms  "
+            f"errors={errors}"
+        )
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 10,
+    )
@@ -0,0 +1,187 @@
+"""
+Live-update fan-out to many subscribers of one project on one worker.
+
+Runs the API under a single uvicorn worker, opens `subscribers` SSE
+streams on GET /projects/{id}/events, then updates `updates` different
+tasks one after another through PATCH /tasks/{id}. For every update it
+records when each stream received it, and reports how long delivery took
+(from sending the PATCH) per receipt and until the last subscriber had
+it, how many receipts arrived, and the PATCH latency while the worker is
+fanning out. Finally, repeated drops into one spot trigger a rebalance,
+and every stream should get one resync event for it instead of an
+upsert per renumbered task.
+
+    python -m benchmarks.event_fanout [subscribers] [updates]
+"""
+import asyncio
+import json
+import sys
+import time
+
+import httpx
+
+from benchmarks.common import api_server, percentile
+
+EMAIL = "fanout@example.com"
+PASSWORD = "fanout-bench-password"
+# Streams opened at once while connecting
+CONNECT_CONCURRENCY = 100
+# Enough halvings of one gap to trigger a rebalance (about 16) but not two
+REBALANCE_MOVES = 20
+
+
+def _seed(base_url: str, updates: int) -> tuple[dict, int, list[int]]:
+    with httpx.Client(base_url=base_url, timeout=60) as client:
+        client.post(
+            "/auth/register",
+            json={"email": EMAIL, "password": PASSWORD, "full_name": "Bench"},
+        )
+        token = client.post(
+            "/auth/login", data={"username": EMAIL, "password": PASSWORD}
+        ).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        workspace = client.post(
+            "/workspaces/", json={"name": "Bench"}, headers=headers
+        ).json()
+        project = client.post(
+            "/projects/",
+            json={"name": "Bench", "workspace_id": workspace["id"]},
+            headers=headers,
+        ).json()
+        tasks = client.post(
+            "/tasks/bulk",
+            json={
+                "project_id": project["id"],
+                "items": [{"title": f"Task {i}"} for i in range(max(updates, 2))],
+            },
+            headers=headers,
+        ).json()
+    return headers, project["id"], [task["id"] for task in tasks]
+
+
+async def _subscribe(client, headers, project_id, connected, gate, received, done):
+    """Reads one SSE stream, timestamping each event by its title/type."""
+    async with gate:
+        stream = client.stream(
+            "GET", f"/projects/{project_id}/events", headers=headers
+        )
+        response = await stream.__aenter__()
+    try:
+        event_type = None
+        async for line in response.aiter_lines():
+            if line == ": connected":
+                connected.release()
+            elif line.startswith("event: "):
+                event_type = line[len("event: "):]
+            elif line.startswith("data: "):
+                now = time.perf_counter()
+                if event_type == "resync":
+                    received.append(("resync", now))
+                    done.release()
+                else:
+                    data = json.loads(line[len("data: "):])["data"]
+                    received.append((data["title"], now))
+    finally:
+        await stream.__aexit__(None, None, None)
+
+
+async def _run(base_url, headers, project_id, task_ids, subscribers, updates):
+    limits = httpx.Limits(max_connections=subscribers + 10)
+    timeout = httpx.Timeout(60, read=None)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=timeout
+    ) as client:
+        connected = asyncio.Semaphore(0)
+        done = asyncio.Semaphore(0)
+        gate = asyncio.Semaphore(CONNECT_CONCURRENCY)
+        received: list[tuple[str, float]] = []
+        readers = [
+            asyncio.create_task(
+                _subscribe(client, headers, project_id, connected, gate, received, done)
+            )
+            for _ in range(subscribers)
+        ]
+        start = time.perf_counter()
+        for _ in range(subscribers):
+            await connected.acquire()
+        print(f"connected {subscribers} streams in {time.perf_counter() - start:.2f}s")
+
+        sent: dict[str, float] = {}
+        patch_latencies = []
+        for i in range(updates):
+            title = f"Update {i}"
+            sent[title] = time.perf_counter()
+            response = await client.patch(
+                f"/tasks/{task_ids[i]}", json={"title": title}, headers=headers
+            )
+            response.raise_for_status()
+            patch_latencies.append(time.perf_counter() - sent[title])
+        # Let the last events drain before measuring
+        await asyncio.sleep(2)
+        updates_received = list(received)
+
+        # Keep dropping the last task after the first one until the gap is
+        # narrow enough to renumber the project
+        order = list(task_ids)
+        for _ in range(REBALANCE_MOVES):
+            mover = order.pop()
+            response = await client.post(
+                f"/tasks/{mover}/move",
+                json={"after_id": order[0], "before_id": order[1]},
+                headers=headers,
+            )
+            response.raise_for_status()
+            order.insert(1, mover)
+        try:
+            for _ in range(subscribers):
+                await asyncio.wait_for(done.acquire(), timeout=10)
+        except asyncio.TimeoutError:
+            pass
+        resynced = sum(1 for title, _ in received if title == "resync")
+
+        for reader in readers:
+            reader.cancel()
+        await asyncio.gather(*readers, return_exceptions=True)
+    return sent, updates_received, patch_latencies, resynced
+
+
+def main(subscribers: int, updates: int) -> None:
+    with api_server(EVENT_COALESCE_SECONDS="0") as base_url:
+        headers, project_id, task_ids = _seed(base_url, updates)
+        sent, received, patch_latencies, resynced = asyncio.run(
+            _run(base_url, headers, project_id, task_ids, subscribers, updates)
+        )
+
+    delivery = [at - sent[title] for title, at in received if title in sent]
+    last = {}
+    for title, at in received:
+        if title in sent:
+            last[title] = max(last.get(title, 0.0), at - sent[title])
+    expected = subscribers * updates
+    print(
+        f"subscribers={subscribers} updates={updates}  "
+        f"receipts={len(delivery)}/{expected}  "
+        f"{len(delivery) / (max(at for _, at in received) - min(sent.values())):,.0f} "
+        f"events/s delivered"
+    )
+    print(
+        f"delivery     p50={percentile(delivery, 50) * 1000:7.2f}ms  "
+        f"p99={percentile(delivery, 99) * 1000:7.2f}ms"
+    )
+    print(
+        f"last reader  p50={percentile(list(last.values()), 50) * 1000:7.2f}ms  "
+        f"p99={percentile(list(last.values()), 99) * 1000:7.2f}ms"
+    )
+    print(
+        f"PATCH        p50={percentile(patch_latencies, 50) * 1000:7.2f}ms  "
+        f"p99={percentile(patch_latencies, 99) * 1000:7.2f}ms"
+    )
+    print(f"resync events after the rebalance: {resynced} for {subscribers} streams")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 50,
+    )
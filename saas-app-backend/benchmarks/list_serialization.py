@@ -0,0 +1,108 @@
+"""
+Memory and throughput of the Core-row list path vs the ORM path.
+
+Seeds one project with `tasks` tasks, then builds the JSON body of the
+whole list repeatedly in two ways:
+
+  orm   SELECT Task entities into the session, validate them into TaskOut
+        (from_attributes) and dump to JSON the way response_model does
+  core  select_fields + rows_response, as the list endpoints now do
+
+with the full representation and with a sparse `?fields=` subset. Each
+variant reports bodies/s, rows/s and the tracemalloc peak of one build.
+
+    python -m benchmarks.list_serialization [tasks] [iterations]
+"""
+import json
+import sys
+import time
+import tracemalloc
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+
+from benchmarks.common import app_client, seed_project, signup
+from app.api.fieldsets import rows_response, select_fields
+from app.db.session import SessionLocal
+from app.models.task import Task
+from app.schemas.task import TaskOut
+
+SPARSE = ("id", "title", "status", "position")
+
+_orm_adapter = TypeAdapter(list[TaskOut])
+
+
+def _orm_body(project_id: int, names) -> bytes:
+    db = SessionLocal()
+    try:
+        tasks = db.scalars(
+            select(Task)
+            .where(Task.project_id == project_id)
+            .order_by(Task.position, Task.id)
+        ).all()
+        validated = _orm_adapter.validate_python(tasks, from_attributes=True)
+        include = None if names is None else {"__all__": set(names)}
+        content = _orm_adapter.dump_python(validated, mode="json", include=include)
+        return json.dumps(content, separators=(",", ":")).encode()
+    finally:
+        db.close()
+
+
+def _core_body(project_id: int, names) -> bytes:
+    db = SessionLocal()
+    try:
+        rows = db.execute(
+            select_fields(Task, TaskOut, names)
+            .where(Task.project_id == project_id)
+            .order_by(Task.position, Task.id)
+        ).all()
+        return rows_response(TaskOut, names, rows).body
+    finally:
+        db.close()
+
+
+def _peak(build, project_id, names) -> int:
+    tracemalloc.start()
+    try:
+        build(project_id, names)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _measure(label, build, project_id, names, task_count, iterations):
+    build(project_id, names)  # warm caches and serializers
+    start = time.perf_counter()
+    for _ in range(iterations):
+        size = len(build(project_id, names))
+    seconds = time.perf_counter() - start
+    peak = _peak(build, project_id, names)
+    print(
+        f"{label:<12} {iterations / seconds:7.2f} lists/s  "
+        f"{iterations * task_count / seconds:>10,.0f} rows/s  "
+        f"peak={peak / 2**20:7.1f} MiB  body={size / 2**20:5.2f} MiB"
+    )
+
+
+def main(task_count: int, iterations: int) -> None:
+    with app_client() as client:
+        headers = signup(client)
+        project_id = seed_project(client, headers, task_count)
+
+    # Both paths must produce the same rows before they are compared
+    for names in (None, SPARSE):
+        assert json.loads(_orm_body(project_id, names)) == json.loads(
+            _core_body(project_id, names)
+        )
+
+    print(f"tasks={task_count} iterations={iterations}")
+    for names, suffix in ((None, "full"), (SPARSE, "sparse")):
+        _measure(f"orm {suffix}", _orm_body, project_id, names, task_count, iterations)
+        _measure(f"core {suffix}", _core_body, project_id, names, task_count, iterations)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10,
+    )
@@ -0,0 +1,95 @@
+"""
+Latency of a non-auth endpoint while logins run in parallel.
+
+Starts the API with uvicorn in a subprocess, then measures GET /workspaces/
+latency twice: on its own, and while `logins` concurrent clients log in
+back to back. With password hashing in the process pool the p99 should
+stay roughly flat; rerun with PASSWORD_HASH_WORKERS=0 to compare against
+hashing in the request threadpool.
+
+    python -m benchmarks.login_load [logins] [seconds]
+"""
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+from benchmarks.common import api_server, percentile
+
+READERS = 8
+EMAIL = "load@example.com"
+PASSWORD = "load-test-password"
+
+
+async def _read_loop(client, headers, stop, latencies):
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.get("/workspaces/", headers=headers)
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+
+
+async def _login_loop(client, stop, counts):
+    form = {"username": EMAIL, "password": PASSWORD}
+    while not stop.is_set():
+        response = await client.post("/auth/login", data=form)
+        counts[response.status_code] = counts.get(response.status_code, 0) + 1
+
+
+async def _phase(client, headers, logins: int, seconds: float):
+    stop = asyncio.Event()
+    latencies: list[float] = []
+    counts: dict[int, int] = {}
+    tasks = [
+        asyncio.create_task(_read_loop(client, headers, stop, latencies))
+        for _ in range(READERS)
+    ]
+    tasks += [
+        asyncio.create_task(_login_loop(client, stop, counts))
+        for _ in range(logins)
+    ]
+    await asyncio.sleep(seconds)
+    stop.set()
+    await asyncio.gather(*tasks)
+    return latencies, counts
+
+
+async def _run(base_url: str, logins: int, seconds: float) -> None:
+    limits = httpx.Limits(max_connections=READERS + logins)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        await client.post(
+            "/auth/register",
+            json={"email": EMAIL, "password": PASSWORD, "full_name": "Load"},
+        )
+        token = (
+            await client.post(
+                "/auth/login", data={"username": EMAIL, "password": PASSWORD}
+            )
+        ).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        for label, concurrent_logins in (("idle", 0), (f"{logins} logins", logins)):
+            latencies, counts = await _phase(
+                client, headers, concurrent_logins, seconds
+            )
+            print(
+                f"{label:<12} GET /workspaces/ n={len(latencies):>6}  "
+                f"p50={percentile(latencies, 50) * 1000:7.2f}ms  "
+                f"p99={percentile(latencies, 99) * 1000:7.2f}ms  "
+                f"logins={counts}"
+            )
+
+
+def main(logins: int, seconds: float) -> None:
+    print(f"PASSWORD_HASH_WORKERS={os.environ.get('PASSWORD_HASH_WORKERS', 2)}")
+    with api_server() as base_url:
+        asyncio.run(_run(base_url, logins, seconds))
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 32,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 10,
+    )
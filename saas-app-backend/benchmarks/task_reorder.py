@@ -0,0 +1,119 @@
+"""
+Dragging cards around a 10k-task project.
+
+Seeds a project, then moves tasks through POST /tasks/{id}/move:
+random drags across the whole board, followed by repeated drops into one
+spot (which exhausts the gap and forces rebalances). For every move it
+records the latency and how many task rows were written, and compares
+that with the rows a dense 1..N renumbering would have rewritten. The
+final board order is checked against the expected one.
+
+    python -m benchmarks.task_reorder [tasks] [moves]
+"""
+import random
+import sys
+import time
+
+from sqlalchemy import event, select
+
+from benchmarks.common import app_client, percentile, seed_project, signup
+from app.db.session import SessionLocal, engine
+from app.models.task import Task
+
+
+def _board(project_id: int) -> list[int]:
+    db = SessionLocal()
+    try:
+        return list(
+            db.scalars(
+                select(Task.id)
+                .where(Task.project_id == project_id)
+                .order_by(Task.position, Task.id)
+            )
+        )
+    finally:
+        db.close()
+
+
+class _RowsWritten:
+    """Counts task rows changed by UPDATE statements."""
+
+    def __init__(self):
+        self.rows = 0
+        event.listen(engine, "after_cursor_execute", self._record)
+
+    def _record(self, connection, cursor, statement, parameters, context, many):
+        if statement.startswith("UPDATE tasks"):
+            self.rows += max(cursor.rowcount, 0)
+
+    def take(self) -> int:
+        rows, self.rows = self.rows, 0
+        return rows
+
+
+def _move(client, headers, board, rows, mover, target):
+    """Moves `mover` to index `target` of the board without it."""
+    source = board.index(mover)
+    board.remove(mover)
+    after = board[target - 1] if target > 0 else None
+    before = board[target] if target < len(board) else None
+    body = {"after_id": after, "before_id": before}
+    if after is None and before is not None:
+        body = {"before_id": before}
+
+    rows.take()
+    start = time.perf_counter()
+    response = client.post(f"/tasks/{mover}/move", json=body, headers=headers)
+    elapsed = time.perf_counter() - start
+    response.raise_for_status()
+    board.insert(target, mover)
+    # A dense 1..N order rewrites every row between the old and new slot
+    dense_rows = abs(source - target) + 1
+    return elapsed, rows.take(), dense_rows
+
+
+def _report(label, samples):
+    latencies = [s[0] for s in samples]
+    written = [s[1] for s in samples]
+    dense = [s[2] for s in samples]
+    print(
+        f"{label:<12} moves={len(samples):>5}  "
+        f"{len(samples) / sum(latencies):7.1f} moves/s  "
+        f"p50={percentile(latencies, 50) * 1000:6.2f}ms  "
+        f"p99={percentile(latencies, 99) * 1000:7.2f}ms  "
+        f"rows/move={sum(written) / len(written):8.1f} "
+        f"(max {max(written)}, dense renumbering {sum(dense) / len(dense):8.1f})"
+    )
+
+
+def main(task_count: int, moves: int) -> None:
+    random.seed(1)
+    with app_client() as client:
+        headers = signup(client)
+        project_id = seed_project(client, headers, task_count)
+        board = _board(project_id)
+        rows = _RowsWritten()
+
+        samples = []
+        for _ in range(moves):
+            mover = random.choice(board)
+            samples.append(
+                _move(client, headers, board, rows, mover, random.randrange(task_count))
+            )
+        _report("random", samples)
+
+        # Keep dropping the last card right after the first one
+        samples = [
+            _move(client, headers, board, rows, board[-1], 1) for _ in range(moves)
+        ]
+        _report("same spot", samples)
+
+        assert _board(project_id) == board, "board order diverged"
+        print("final board order matches")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 500,
+    )
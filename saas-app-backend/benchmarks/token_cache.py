@@ -0,0 +1,34 @@
+"""
+Cold vs warm decode_token throughput.
+
+Cold calls empty the verified-token cache first, so each one pays for the
+full jwt.decode signature check; warm calls are served from the cache.
+
+    python -m benchmarks.token_cache [iterations]
+"""
+import sys
+
+from benchmarks.common import report, timed
+from app.core.security import create_access_token, decode_token, token_cache
+
+
+def main(iterations: int) -> None:
+    token = create_access_token({"sub": "1"})
+
+    def cold():
+        token_cache.clear()
+        decode_token(token)
+
+    cold_seconds = timed(cold, iterations)
+
+    token_cache.clear()
+    decode_token(token)
+    warm_seconds = timed(lambda: decode_token(token), iterations)
+
+    report("decode_token (cold)", iterations, cold_seconds)
+    report("decode_token (warm)", iterations, warm_seconds)
+    print(f"speedup: {cold_seconds / warm_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
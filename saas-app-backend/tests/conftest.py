@@ -0,0 +1,120 @@
+"""
+Shared fixtures: a throwaway SQLite database, the app behind a TestClient
+and helpers to sign users up.
+
+The environment is set before `app` is imported because settings and
+engines are built at import time.
+"""
+import itertools
+import os
+import tempfile
+
+os.environ["DATABASE_URL"] = (
+    f"sqlite:///{tempfile.mkdtemp(prefix='tests-')}/test.db"
+)
+os.environ["SECRET_KEY"] = "test-secret"
+os.environ["PASSWORD_HASH_WORKERS"] = "0"
+os.environ["EVENT_COALESCE_SECONDS"] = "0"
+os.environ.pop("READ_DATABASE_URL", None)
+os.environ.pop("DB_ASYNC", None)
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.core.security import token_cache  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.routing import recent_writers  # noqa: E402
+from app.db.session import engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.billing_service import entitlement_cache  # noqa: E402
+from app.services.deletion_service import deletion_jobs  # noqa: E402
+from app.services.ownership_cache import ownership_graph  # noqa: E402
+from app.services.user_service import principal_cache  # noqa: E402
+
+PASSWORD = "test-password"
+
+_emails = itertools.count()
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(autouse=True)
+def _clean_state(client):
+    """Empties every table but the seeded plans, and the in-process caches."""
+    yield
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            if table.name != "plans":
+                connection.execute(table.delete())
+    for cache in (
+        token_cache,
+        principal_cache,
+        entitlement_cache,
+        recent_writers,
+        deletion_jobs,
+    ):
+        cache.clear()
+    ownership_graph.clear()
+
+
+@pytest.fixture
+def statements():
+    """
+    (sql, parameters) of every statement sent to the primary engine while
+    the test runs; clear() it to start counting from a given point.
+    """
+    captured = []
+
+    def record(connection, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield captured
+    event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def signup(client):
+    """Registers a new user and returns their Authorization headers."""
+
+    def signup() -> dict:
+        email = f"user{next(_emails)}@example.com"
+        client.post(
+            "/auth/register",
+            json={"email": email, "password": PASSWORD, "full_name": "Test"},
+        ).raise_for_status()
+        response = client.post(
+            "/auth/login", data={"username": email, "password": PASSWORD}
+        )
+        response.raise_for_status()
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    return signup
+
+
+@pytest.fixture
+def auth(signup):
+    return signup()
+
+
+@pytest.fixture
+def workspace(client, auth):
+    response = client.post("/workspaces/", json={"name": "Workspace"}, headers=auth)
+    response.raise_for_status()
+    return response.json()
+
+
+@pytest.fixture
+def project(client, auth, workspace):
+    response = client.post(
+        "/projects/",
+        json={"name": "Project", "workspace_id": workspace["id"]},
+        headers=auth,
+    )
+    response.raise_for_status()
+    return response.json()
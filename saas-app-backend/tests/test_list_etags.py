@@ -0,0 +1,84 @@
+import pytest
+
+
+@pytest.fixture
+def tasks(client, auth, project):
+    response = client.post(
+        "/tasks/bulk",
+        json={
+            "project_id": project["id"],
+            "items": [
+                {"title": f"Task {i}", "status": "done" if i % 2 else "todo"}
+                for i in range(5)
+            ],
+        },
+        headers=auth,
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def _list(client, auth, project_id, etag=None, **params):
+    headers = dict(auth)
+    if etag is not None:
+        headers["If-None-Match"] = etag
+    return client.get(
+        f"/tasks/by-project/{project_id}", params=params, headers=headers
+    )
+
+
+def test_same_view_revalidates(client, auth, project, tasks):
+    first = _list(client, auth, project["id"], limit=2, status="todo")
+    assert first.status_code == 200
+    again = _list(
+        client, auth, project["id"], first.headers["ETag"], limit=2, status="todo"
+    )
+    assert again.status_code == 304
+    assert again.headers["ETag"] == first.headers["ETag"]
+
+
+def test_next_page_is_not_validated_by_the_first(client, auth, project, tasks):
+    first = _list(client, auth, project["id"], limit=2)
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = _list(
+        client, auth, project["id"], first.headers["ETag"], limit=2, cursor=cursor
+    )
+    assert second.status_code == 200
+    assert [task["id"] for task in second.json()] == [t["id"] for t in tasks[2:4]]
+
+    again = _list(
+        client, auth, project["id"], second.headers["ETag"], limit=2, cursor=cursor
+    )
+    assert again.status_code == 304
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"status": "done"},
+        {"status": "todo"},
+        {"assigned_to": 1},
+        {"priority": "high"},
+        {"due_after": "2030-01-01T00:00:00"},
+        {"limit": 3},
+        {"fields": "id,title"},
+    ],
+)
+def test_other_views_are_not_validated_by_the_full_list(
+    client, auth, project, tasks, params
+):
+    full = _list(client, auth, project["id"])
+    response = _list(client, auth, project["id"], full.headers["ETag"], **params)
+    assert response.status_code == 200
+    assert response.headers["ETag"] != full.headers["ETag"]
+
+
+def test_write_invalidates_the_view(client, auth, project, tasks):
+    first = _list(client, auth, project["id"], status="todo")
+    client.patch(
+        f"/tasks/{tasks[0]['id']}", json={"status": "done"}, headers=auth
+    ).raise_for_status()
+    response = _list(client, auth, project["id"], first.headers["ETag"], status="todo")
+    assert response.status_code == 200
+    assert tasks[0]["id"] not in [task["id"] for task in response.json()]
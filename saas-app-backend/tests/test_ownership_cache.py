@@ -0,0 +1,240 @@
+"""
+The ownership graph must never grant access the database would refuse:
+deletes and re-parenting drop the affected edges, and a stale edge (as
+another worker may still hold) never reaches a write: the statement's
+WHERE clause carries the cached chain and a miss is rechecked.
+"""
+from app.db.session import SessionLocal
+from app.models.project import Project
+from app.models.task import Task
+from app.services.ownership_cache import ownership_graph
+
+
+def _create_task(client, headers, project_id, title="Task"):
+    response = client.post(
+        "/tasks/", json={"title": title, "project_id": project_id}, headers=headers
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def _create_project(client, headers, workspace_id):
+    response = client.post(
+        "/projects/",
+        json={"name": "Project", "workspace_id": workspace_id},
+        headers=headers,
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def _create_workspace(client, headers):
+    response = client.post("/workspaces/", json={"name": "Other"}, headers=headers)
+    response.raise_for_status()
+    return response.json()
+
+
+def _assert_denied(client, headers, task_id):
+    assert client.get(f"/tasks/{task_id}", headers=headers).status_code == 403
+    response = client.patch(
+        f"/tasks/{task_id}", json={"title": "hijacked"}, headers=headers
+    )
+    assert response.status_code == 403
+    response = client.post(f"/tasks/{task_id}/move", json={}, headers=headers)
+    assert response.status_code == 403
+    assert client.delete(f"/tasks/{task_id}", headers=headers).status_code == 403
+
+
+def test_project_delete_forgets_task_edges(client, auth, project):
+    task_ids = [_create_task(client, auth, project["id"])["id"] for _ in range(3)]
+    for task_id in task_ids:
+        client.get(f"/tasks/{task_id}", headers=auth).raise_for_status()
+
+    client.delete(f"/projects/{project['id']}", headers=auth).raise_for_status()
+
+    assert ownership_graph.workspace_of_project(project["id"]) is None
+    for task_id in task_ids:
+        assert ownership_graph.project_of_task(task_id) is None
+
+
+def test_workspace_delete_forgets_project_and_task_edges(
+    client, auth, workspace, project
+):
+    task_ids = [_create_task(client, auth, project["id"])["id"] for _ in range(3)]
+
+    client.delete(f"/workspaces/{workspace['id']}", headers=auth).raise_for_status()
+
+    assert ownership_graph.owner_of_workspace(workspace["id"]) is None
+    assert ownership_graph.workspace_of_project(project["id"]) is None
+    for task_id in task_ids:
+        assert ownership_graph.project_of_task(task_id) is None
+
+
+def test_reused_ids_after_tree_delete_are_not_granted(
+    client, signup, auth, workspace, project
+):
+    task = _create_task(client, auth, project["id"])
+    client.get(f"/tasks/{task['id']}", headers=auth).raise_for_status()
+    client.delete(f"/projects/{project['id']}", headers=auth).raise_for_status()
+
+    # SQLite hands the freed rowids to the next inserts
+    other = signup()
+    other_workspace = _create_workspace(client, other)
+    other_project = _create_project(client, other, other_workspace["id"])
+    other_task = _create_task(client, other, other_project["id"], "private")
+    assert (other_project["id"], other_task["id"]) == (project["id"], task["id"])
+
+    _assert_denied(client, auth, other_task["id"])
+    response = client.get(f"/tasks/{other_task['id']}", headers=other)
+    assert response.json()["title"] == "private"
+
+
+def _reused_task_id(client, signup, auth, project):
+    """Deletes our task so another user's new task reuses its id."""
+    other = signup()
+    other_workspace = _create_workspace(client, other)
+    other_project = _create_project(client, other, other_workspace["id"])
+
+    task = _create_task(client, auth, project["id"])
+    client.delete(f"/tasks/{task['id']}", headers=auth).raise_for_status()
+    other_task = _create_task(client, other, other_project["id"], "private")
+    assert other_task["id"] == task["id"]
+    return other, other_project, other_task
+
+
+def _title(client, headers, task_id):
+    response = client.get(f"/tasks/{task_id}", headers=headers)
+    return response.json()["title"]
+
+
+def test_stale_task_edge_does_not_reach_the_write(client, signup, auth, project):
+    other, other_project, other_task = _reused_task_id(client, signup, auth, project)
+    task_id = other_task["id"]
+
+    # Another worker that missed the delete still maps the id to our
+    # project; the writes come straight after, with no read to fix the edge
+    ownership_graph.remember_task(task_id, project["id"])
+    response = client.patch(
+        f"/tasks/{task_id}", json={"title": "hijacked"}, headers=auth
+    )
+    assert response.status_code == 403
+    assert ownership_graph.project_of_task(task_id) == other_project["id"]
+
+    ownership_graph.remember_task(task_id, project["id"])
+    assert client.delete(f"/tasks/{task_id}", headers=auth).status_code == 403
+
+    ownership_graph.remember_task(task_id, project["id"])
+    response = client.post(f"/tasks/{task_id}/move", json={}, headers=auth)
+    assert response.status_code == 403
+
+    ownership_graph.remember_task(task_id, project["id"])
+    response = client.patch(
+        "/tasks/batch",
+        json={"items": [{"task_id": task_id, "changes": {"title": "hijacked"}}]},
+        headers=auth,
+    )
+    assert response.status_code == 200
+    assert response.json()[0]["status_code"] == 403
+
+    assert _title(client, other, task_id) == "private"
+
+
+def test_stale_chain_with_reused_project_id_does_not_reach_the_write(
+    client, signup, auth, workspace, project
+):
+    # Both the project and the task id are reused under another owner, so
+    # the cached task -> project edge is even "right"; only the project's
+    # workspace (and owner) changed
+    task = _create_task(client, auth, project["id"])
+    client.delete(f"/projects/{project['id']}", headers=auth).raise_for_status()
+    other = signup()
+    other_workspace = _create_workspace(client, other)
+    other_project = _create_project(client, other, other_workspace["id"])
+    other_task = _create_task(client, other, other_project["id"], "private")
+    assert (other_project["id"], other_task["id"]) == (project["id"], task["id"])
+
+    def stale():
+        ownership_graph.remember_task(task["id"], project["id"])
+        ownership_graph.remember_project(project["id"], workspace["id"])
+
+    stale()
+    response = client.patch(
+        f"/tasks/{task['id']}", json={"title": "hijacked"}, headers=auth
+    )
+    assert response.status_code == 403
+    stale()
+    assert client.delete(f"/tasks/{task['id']}", headers=auth).status_code == 403
+    assert _title(client, other, task["id"]) == "private"
+
+
+def test_stale_project_edge_does_not_reach_the_write(
+    client, signup, auth, workspace, project
+):
+    other = signup()
+    other_workspace = _create_workspace(client, other)
+
+    client.delete(f"/projects/{project['id']}", headers=auth).raise_for_status()
+    other_project = _create_project(client, other, other_workspace["id"])
+    assert other_project["id"] == project["id"]
+
+    ownership_graph.remember_project(project["id"], workspace["id"])
+    response = client.patch(
+        f"/projects/{project['id']}", json={"name": "hijacked"}, headers=auth
+    )
+    assert response.status_code == 403
+    assert ownership_graph.workspace_of_project(project["id"]) == other_workspace["id"]
+
+    ownership_graph.remember_project(project["id"], workspace["id"])
+    assert client.delete(f"/projects/{project['id']}", headers=auth).status_code == 403
+
+    ownership_graph.remember_project(project["id"], workspace["id"])
+    response = client.get(f"/projects/{project['id']}/board", headers=auth)
+    assert response.status_code == 403
+
+    response = client.get(f"/projects/{project['id']}", headers=other)
+    assert response.json()["name"] == "Project"
+
+
+def test_stale_workspace_owner_does_not_reach_the_write(client, signup, auth):
+    other = signup()
+    other_workspace = _create_workspace(client, other)
+    me = client.get("/me", headers=auth).json()["id"]
+
+    ownership_graph.remember_workspace(other_workspace["id"], me)
+    response = client.patch(
+        f"/workspaces/{other_workspace['id']}", json={"name": "hijacked"}, headers=auth
+    )
+    assert response.status_code == 403
+
+    ownership_graph.remember_workspace(other_workspace["id"], me)
+    response = client.delete(f"/workspaces/{other_workspace['id']}", headers=auth)
+    assert response.status_code == 403
+
+    response = client.get(f"/workspaces/{other_workspace['id']}", headers=other)
+    assert response.json()["name"] == "Other"
+
+
+def test_reparenting_drops_edges(client, signup, auth, workspace, project):
+    task = _create_task(client, auth, project["id"])
+    second_project = _create_project(client, auth, workspace["id"])
+    client.get(f"/tasks/{task['id']}", headers=auth).raise_for_status()
+    client.get(f"/projects/{second_project['id']}", headers=auth).raise_for_status()
+
+    other = signup()
+    other_workspace = _create_workspace(client, other)
+    other_project = _create_project(client, other, other_workspace["id"])
+
+    db = SessionLocal()
+    try:
+        db.get(Task, task["id"]).project_id = other_project["id"]
+        db.get(Project, second_project["id"]).workspace_id = other_workspace["id"]
+        db.commit()
+    finally:
+        db.close()
+
+    assert ownership_graph.project_of_task(task["id"]) is None
+    assert ownership_graph.workspace_of_project(second_project["id"]) is None
+    _assert_denied(client, auth, task["id"])
+    response = client.get(f"/projects/{second_project['id']}", headers=auth)
+    assert response.status_code == 403
+    assert client.get(f"/tasks/{task['id']}", headers=other).status_code == 200
@@ -0,0 +1,70 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.models.plan import Plan
+from app.services.plan_catalog import refresh_plan_catalog
+
+settings = get_settings()
+
+
+@pytest.fixture
+def edit_plan(monkeypatch):
+    """Edits the seeded Pro plan in place; restored (and reloaded) after."""
+    monkeypatch.setattr(settings, "PLAN_CATALOG_REFRESH_SECONDS", 0)
+    db = SessionLocal()
+    pro = db.scalars(select(Plan).where(Plan.name == "Pro")).one()
+    original = {"price_per_month": pro.price_per_month, "is_active": pro.is_active}
+
+    def edit(**changes):
+        for name, value in changes.items():
+            setattr(pro, name, value)
+        db.commit()
+        return pro.id
+
+    yield edit
+    for name, value in original.items():
+        setattr(pro, name, value)
+    db.commit()
+    refresh_plan_catalog(db)
+    db.close()
+
+
+def _plans(client, auth, etag=None):
+    headers = dict(auth)
+    if etag is not None:
+        headers["If-None-Match"] = etag
+    return client.get("/billing/plans", headers=headers)
+
+
+def test_price_edit_reaches_the_catalog(client, auth, edit_plan):
+    before = _plans(client, auth)
+    assert before.status_code == 200
+
+    plan_id = edit_plan(price_per_month=Decimal("123.45"))
+
+    after = _plans(client, auth, before.headers["ETag"])
+    assert after.status_code == 200
+    assert after.headers["ETag"] != before.headers["ETag"]
+    prices = {plan["id"]: plan["price_per_month"] for plan in after.json()}
+    assert Decimal(str(prices[plan_id])) == Decimal("123.45")
+
+    # Unchanged content keeps the ETag across reloads
+    assert _plans(client, auth, after.headers["ETag"]).status_code == 304
+
+
+def test_retired_plan_is_no_longer_purchasable(client, auth, workspace, edit_plan):
+    plan_id = edit_plan(is_active=False)
+
+    listed = _plans(client, auth).json()
+    assert plan_id not in [plan["id"] for plan in listed]
+
+    response = client.post(
+        "/billing/create-order",
+        json={"workspace_id": workspace["id"], "plan_id": plan_id},
+        headers=auth,
+    )
+    assert response.status_code == 404
@@ -0,0 +1,90 @@
+import pytest
+
+
+@pytest.fixture
+def tasks(client, auth, project):
+    """Five todo, three done, two "review" and one "blocked" task."""
+    statuses = ["todo"] * 5 + ["done"] * 3 + ["review"] * 2 + ["blocked"]
+    response = client.post(
+        "/tasks/bulk",
+        json={
+            "project_id": project["id"],
+            "items": [
+                {"title": f"Task {i}", "status": status}
+                for i, status in enumerate(statuses)
+            ],
+        },
+        headers=auth,
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def _board(client, auth, project, **params):
+    response = client.get(
+        f"/projects/{project['id']}/board", params=params, headers=auth
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _ids(tasks, status):
+    return [task["id"] for task in tasks if task["status"] == status]
+
+
+def test_columns_and_totals(client, auth, project, tasks):
+    board = _board(client, auth, project)
+    assert board["project"]["id"] == project["id"]
+
+    # Board columns first (even when empty), then other statuses
+    columns = {column["status"]: column for column in board["columns"]}
+    assert list(columns) == ["todo", "in_progress", "done", "blocked", "review"]
+    for status, column in columns.items():
+        assert column["total"] == len(_ids(tasks, status))
+        assert [task["id"] for task in column["tasks"]] == _ids(tasks, status)
+        assert column["next_cursor"] is None
+    assert columns["in_progress"]["tasks"] == []
+
+
+def test_limit_applies_per_column(client, auth, project, tasks):
+    columns = _board(client, auth, project, limit=2)["columns"]
+    by_status = {column["status"]: column for column in columns}
+
+    for status in ("todo", "done"):
+        column = by_status[status]
+        assert [task["id"] for task in column["tasks"]] == _ids(tasks, status)[:2]
+        # Totals count the whole column, not the page
+        assert column["total"] == len(_ids(tasks, status))
+        assert column["next_cursor"] is not None
+
+    # A column that fits its page exactly has nothing to continue
+    assert [task["id"] for task in by_status["review"]["tasks"]] == _ids(
+        tasks, "review"
+    )
+    assert by_status["review"]["next_cursor"] is None
+    assert by_status["blocked"]["next_cursor"] is None
+
+
+@pytest.mark.parametrize("status", ["todo", "done"])
+def test_next_cursor_continues_on_the_task_list(client, auth, project, tasks, status):
+    column = next(
+        column
+        for column in _board(client, auth, project, limit=2)["columns"]
+        if column["status"] == status
+    )
+    seen = [task["id"] for task in column["tasks"]]
+    params = {"status": status, "limit": 2, "cursor": column["next_cursor"]}
+    while params.get("cursor"):
+        response = client.get(
+            f"/tasks/by-project/{project['id']}", params=params, headers=auth
+        )
+        assert response.status_code == 200
+        seen += [task["id"] for task in response.json()]
+        params["cursor"] = response.headers.get("X-Next-Cursor")
+
+    assert seen == _ids(tasks, status)
+
+
+def test_board_of_a_foreign_project(client, auth, signup, project, tasks):
+    response = client.get(f"/projects/{project['id']}/board", headers=signup())
+    assert response.status_code == 403
@@ -0,0 +1,215 @@
+"""
+Plan-regression tests for the hot query paths.
+
+Each test drives the real endpoint (or service call), picks the statement
+it sent out of the captured SQL and runs EXPLAIN QUERY PLAN on it with the
+same parameters. A test fails when the expected index is not used, when
+any table is scanned in full, or when an ordered listing needs a sort.
+"""
+import re
+
+from app.db.session import SessionLocal, engine
+from app.services.billing_service import entitlement_cache
+from app.services.usage_service import reconcile_usage
+
+# "SCAN t" and "SCAN t USING INDEX i" both read the whole table/index
+FULL_SCAN = re.compile(r"^SCAN (?!CONSTANT ROW)")
+SORT = "USE TEMP B-TREE FOR ORDER BY"
+
+
+def _plan(statement: str, parameters) -> list[str]:
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {statement}", parameters
+        ).all()
+    return [row[-1] for row in rows]
+
+
+def _find(statements, *fragments: str) -> tuple[str, tuple]:
+    matches = [
+        (sql, parameters)
+        for sql, parameters in statements
+        if all(fragment in sql for fragment in fragments)
+    ]
+    assert matches, f"no statement containing {fragments}"
+    return matches[-1]
+
+
+def _assert_plan(statements, index: str, *fragments: str, ordered=False) -> None:
+    plan = _plan(*_find(statements, *fragments))
+    assert any(index in step for step in plan), plan
+    assert not any(FULL_SCAN.match(step) for step in plan), plan
+    if ordered:
+        assert SORT not in plan, plan
+
+
+def _create_tasks(client, auth, project_id, count=3):
+    client.post(
+        "/tasks/bulk",
+        json={
+            "project_id": project_id,
+            "items": [{"title": f"Task {i}"} for i in range(count)],
+        },
+        headers=auth,
+    ).raise_for_status()
+
+
+def test_task_list_by_project(client, auth, project, statements):
+    _create_tasks(client, auth, project["id"])
+    statements.clear()
+    response = client.get(
+        f"/tasks/by-project/{project['id']}", params={"limit": 2}, headers=auth
+    )
+    response.raise_for_status()
+
+    _assert_plan(
+        statements,
+        "ix_tasks_project_id_position",
+        "FROM tasks",
+        "ORDER BY tasks.position",
+        ordered=True,
+    )
+
+    # The keyset continuation stays on the same index
+    statements.clear()
+    client.get(
+        f"/tasks/by-project/{project['id']}",
+        params={"limit": 2, "cursor": response.headers["X-Next-Cursor"]},
+        headers=auth,
+    ).raise_for_status()
+    _assert_plan(
+        statements,
+        "ix_tasks_project_id_position",
+        "FROM tasks",
+        "ORDER BY tasks.position",
+        ordered=True,
+    )
+
+
+def test_filtered_task_list_by_project(client, auth, project, statements):
+    _create_tasks(client, auth, project["id"])
+    statements.clear()
+    client.get(
+        f"/tasks/by-project/{project['id']}",
+        params={"status": "todo"},
+        headers=auth,
+    ).raise_for_status()
+
+    _assert_plan(
+        statements,
+        "ix_tasks_project_id_status_position",
+        "FROM tasks",
+        "ORDER BY tasks.position",
+        ordered=True,
+    )
+
+
+def test_project_list_by_workspace(client, auth, workspace, project, statements):
+    statements.clear()
+    client.get(
+        f"/projects/by-workspace/{workspace['id']}", headers=auth
+    ).raise_for_status()
+
+    _assert_plan(
+        statements,
+        "ix_projects_workspace_id_created_at",
+        "FROM projects",
+        "ORDER BY projects.created_at DESC",
+        ordered=True,
+    )
+
+
+def test_workspace_list(client, auth, workspace, statements):
+    statements.clear()
+    client.get("/workspaces/", headers=auth).raise_for_status()
+
+    _assert_plan(
+        statements,
+        "ix_workspaces_owner_id_created_at",
+        "FROM workspaces",
+        "ORDER BY workspaces.created_at DESC",
+        ordered=True,
+    )
+    # The ETag aggregate is answered from the same index
+    _assert_plan(
+        statements, "ix_workspaces_owner_id_created_at", "count(workspaces.id)"
+    )
+
+
+def test_quota_reservation(client, auth, project, statements):
+    statements.clear()
+    _create_tasks(client, auth, project["id"], count=1)
+
+    _assert_plan(
+        statements,
+        "INTEGER PRIMARY KEY",
+        "UPDATE workspace_usage SET task_count",
+    )
+
+
+def test_usage_recount(client, auth, workspace, project, statements):
+    _create_tasks(client, auth, project["id"])
+    statements.clear()
+    db = SessionLocal()
+    try:
+        reconcile_usage(db, workspace["id"])
+    finally:
+        db.close()
+
+    _assert_plan(
+        statements,
+        "ix_projects_workspace_id_",
+        "count(projects.id)",
+    )
+    _assert_plan(
+        statements,
+        "ix_tasks_project_id_",
+        "count(tasks.id)",
+        "JOIN projects",
+    )
+
+
+def test_effective_plan_lookup(client, auth, project, statements):
+    entitlement_cache.clear()
+    statements.clear()
+    _create_tasks(client, auth, project["id"], count=1)
+
+    _assert_plan(
+        statements,
+        "ix_subscriptions_workspace_id_status_period_end",
+        "FROM subscriptions",
+        "subscriptions.status = ?",
+        ordered=True,
+    )
+
+
+def test_order_lookup(client, auth, workspace, statements):
+    paid_plan = next(
+        plan
+        for plan in client.get("/billing/plans", headers=auth).json()
+        if plan["price_per_month"] != "0.00"
+    )
+    order = client.post(
+        "/billing/create-order",
+        json={"workspace_id": workspace["id"], "plan_id": paid_plan["id"]},
+        headers=auth,
+    ).json()
+    statements.clear()
+    client.post(
+        "/billing/verify-payment",
+        json={
+            "workspace_id": workspace["id"],
+            "plan_id": paid_plan["id"],
+            "razorpay_order_id": order["order_id"],
+            "razorpay_payment_id": "pay_test",
+            "razorpay_signature": "signature",
+        },
+        headers=auth,
+    ).raise_for_status()
+
+    _assert_plan(
+        statements,
+        "ix_payments_razorpay_order_id",
+        "FROM payments",
+        "payments.razorpay_order_id = ?",
+    )
@@ -0,0 +1,109 @@
+import base64
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select, update
+
+from app.api.pagination import encode_cursor
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.models.sync_tombstone import SyncTombstone
+from app.services.change_log import prune_tombstones
+
+settings = get_settings()
+
+
+def _token(raw: str) -> str:
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+@pytest.fixture
+def tasks(client, auth, project):
+    response = client.post(
+        "/tasks/bulk",
+        json={
+            "project_id": project["id"],
+            "items": [{"title": f"Task {i}"} for i in range(3)],
+        },
+        headers=auth,
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def _sync(client, auth, workspace_id, token=None):
+    params = {"workspace_id": workspace_id}
+    if token is not None:
+        params["token"] = token
+    return client.get("/sync", params=params, headers=auth)
+
+
+def test_delta_reports_deletions(client, auth, workspace, tasks):
+    snapshot = _sync(client, auth, workspace["id"]).json()
+    assert snapshot["reset"] is True
+    assert len(snapshot["tasks"]) == 3
+
+    client.delete(f"/tasks/{tasks[0]['id']}", headers=auth).raise_for_status()
+    delta = _sync(client, auth, workspace["id"], snapshot["token"]).json()
+    assert delta["reset"] is False
+    assert delta["tasks"] == []
+    assert delta["deleted_task_ids"] == [tasks[0]["id"]]
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "not base64!",
+        _token("not json"),
+        _token("[1,2]"),
+        _token('["a",1,1]'),
+        _token("[1,1.5,1]"),
+        _token("[1,true,1]"),
+    ],
+)
+def test_malformed_token_is_rejected(client, auth, workspace, token):
+    response = _sync(client, auth, workspace["id"], token)
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid sync token"}
+
+
+def test_token_for_another_workspace_is_rejected(client, auth, workspace):
+    token = encode_cursor(workspace["id"] + 1, 0, int(time.time()))
+    response = _sync(client, auth, workspace["id"], token)
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid sync token"}
+
+
+def test_expired_token_gets_a_full_snapshot(client, auth, workspace, tasks):
+    client.delete(f"/tasks/{tasks[0]['id']}", headers=auth).raise_for_status()
+    issued_at = int(time.time()) - settings.SYNC_TOKEN_MAX_AGE_SECONDS - 60
+    response = _sync(
+        client, auth, workspace["id"], encode_cursor(workspace["id"], 0, issued_at)
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["reset"] is True
+    assert body["deleted_task_ids"] == []
+    assert [task["id"] for task in body["tasks"]] == [t["id"] for t in tasks[1:]]
+
+
+def test_prune_drops_only_old_tombstones(client, auth, tasks):
+    for task in tasks[:2]:
+        client.delete(f"/tasks/{task['id']}", headers=auth).raise_for_status()
+    now = datetime.now(timezone.utc)
+    db = SessionLocal()
+    try:
+        old = db.scalar(select(func.min(SyncTombstone.id)))
+        db.execute(
+            update(SyncTombstone)
+            .where(SyncTombstone.id == old)
+            .values(deleted_at=now - timedelta(days=60))
+        )
+        db.commit()
+
+        assert prune_tombstones(db, now - timedelta(days=30)) == 1
+        remaining = db.scalars(select(SyncTombstone.id)).all()
+        assert len(remaining) == 1 and old not in remaining
+    finally:
+        db.close()
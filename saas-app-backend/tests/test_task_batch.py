@@ -0,0 +1,120 @@
+import pytest
+
+from app.services.ownership_cache import ownership_graph
+
+MISSING_ID = 999999
+
+
+@pytest.fixture
+def tasks(client, auth, project):
+    response = client.post(
+        "/tasks/bulk",
+        json={
+            "project_id": project["id"],
+            "items": [{"title": f"Task {i}"} for i in range(2)],
+        },
+        headers=auth,
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+@pytest.fixture
+def foreign_task(client, signup):
+    other = signup()
+    workspace = client.post("/workspaces/", json={"name": "Other"}, headers=other)
+    project = client.post(
+        "/projects/",
+        json={"name": "Other", "workspace_id": workspace.json()["id"]},
+        headers=other,
+    )
+    task = client.post(
+        "/tasks/",
+        json={"title": "private", "project_id": project.json()["id"]},
+        headers=other,
+    ).json()
+    return task, other
+
+
+def _batch(client, auth, items):
+    response = client.patch("/tasks/batch", json={"items": items}, headers=auth)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_mixed_batch_reports_each_item(client, auth, tasks, foreign_task):
+    foreign, other = foreign_task
+    first, second = tasks
+    results = _batch(
+        client,
+        auth,
+        [
+            {"task_id": first["id"], "changes": {"title": "A"}},
+            {"task_id": foreign["id"], "changes": {"title": "hijacked"}},
+            {"task_id": MISSING_ID, "changes": {"title": "ghost"}},
+            {"task_id": second["id"], "changes": {"status": "done"}},
+            # A later item for the same task merges into the first one
+            {"task_id": first["id"], "changes": {"priority": "high"}},
+        ],
+    )
+
+    # One result per distinct task, in first-seen order
+    assert [(r["task_id"], r["status_code"]) for r in results] == [
+        (first["id"], 200),
+        (foreign["id"], 403),
+        (MISSING_ID, 404),
+        (second["id"], 200),
+    ]
+    assert results[1]["task"] is None and results[1]["detail"]
+    assert results[2] == {
+        "task_id": MISSING_ID,
+        "status_code": 404,
+        "detail": "Task not found",
+        "task": None,
+    }
+    assert results[0]["task"]["title"] == "A"
+    assert results[0]["task"]["priority"] == "high"
+    assert results[3]["task"]["status"] == "done"
+
+    # The failures did not roll back the allowed items, nor touch the rest
+    stored = client.get(f"/tasks/{first['id']}", headers=auth).json()
+    assert (stored["title"], stored["priority"]) == ("A", "high")
+    assert client.get(f"/tasks/{second['id']}", headers=auth).json()["status"] == (
+        "done"
+    )
+    assert client.get(f"/tasks/{foreign['id']}", headers=other).json()["title"] == (
+        "private"
+    )
+
+
+def test_batch_without_allowed_items(client, auth, foreign_task):
+    foreign, _ = foreign_task
+    results = _batch(
+        client,
+        auth,
+        [
+            {"task_id": foreign["id"], "changes": {"title": "hijacked"}},
+            {"task_id": MISSING_ID, "changes": {"title": "ghost"}},
+        ],
+    )
+    assert [r["status_code"] for r in results] == [403, 404]
+
+
+def test_stale_edge_in_a_batch_is_rechecked(
+    client, auth, project, tasks, foreign_task
+):
+    foreign, other = foreign_task
+    ownership_graph.remember_task(foreign["id"], project["id"])
+
+    results = _batch(
+        client,
+        auth,
+        [
+            {"task_id": tasks[0]["id"], "changes": {"title": "A"}},
+            {"task_id": foreign["id"], "changes": {"title": "hijacked"}},
+        ],
+    )
+    assert [r["status_code"] for r in results] == [200, 403]
+    assert client.get(f"/tasks/{foreign['id']}", headers=other).json()["title"] == (
+        "private"
+    )
@@ -0,0 +1,25 @@
+def test_bulk_create_returns_tasks_in_input_order(client, auth, project):
+    titles = [f"Task {i}" for i in (7, 3, 9, 1, 5, 0, 8, 2, 6, 4)]
+    statuses = ["done", "todo", "in_progress"]
+    response = client.post(
+        "/tasks/bulk",
+        json={
+            "project_id": project["id"],
+            "items": [
+                {"title": title, "status": statuses[i % 3]}
+                for i, title in enumerate(titles)
+            ],
+        },
+        headers=auth,
+    )
+    assert response.status_code == 200
+    created = response.json()
+    assert [task["title"] for task in created] == titles
+    assert [task["status"] for task in created] == [
+        statuses[i % 3] for i in range(len(titles))
+    ]
+    positions = [task["position"] for task in created]
+    assert positions == sorted(positions)
+
+    listed = client.get(f"/tasks/by-project/{project['id']}", headers=auth).json()
+    assert [task["id"] for task in listed] == [task["id"] for task in created]
@@ -0,0 +1,75 @@
+import base64
+import json
+
+import pytest
+
+
+def _cursor(raw: str) -> str:
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+@pytest.fixture
+def tasks(client, auth, project):
+    response = client.post(
+        "/tasks/bulk",
+        json={
+            "project_id": project["id"],
+            "items": [{"title": f"Task {i}"} for i in range(5)],
+        },
+        headers=auth,
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def test_pages_follow_the_cursor(client, auth, project, tasks):
+    seen = []
+    params = {"limit": 2}
+    while True:
+        response = client.get(
+            f"/tasks/by-project/{project['id']}", params=params, headers=auth
+        )
+        assert response.status_code == 200
+        seen += [task["id"] for task in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params["cursor"] = cursor
+
+    assert seen == [task["id"] for task in tasks]
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64!",
+        _cursor("not json"),
+        _cursor("{}"),
+        _cursor("[1]"),
+        _cursor("[1,2,3]"),
+        _cursor("[{},{}]"),
+        _cursor('["a","b"]'),
+        _cursor("[1.5,null]"),
+        _cursor("[1048576,1.0]"),
+        _cursor("[true,1]"),
+    ],
+)
+def test_malformed_cursor_is_rejected(client, auth, project, tasks, cursor):
+    response = client.get(
+        f"/tasks/by-project/{project['id']}",
+        params={"cursor": cursor},
+        headers=auth,
+    )
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
+
+
+def test_well_formed_cursor_is_accepted(client, auth, project, tasks):
+    cursor = _cursor(json.dumps([tasks[1]["position"], tasks[1]["id"]]))
+    response = client.get(
+        f"/tasks/by-project/{project['id']}",
+        params={"cursor": cursor},
+        headers=auth,
+    )
+    assert response.status_code == 200
+    assert [task["id"] for task in response.json()] == [t["id"] for t in tasks[2:]]
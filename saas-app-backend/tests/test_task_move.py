@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+
+from app.api.v1 import tasks as tasks_api
+from app.services.events import event_broker, project_channel
+
+
+@pytest.fixture
+def tasks(client, auth, project):
+    response = client.post(
+        "/tasks/bulk",
+        json={
+            "project_id": project["id"],
+            "items": [{"title": f"Task {i}"} for i in range(4)],
+        },
+        headers=auth,
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def _order(client, auth, project_id):
+    response = client.get(f"/tasks/by-project/{project_id}", headers=auth)
+    return [task["id"] for task in response.json()]
+
+
+def test_move_between_neighbours(client, auth, project, tasks):
+    first, second, third, fourth = (task["id"] for task in tasks)
+    response = client.post(
+        f"/tasks/{fourth}/move",
+        json={"after_id": first, "before_id": second},
+        headers=auth,
+    )
+    assert response.status_code == 200
+    assert _order(client, auth, project["id"]) == [first, fourth, second, third]
+
+
+def test_same_neighbour_twice_is_rejected(client, auth, project, tasks):
+    response = client.post(
+        f"/tasks/{tasks[0]['id']}/move",
+        json={"after_id": tasks[1]["id"], "before_id": tasks[1]["id"]},
+        headers=auth,
+    )
+    assert response.status_code == 400
+    assert _order(client, auth, project["id"]) == [task["id"] for task in tasks]
+
+
+def test_inverted_neighbours_are_rejected(client, auth, project, tasks):
+    response = client.post(
+        f"/tasks/{tasks[0]['id']}/move",
+        json={"after_id": tasks[3]["id"], "before_id": tasks[1]["id"]},
+        headers=auth,
+    )
+    assert response.status_code == 400
+
+
+def test_exhausted_gap_is_rebalanced_inline(client, auth, project, tasks):
+    # Dropping the last task right after the first one halves the same gap
+    # every time; a 2**20 gap runs out of integers after about 20 moves
+    expected = [task["id"] for task in tasks]
+    for _ in range(25):
+        mover = expected.pop()
+        response = client.post(
+            f"/tasks/{mover}/move",
+            json={"after_id": expected[0], "before_id": expected[1]},
+            headers=auth,
+        )
+        assert response.status_code == 200
+        expected.insert(1, mover)
+
+    listed = client.get(f"/tasks/by-project/{project['id']}", headers=auth).json()
+    assert [task["id"] for task in listed] == expected
+    positions = [task["position"] for task in listed]
+    assert positions == sorted(set(positions))
+
+
+def test_no_position_after_rebalance_is_a_conflict(
+    client, auth, project, tasks, monkeypatch
+):
+    monkeypatch.setattr(tasks_api, "position_between", lambda lower, upper: None)
+    response = client.post(
+        f"/tasks/{tasks[3]['id']}/move",
+        json={"after_id": tasks[0]["id"], "before_id": tasks[1]["id"]},
+        headers=auth,
+    )
+    assert response.status_code == 409
+    listed = client.get(f"/tasks/by-project/{project['id']}", headers=auth).json()
+    assert [task["position"] for task in listed] == [t["position"] for t in tasks]
+
+
+@pytest.fixture
+def subscription(project):
+    subscription = event_broker.subscribe(project_channel(project["id"]))
+    yield subscription
+    event_broker.unsubscribe(subscription)
+
+
+def _drop_after_first(client, auth, tasks, moves):
+    expected = [task["id"] for task in tasks]
+    for _ in range(moves):
+        mover = expected.pop()
+        response = client.post(
+            f"/tasks/{mover}/move",
+            json={"after_id": expected[0], "before_id": expected[1]},
+            headers=auth,
+        )
+        assert response.status_code == 200
+        expected.insert(1, mover)
+
+
+def _event_types(subscription):
+    return [event["type"] for event in asyncio.run(subscription.next_batch())]
+
+
+def test_background_rebalance_publishes_resync(
+    client, auth, project, tasks, subscription
+):
+    # About 16 halvings leave a gap narrower than REBALANCE_MIN_GAP
+    _drop_after_first(client, auth, tasks, 18)
+    assert "resync" in _event_types(subscription)
+
+
+def test_inline_rebalance_publishes_resync(
+    client, auth, project, tasks, subscription, monkeypatch
+):
+    monkeypatch.setattr(tasks_api, "gap_is_narrow", lambda *bounds: False)
+    _drop_after_first(client, auth, tasks, 25)
+    assert "resync" in _event_types(subscription)
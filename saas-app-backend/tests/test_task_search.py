@@ -0,0 +1,141 @@
+"""
+Task search on the SQLite FTS5 index (the test database). The index is
+kept by triggers, so it is checked directly as well as through the API:
+SQLite reuses row ids, and a stale index row would match a later task.
+"""
+import pytest
+from sqlalchemy import text
+
+from app.db.session import engine
+from app.services.task_search import search_tokens
+
+
+def _search(client, auth, q, **scope):
+    response = client.get("/tasks/search", params={"q": q, **scope}, headers=auth)
+    assert response.status_code == 200, response.text
+    return [task["id"] for task in response.json()]
+
+
+def _indexed(word: str) -> set[int]:
+    with engine.connect() as connection:
+        return set(
+            connection.scalars(
+                text("SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH :word"),
+                {"word": word},
+            )
+        )
+
+
+def _create(client, auth, project, title, description=None):
+    response = client.post(
+        "/tasks/",
+        json={"title": title, "description": description, "project_id": project["id"]},
+        headers=auth,
+    )
+    response.raise_for_status()
+    return response.json()["id"]
+
+
+def test_writes_keep_the_index_in_sync(client, auth, project):
+    task_id = _create(client, auth, project, "Quarterly report", "draft numbers")
+    assert _indexed("quarterly") == {task_id}
+    assert _search(client, auth, "numbers", project_id=project["id"]) == [task_id]
+
+    client.patch(
+        f"/tasks/{task_id}",
+        json={"title": "Annual summary", "description": "final figures"},
+        headers=auth,
+    ).raise_for_status()
+    assert _indexed("quarterly") == _indexed("numbers") == set()
+    assert _search(client, auth, "quarterly", project_id=project["id"]) == []
+    assert _search(client, auth, "figures", project_id=project["id"]) == [task_id]
+
+    client.delete(f"/tasks/{task_id}", headers=auth).raise_for_status()
+    assert _indexed("annual") == set()
+    assert _search(client, auth, "annual", project_id=project["id"]) == []
+
+
+def test_bulk_and_tree_writes_keep_the_index_in_sync(client, auth, workspace, project):
+    response = client.post(
+        "/tasks/bulk",
+        json={
+            "project_id": project["id"],
+            "items": [{"title": f"Bulkword {i}"} for i in range(3)],
+        },
+        headers=auth,
+    )
+    ids = {task["id"] for task in response.json()}
+    assert _indexed("bulkword") == ids
+
+    client.delete(f"/projects/{project['id']}", headers=auth).raise_for_status()
+    assert _indexed("bulkword") == set()
+
+
+def test_title_ranks_above_description(client, auth, project):
+    in_description = _create(client, auth, project, "Misc", "mentions invoice")
+    in_title = _create(client, auth, project, "Invoice run")
+    assert _search(client, auth, "invoice", project_id=project["id"]) == [
+        in_title,
+        in_description,
+    ]
+
+
+def test_results_stay_in_scope(client, auth, signup, workspace, project):
+    sibling = client.post(
+        "/projects/",
+        json={"name": "Sibling", "workspace_id": workspace["id"]},
+        headers=auth,
+    ).json()
+    other = signup()
+    other_workspace = client.post(
+        "/workspaces/", json={"name": "Other"}, headers=other
+    ).json()
+    other_project = client.post(
+        "/projects/",
+        json={"name": "Other", "workspace_id": other_workspace["id"]},
+        headers=other,
+    ).json()
+
+    mine = _create(client, auth, project, "Shared keyword")
+    in_sibling = _create(client, auth, sibling, "Shared keyword")
+    _create(client, other, other_project, "Shared keyword")
+
+    assert _search(client, auth, "keyword", project_id=project["id"]) == [mine]
+    assert set(_search(client, auth, "keyword", workspace_id=workspace["id"])) == {
+        mine,
+        in_sibling,
+    }
+    response = client.get(
+        "/tasks/search",
+        params={"q": "keyword", "project_id": other_project["id"]},
+        headers=auth,
+    )
+    assert response.status_code == 403
+
+
+@pytest.mark.parametrize(
+    "text, tokens",
+    [
+        ("Login-page: (broken)!", ["login", "page", "broken"]),
+        ('title:x OR "y', ["title", "x", "or", "y"]),
+        ("Ünïcode café", ["ünïcode", "café"]),
+        ("  ?!  ", []),
+    ],
+)
+def test_search_tokens(text, tokens):
+    assert search_tokens(text) == tokens
+
+
+def test_punctuation_and_empty_queries(client, auth, project):
+    task_id = _create(client, auth, project, "Fix login-page redirect")
+
+    # Tokens match as prefixes; FTS5 operators in the input are plain words
+    assert _search(client, auth, "LOGIN page!", project_id=project["id"]) == [task_id]
+    assert _search(client, auth, "redir", project_id=project["id"]) == [task_id]
+    assert _search(client, auth, 'fix OR "x', project_id=project["id"]) == []
+    assert _search(client, auth, "-- ?!", project_id=project["id"]) == []
+
+    response = client.get(
+        "/tasks/search", params={"q": "", "project_id": project["id"]}, headers=auth
+    )
+    assert response.status_code == 422
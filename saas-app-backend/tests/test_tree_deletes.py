@@ -0,0 +1,64 @@
+from sqlalchemy import event, select
+
+from app.db.session import SessionLocal, engine
+from app.models.workspace_usage import WorkspaceUsage
+
+
+def _bulk(client, auth, project_id, count):
+    response = client.post(
+        "/tasks/bulk",
+        json={
+            "project_id": project_id,
+            "items": [{"title": f"Task {i}"} for i in range(count)],
+        },
+        headers=auth,
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def _task_count(workspace_id):
+    db = SessionLocal()
+    try:
+        return db.scalar(
+            select(WorkspaceUsage.task_count).where(
+                WorkspaceUsage.workspace_id == workspace_id
+            )
+        )
+    finally:
+        db.close()
+
+
+def test_chunk_releases_only_the_rows_it_deleted(
+    client, auth, workspace, project
+):
+    doomed = _bulk(client, auth, project["id"], 3)
+    other = client.post(
+        "/projects/",
+        json={"name": "Other", "workspace_id": workspace["id"]},
+        headers=auth,
+    ).json()
+    _bulk(client, auth, other["id"], 2)
+    assert _task_count(workspace["id"]) == 5
+
+    # A single-task delete lands between the chunk's SELECT and its DELETE
+    # and releases its own slot, as DELETE /tasks/{id} does
+    raced = [doomed[0]["id"]]
+
+    def race(connection, cursor, statement, parameters, context, executemany):
+        if raced and statement.startswith("DELETE FROM tasks"):
+            cursor.execute("DELETE FROM tasks WHERE id = ?", (raced.pop(),))
+            cursor.execute(
+                "UPDATE workspace_usage SET task_count = task_count - 1 "
+                "WHERE workspace_id = ?",
+                (workspace["id"],),
+            )
+
+    event.listen(engine, "before_cursor_execute", race)
+    try:
+        response = client.delete(f"/projects/{project['id']}", headers=auth)
+    finally:
+        event.remove(engine, "before_cursor_execute", race)
+    assert response.status_code < 300
+
+    assert _task_count(workspace["id"]) == 2
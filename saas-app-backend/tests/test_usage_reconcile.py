@@ -0,0 +1,77 @@
+import pytest
+from sqlalchemy import delete, update
+
+from app.db.session import SessionLocal, engine
+from app.models.workspace_usage import WorkspaceUsage
+from app.services.usage_service import reconcile_usage
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+def _corrupt(workspace_id: int, **values) -> None:
+    with engine.begin() as connection:
+        connection.execute(
+            update(WorkspaceUsage)
+            .where(WorkspaceUsage.workspace_id == workspace_id)
+            .values(**values)
+        )
+
+
+def _counts(db, workspace_id: int):
+    db.expire_all()
+    usage = db.get(WorkspaceUsage, workspace_id)
+    return usage and (usage.project_count, usage.task_count, usage.change_seq)
+
+
+def _create_project(client, auth, workspace):
+    return client.post(
+        "/projects/",
+        json={"name": "More", "workspace_id": workspace["id"]},
+        headers=auth,
+    )
+
+
+def test_reconcile_restores_the_real_counts(client, auth, workspace, project, db):
+    client.post(
+        "/tasks/bulk",
+        json={
+            "project_id": project["id"],
+            "items": [{"title": f"Task {i}"} for i in range(4)],
+        },
+        headers=auth,
+    ).raise_for_status()
+    other = client.post("/workspaces/", json={"name": "Other"}, headers=auth).json()
+    _, _, change_seq = _counts(db, workspace["id"])
+
+    # Drift both ways in one workspace; lose the other's row entirely
+    _corrupt(workspace["id"], project_count=3, task_count=0)
+    with engine.begin() as connection:
+        connection.execute(
+            delete(WorkspaceUsage).where(WorkspaceUsage.workspace_id == other["id"])
+        )
+
+    # The inflated project count blocks creates on the free plan (3 projects)
+    assert _create_project(client, auth, workspace).status_code == 403
+
+    assert reconcile_usage(db) == 2
+    # The sync sequence is not a count and is left alone
+    assert _counts(db, workspace["id"]) == (1, 4, change_seq)
+    assert _counts(db, other["id"])[:2] == (0, 0)
+
+    assert _create_project(client, auth, workspace).status_code == 200
+    assert reconcile_usage(db) == 0
+
+
+def test_reconcile_one_workspace(client, auth, workspace, project, db):
+    other = client.post("/workspaces/", json={"name": "Other"}, headers=auth).json()
+    _corrupt(workspace["id"], task_count=7)
+    _corrupt(other["id"], project_count=2)
+
+    assert reconcile_usage(db, workspace["id"]) == 1
+    assert _counts(db, workspace["id"])[:2] == (1, 0)
+    assert _counts(db, other["id"])[:2] == (2, 0)
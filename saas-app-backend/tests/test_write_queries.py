@@ -0,0 +1,218 @@
+"""
+Statement counts for the write endpoints.
+
+Writes go through INSERT/UPDATE/DELETE ... RETURNING, so no endpoint reads
+the row back after changing it. Counts are taken with warm caches (the
+principal, token, entitlement and ownership caches are filled by a first
+write), which is the steady state of a busy client. Writes by id that
+follow a cached ownership check must carry the owner in their WHERE clause.
+"""
+import pytest
+
+from app.services.ownership_cache import ownership_graph
+
+
+@pytest.fixture
+def task(client, auth, project):
+    response = client.post(
+        "/tasks/", json={"title": "Task", "project_id": project["id"]}, headers=auth
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def _writes_back(statements, table: str) -> bool:
+    """Whether a SELECT on `table` follows the first write to it."""
+    written = False
+    for sql, _ in statements:
+        if sql.startswith((f"INSERT INTO {table} ", f"UPDATE {table} ")):
+            written = True
+        elif written and sql.startswith("SELECT") and f"FROM {table}" in sql:
+            return True
+    return False
+
+
+def _guarded(sql: str) -> bool:
+    return "WHERE" in sql and "owner_id = " in sql.split("WHERE", 1)[1]
+
+
+def _count(client, statements, method, url, **kwargs):
+    statements.clear()
+    response = client.request(method, url, **kwargs)
+    assert response.status_code < 300, response.text
+    return list(statements)
+
+
+def test_create_task(client, auth, project, task, statements):
+    # project+workspace lookup, quota reservation, change sequence, INSERT
+    sent = _count(
+        client, statements, "POST", "/tasks/",
+        json={"title": "Another", "project_id": project["id"]}, headers=auth,
+    )
+    assert len(sent) == 4
+    assert "RETURNING" in sent[-1][0]
+    assert not _writes_back(sent, "tasks")
+
+
+def test_update_task(client, auth, task, statements):
+    # change sequence, UPDATE ... RETURNING
+    sent = _count(
+        client, statements, "PATCH", f"/tasks/{task['id']}",
+        json={"title": "Renamed"}, headers=auth,
+    )
+    assert len(sent) == 2
+    assert "RETURNING" in sent[-1][0]
+    assert _guarded(sent[-1][0])
+
+
+def test_move_task(client, auth, project, task, statements):
+    other = client.post(
+        "/tasks/", json={"title": "Other", "project_id": project["id"]}, headers=auth
+    ).json()
+    # task row, neighbour position, gap bound, change sequence, UPDATE
+    sent = _count(
+        client, statements, "POST", f"/tasks/{other['id']}/move",
+        json={"before_id": task["id"]}, headers=auth,
+    )
+    assert len(sent) == 5
+    assert sent[-1][0].startswith("UPDATE tasks") and "RETURNING" in sent[-1][0]
+
+
+def test_delete_task(client, auth, task, statements):
+    # DELETE ... RETURNING, quota release, change sequence, tombstone
+    sent = _count(client, statements, "DELETE", f"/tasks/{task['id']}", headers=auth)
+    assert len(sent) == 4
+    assert sent[0][0].startswith("DELETE FROM tasks") and _guarded(sent[0][0])
+
+
+def test_bulk_create_tasks(client, auth, project, task, statements):
+    # project+workspace lookup, quota, next position, change sequence, and
+    # one multi-row INSERT whatever the batch size
+    sent = _count(
+        client, statements, "POST", "/tasks/bulk",
+        json={
+            "project_id": project["id"],
+            "items": [{"title": f"Task {i}"} for i in range(20)],
+        },
+        headers=auth,
+    )
+    assert len(sent) == 5
+    assert not _writes_back(sent, "tasks")
+
+
+def test_batch_update_tasks(client, auth, project, task, statements):
+    other = client.post(
+        "/tasks/", json={"title": "Other", "project_id": project["id"]}, headers=auth
+    ).json()
+    # workspace lookup, change sequence, one UPDATE per field (title,
+    # status), and the change_seq UPDATE ... RETURNING as the read-back
+    sent = _count(
+        client, statements, "PATCH", "/tasks/batch",
+        json={
+            "items": [
+                {"task_id": task["id"], "changes": {"title": "A"}},
+                {"task_id": other["id"], "changes": {"title": "B", "status": "done"}},
+            ]
+        },
+        headers=auth,
+    )
+    assert len(sent) == 5
+    assert not _writes_back(sent, "tasks")
+    assert _guarded(sent[0][0])
+
+
+def test_create_project(client, auth, workspace, project, statements):
+    # workspace lookup, quota reservation, change sequence, INSERT
+    sent = _count(
+        client, statements, "POST", "/projects/",
+        json={"name": "Another", "workspace_id": workspace["id"]}, headers=auth,
+    )
+    assert len(sent) == 4
+    assert "RETURNING" in sent[-1][0]
+    assert not _writes_back(sent, "projects")
+
+
+def test_update_project(client, auth, project, statements):
+    # change sequence, UPDATE ... RETURNING
+    sent = _count(
+        client, statements, "PATCH", f"/projects/{project['id']}",
+        json={"name": "Renamed"}, headers=auth,
+    )
+    assert len(sent) == 2
+    assert "RETURNING" in sent[-1][0]
+    assert _guarded(sent[-1][0])
+
+
+def test_delete_project(client, auth, project, statements):
+    # ownership (never from the cache before a tree delete), size estimate,
+    # first (empty) task chunk, DELETE ... RETURNING, quota release, change
+    # sequence, tombstone
+    sent = _count(
+        client, statements, "DELETE", f"/projects/{project['id']}", headers=auth
+    )
+    assert len(sent) == 7
+
+
+def test_create_workspace(client, auth, workspace, statements):
+    # INSERT ... RETURNING, usage counters row
+    sent = _count(
+        client, statements, "POST", "/workspaces/",
+        json={"name": "Another"}, headers=auth,
+    )
+    assert len(sent) == 2
+    assert "RETURNING" in sent[0][0]
+    assert not _writes_back(sent, "workspaces")
+
+
+def test_update_workspace(client, auth, workspace, statements):
+    # UPDATE ... RETURNING, change sequence
+    sent = _count(
+        client, statements, "PATCH", f"/workspaces/{workspace['id']}",
+        json={"name": "Renamed"}, headers=auth,
+    )
+    assert len(sent) == 2
+    assert "RETURNING" in sent[0][0]
+    assert _guarded(sent[0][0])
+
+
+def test_delete_workspace(client, auth, workspace, statements):
+    # ownership (never from the cache before a tree delete), size estimate,
+    # one (empty) chunk probe each for tasks, projects, payments,
+    # subscriptions and tombstones, then the usage and workspace rows
+    sent = _count(
+        client, statements, "DELETE", f"/workspaces/{workspace['id']}", headers=auth
+    )
+    assert len(sent) == 9
+
+
+def test_write_through_stale_edge_is_rejected(
+    client, signup, auth, project, statements
+):
+    other = signup()
+    other_workspace = client.post(
+        "/workspaces/", json={"name": "Other"}, headers=other
+    ).json()
+    other_project = client.post(
+        "/projects/",
+        json={"name": "Other", "workspace_id": other_workspace["id"]},
+        headers=other,
+    ).json()
+    other_task = client.post(
+        "/tasks/",
+        json={"title": "private", "project_id": other_project["id"]},
+        headers=other,
+    ).json()
+
+    # A stale edge makes the cached check pass; the guarded UPDATE then
+    # matches nothing and the joined recheck refuses
+    ownership_graph.remember_task(other_task["id"], project["id"])
+    statements.clear()
+    response = client.patch(
+        f"/tasks/{other_task['id']}", json={"title": "hijacked"}, headers=auth
+    )
+    assert response.status_code == 403
+    updates = [sql for sql, _ in statements if sql.startswith("UPDATE tasks")]
+    assert updates and all(_guarded(sql) for sql in updates)
+
+    response = client.get(f"/tasks/{other_task['id']}", headers=other)
+    assert response.json()["title"] == "private"
@@ -9,6 +9,8 @@ const STATUS_COLUMNS = [
 
 function TasksBoard({ project }) {
   const [tasks, setTasks] = useState([]);
+  // status -> { total, cursor } as reported by the board endpoint
+  const [columns, setColumns] = useState({});
   const [loading, setLoading] = useState(false);
   const [creating, setCreating] = useState(false);
   const [error, setError] = useState("");
@@ -22,14 +24,24 @@ function TasksBoard({ project }) {
   useEffect(() => {
     if (!project) {
       setTasks([]);
+      setColumns({});
       return;
     }
     const fetchTasks = async () => {
       setLoading(true);
       setError("");
       try {
-        const res = await api.get(`/tasks/by-project/${project.id}`);
-        setTasks(res.data);
+        // One request for the first page of every column plus totals
+        const res = await api.get(`/projects/${project.id}/board`);
+        setTasks(res.data.columns.flatMap((col) => col.tasks));
+        setColumns(
+          Object.fromEntries(
+            res.data.columns.map((col) => [
+              col.status,
+              { total: col.total, cursor: col.next_cursor },
+            ])
+          )
+        );
       } catch (err) {
         console.error(err);
         const msg =
@@ -50,6 +62,34 @@ function TasksBoard({ project }) {
     }, {});
   }, [tasks]);
 
+  const adjustTotal = (status, delta) => {
+    setColumns((prev) => ({
+      ...prev,
+      [status]: {
+        ...prev[status],
+        total: (prev[status]?.total || 0) + delta,
+      },
+    }));
+  };
+
+  const loadMore = async (status) => {
+    const cursor = columns[status]?.cursor;
+    if (!cursor) return;
+    try {
+      const res = await api.get(`/tasks/by-project/${project.id}`, {
+        params: { status, cursor },
+      });
+      setTasks((prev) => [...prev, ...res.data]);
+      setColumns((prev) => ({
+        ...prev,
+        [status]: { ...prev[status], cursor: res.headers["x-next-cursor"] },
+      }));
+    } catch (err) {
+      console.error(err);
+      setError("Failed to load tasks.");
+    }
+  };
+
   const handleChange = (e) => {
     setForm((prev) => ({
       ...prev,
@@ -72,6 +112,7 @@ function TasksBoard({ project }) {
       };
       const res = await api.post("/tasks", payload);
       setTasks((prev) => [...prev, res.data]);
+      adjustTotal(res.data.status, 1);
       setForm({ title: "", description: "", priority: "medium" });
     } catch (err) {
       console.error(err);
@@ -82,11 +123,14 @@ function TasksBoard({ project }) {
   };
 
   const moveTaskStatus = async (taskId, newStatus) => {
+    const previous = tasks.find((t) => t.id === taskId);
     try {
       const res = await api.patch(`/tasks/${taskId}`, {
         status: newStatus,
       });
       setTasks((prev) => prev.map((t) => (t.id === taskId ? res.data : t)));
+      if (previous) adjustTotal(previous.status, -1);
+      adjustTotal(res.data.status, 1);
     } catch (err) {
       console.error(err);
       setError("Failed to update task status.");
@@ -94,9 +138,11 @@ function TasksBoard({ project }) {
   };
 
   const deleteTask = async (taskId) => {
+    const previous = tasks.find((t) => t.id === taskId);
     try {
       await api.delete(`/tasks/${taskId}`);
       setTasks((prev) => prev.filter((t) => t.id !== taskId));
+      if (previous) adjustTotal(previous.status, -1);
     } catch (err) {
       console.error(err);
       setError("Failed to delete task.");
@@ -189,7 +235,8 @@ function TasksBoard({ project }) {
                     {col.label}
                   </h3>
                   <span className="text-[10px] text-slate-500">
-                    {groupedTasks[col.key]?.length || 0} tasks
+                    {columns[col.key]?.total ?? groupedTasks[col.key]?.length ?? 0}{" "}
+                    tasks
                   </span>
                 </div>
                 <div className="space-y-2 flex-1">
@@ -245,6 +292,16 @@ function TasksBoard({ project }) {
                     </div>
                   ))}
 
+                  {columns[col.key]?.cursor && (
+                    <button
+                      type="button"
+                      onClick={() => loadMore(col.key)}
+                      className="w-full text-[11px] px-2 py-1 rounded-md border border-slate-200 text-slate-600 hover:bg-slate-100"
+                    >
+                      Load more
+                    </button>
+                  )}
+
                   {groupedTasks[col.key]?.length === 0 && (
                     <p className="text-[11px] text-slate-400">
                       No tasks in this column.